@@ -0,0 +1,40 @@
+'''
+benchmark of persisting a few changes to a big tree: the whole tree with 'pickle' vs the log of the DurableTree,
+1e6 values by default
+
+usage: python benchmarks/bench_durable.py [num_values]
+'''
+import os
+import random
+import sys
+import tempfile
+import time
+
+from pytree import DurableTree, RBTree
+
+
+if __name__ == '__main__':
+    num_values = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    num_changes = 1000
+    values = random.sample(range(num_values * 4), num_values)
+
+    with tempfile.TemporaryDirectory() as directory:
+        tree = RBTree.fill_tree(values)
+        start = time.perf_counter()
+        tree.pickle(os.path.join(directory, 'tree.pickle'))
+        print(f'RBTree.pickle of {num_values} values: {time.perf_counter() - start:.3f} s')
+
+        durable_tree = DurableTree(os.path.join(directory, 'durable'), batch_size=num_changes)
+        durable_tree.extend(values)
+        durable_tree.checkpoint()
+
+        start = time.perf_counter()
+        for value in random.sample(range(num_values * 4), num_changes):
+            durable_tree.insert(value)
+        durable_tree.commit()
+        print(f'DurableTree, {num_changes} inserts & commit: {time.perf_counter() - start:.3f} s')
+
+        start = time.perf_counter()
+        durable_tree.close()
+        DurableTree(os.path.join(directory, 'durable'))
+        print(f'DurableTree recovery: {time.perf_counter() - start:.3f} s')
@@ -0,0 +1,24 @@
+'''
+import-time benchmark, to keep an eye on the startup cost
+
+usage: python benchmarks/bench_import.py
+'''
+from statistics import median
+import subprocess
+import sys
+import time
+
+
+def get_import_time(code: str = 'import pytree; pytree.RBTree', repeat: int = 5) -> float:
+    '''the median time it takes a fresh interpreter to run the code, minus the interpreter's own startup'''
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        return time.perf_counter() - start
+
+    return median(run(code) for _ in range(repeat)) - median(run('pass') for _ in range(repeat))
+
+
+if __name__ == '__main__':
+    print(f"import pytree + RBTree: {get_import_time() * 1000:.1f} ms")
+    print(f"import pytree + FrozenTree: {get_import_time('import pytree; pytree.FrozenTree') * 1000:.1f} ms")
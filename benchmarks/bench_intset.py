@@ -0,0 +1,35 @@
+'''
+benchmark of the SortedIntSet against the RBTree on an id-like workload, 1e6 dense ids by default
+
+usage: python benchmarks/bench_intset.py [num_values]
+'''
+import random
+import sys
+import time
+
+from pytree import RBTree, SortedIntSet
+
+
+if __name__ == '__main__':
+    num_values = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # mostly dense ids with gaps, like the ids of rows some of which have been deleted
+    values = random.sample(range(num_values * 5 // 4), num_values)
+    queries = [random.randrange(num_values * 5 // 4) for _ in range(num_values)]
+
+    for tree in (RBTree(), SortedIntSet(32)):
+        start = time.perf_counter()
+        for val in values:
+            tree.insert(val)
+        inserted = time.perf_counter()
+        for val in queries:
+            tree.find_ge(val)
+        queried = time.perf_counter()
+        usage = tree.memory_usage(deep=False)
+        for val in values:
+            tree.delete(val)
+        deleted = time.perf_counter()
+
+        print(
+            f"{type(tree).__name__}: insert {inserted - start:.2f} s, find_ge {queried - inserted:.2f} s, "
+            f"delete {deleted - queried:.2f} s, {usage.bytes_per_element:.1f} bytes/value"
+        )
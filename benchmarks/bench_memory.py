@@ -0,0 +1,54 @@
+'''
+memory regression benchmark of the trees, 1e5 values by default
+-> prints the bytes held per element & the breakdown of 'memory_usage' for every structure,
+   so a change in the node layout shows up as a change in the numbers
+-> the EntityQuadTree only gets the first 1e3 boxes, inserting into it is far slower than the rest
+
+usage: python benchmarks/bench_memory.py [num_values]
+'''
+from dataclasses import dataclass
+import random
+import sys
+
+from pytree import AVLTree, EntityQuadTree, KDTree, RBTree, RTree, SortedIntSet
+
+
+@dataclass
+class Box:
+    _id: int
+    xmin: float
+    ymin: float
+    xmax: float
+    ymax: float
+
+
+if __name__ == '__main__':
+    num_values = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    values = random.sample(range(num_values * 4), num_values)
+    points = [(random.uniform(0, 1000), random.uniform(0, 1000)) for _ in range(num_values)]
+    boxes = [Box(i, x, y, x + random.uniform(1, 5), y + random.uniform(1, 5)) for i, (x, y) in enumerate(points)]
+
+    trees = [RBTree(), AVLTree(), AVLTree(compact_nodes=True), SortedIntSet(32), KDTree(), RTree()]
+    names = ['RBTree', 'AVLTree', 'AVLTree(compact_nodes)', 'SortedIntSet', 'KDTree', 'RTree']
+
+    for tree in trees[:4]:
+        tree.extend(values)
+    for point in points:
+        trees[4].insert(point)
+    for box in boxes:
+        trees[5].insert(box)
+
+    quadtree = EntityQuadTree(bbox=(1010, 1010), node_capacity=8, max_depth=16)
+    for box in boxes[:1000]:
+        quadtree.insert((box.xmin, box.ymin, box.xmax - box.xmin, box.ymax - box.ymin))
+    trees.append(quadtree)
+    names.append('EntityQuadTree')
+
+    for name, tree in zip(names, trees):
+        for deep in (False, True):
+            usage = tree.memory_usage(deep=deep)
+            print(
+                f"{name}{' (deep)' if deep else ''}: {usage.bytes_per_element:.1f} bytes/element, "
+                f"nodes {usage.nodes}, payloads {usage.payloads}, slack {usage.slack}, "
+                f"indexes {usage.indexes}, {usage.num_elements} elements"
+            )
@@ -0,0 +1,54 @@
+'''
+benchmark of the RadixTree against the RBTree on long string keys with shared prefixes
+(file paths & urls), 1e5 keys by default
+
+usage: python benchmarks/bench_radix.py [num_keys]
+'''
+from itertools import takewhile
+import random
+import sys
+import time
+
+from pytree import RadixTree, RBTree
+
+
+def make_paths(num_keys: int):
+    return [
+        f'/home/user/projects/project_{random.randrange(50)}/src/module_{random.randrange(20)}/file_{i}.py'
+        for i in range(num_keys)
+    ]
+
+
+def make_urls(num_keys: int):
+    return [
+        f'https://www.example.com/products/category-{random.randrange(30)}/item?id={random.randrange(10 ** 9)}'
+        for _ in range(num_keys)
+    ]
+
+
+if __name__ == '__main__':
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for workload, keys in (('paths', make_paths(num_keys)), ('urls', make_urls(num_keys))):
+        queries = random.sample(keys, len(keys) // 2)
+        prefix = keys[0][: len(keys[0]) // 2]
+
+        for tree in (RBTree(), RadixTree()):
+            start = time.perf_counter()
+            for key in keys:
+                tree.insert(key)
+            inserted = time.perf_counter()
+            for key in queries:
+                tree.find(key)
+            found = time.perf_counter()
+            if isinstance(tree, RadixTree):
+                sum(1 for _ in tree.prefix_iter(prefix))
+            else:
+                sum(1 for _ in takewhile(lambda key: key.startswith(prefix), tree.cursor(prefix)))
+            prefixed = time.perf_counter()
+            usage = tree.memory_usage(deep=True)
+
+            print(
+                f'{workload} {type(tree).__name__}: insert {inserted - start:.2f} s, find {found - inserted:.2f} s, '
+                f'prefix scan {prefixed - found:.3f} s, {usage.bytes_per_element:.0f} bytes/key'
+            )
@@ -0,0 +1,28 @@
+'''
+rebalancing benchmark of the self-balancing trees, 1e6 random inserts & deletes by default
+
+usage: python benchmarks/bench_rebalance.py [num_values]
+'''
+import random
+import sys
+import time
+
+from pytree import AVLTree, RBTree
+
+
+if __name__ == '__main__':
+    num_values = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    values = random.sample(range(num_values * 10), num_values)
+
+    for tree_type in (RBTree, AVLTree):
+        tree = tree_type()
+
+        start = time.perf_counter()
+        for val in values:
+            tree.insert(val)
+        inserted = time.perf_counter()
+        for val in values:
+            tree.delete(val)
+        deleted = time.perf_counter()
+
+        print(f"{tree_type.__name__}: insert {inserted - start:.2f} s, delete {deleted - inserted:.2f} s")
@@ -0,0 +1,50 @@
+'''
+benchmark of the bulk operations of the ShardedTree against a single RBTree, 1e6 values by default
+-> the writes run in the calling process, only the reads are spread across the workers,
+   so a speedup only shows up on several cores
+
+usage: python benchmarks/bench_sharded.py [num_values]
+'''
+from itertools import takewhile
+import os
+import random
+import sys
+import time
+
+from pytree import RBTree, ShardedTree
+
+
+def count_range(tree, lo: int, hi: int) -> int:
+    if isinstance(tree, ShardedTree):
+        return tree.count_range(lo, hi)
+    return sum(1 for _ in takewhile(lambda value: value <= hi, tree.cursor(lo)))
+
+
+if __name__ == '__main__':
+    num_values = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = os.cpu_count()
+    values = random.sample(range(num_values * 4), num_values)
+    other_values = random.sample(range(num_values * 4), num_values // 4)
+    ranges = [(lo, lo + num_values // 10) for lo in random.sample(range(num_values * 3), 100)]
+
+    def run(name: str, tree, other) -> None:
+        start = time.perf_counter()
+        tree.extend(values)
+        extended = time.perf_counter()
+        for lo, hi in ranges:
+            count_range(tree, lo, hi)
+        counted = time.perf_counter()
+        tree.intersection(other)
+        intersected = time.perf_counter()
+        print(
+            f'{name}: extend {extended - start:.2f} s, 100 count_range {counted - extended:.2f} s, '
+            f'intersection {intersected - counted:.2f} s'
+        )
+
+    print(f'{workers} cpu(s)')
+    run('RBTree', RBTree(), RBTree.fill_tree(other_values))
+    for executor in ('thread', 'process'):
+        run(
+            f'ShardedTree({executor}, {workers} workers)', ShardedTree(workers=workers, executor=executor),
+            ShardedTree.fill_tree(other_values)
+        )
@@ -0,0 +1,107 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Tuple
+import numpy as np
+
+from pytree._shared import attach_arrays, export_arrays
+from pytree.SpatialPartioningtree.Rtree.rtree import UID, BBox
+
+
+class FrozenRTree:
+    '''
+    - an immutable, array-backed snapshot of an R-tree
+    - the ids & the bounds (xmin, ymin, xmax, ymax) of the entities are kept in numpy arrays,
+      packed into leaves of [leaf_size] entities (sort-tile-recursive):
+      the entities are sorted into vertical slices by the x of their centers,
+      then by the y of their centers within every slice, so the entities of a leaf are close together
+    - every leaf keeps the bounding box of its entities, a query only looks into the leaves
+      whose boxes intersect the given box, all of their entities are checked at once
+    - can be exported into a named block of shared memory ('export_shared'),
+      so that other processes attach to the same entities ('attach_shared') without copying them
+
+    P.S: should be obtained through the 'freeze' method of the R-tree
+    '''
+
+    __slots__ = ['ids', 'bounds', 'leaf_bounds', 'leaf_size', '_segment']
+
+    def __init__(self, ids: Iterable[UID], bounds: Iterable[Tuple[float, float, float, float]], leaf_size: int = 64):
+        if leaf_size < 1:
+            raise ValueError('leaf_size should be at least 1')
+
+        ids, bounds = np.array(ids), np.array(bounds, dtype=np.float64).reshape(-1, 4)
+        if ids.dtype == object or ids.ndim != 1:
+            raise TypeError(f"cannot freeze ids of type '{ids.dtype}'")
+        if len(ids) != len(bounds):
+            raise ValueError('every id should have its own bounds')
+
+        # sort the entities into vertical slices of leaves, then sort every slice from top to bottom
+        num_slices = int(np.ceil(np.sqrt(-(-len(ids) // leaf_size))))
+        slice_size = max(num_slices * leaf_size, 1)
+        order = np.argsort(bounds[:, 0] + bounds[:, 2], kind='stable')
+        order = order[np.lexsort(((bounds[order, 1] + bounds[order, 3]), np.arange(len(ids)) // slice_size))]
+
+        self.ids: np.ndarray = ids[order]
+        self.bounds: np.ndarray = bounds[order]
+        leaf_starts = np.arange(0, len(ids), leaf_size)
+        self.leaf_bounds: np.ndarray = np.column_stack([
+            np.minimum.reduceat(self.bounds[:, :2], leaf_starts, axis=0),
+            np.maximum.reduceat(self.bounds[:, 2:], leaf_starts, axis=0)
+        ]) if len(ids) else np.empty((0, 4))
+        self.leaf_size = leaf_size
+        # the block of shared memory the arrays are viewing, if attached
+        self._segment: SharedMemory = None
+
+        for array in (self.ids, self.bounds, self.leaf_bounds):
+            array.setflags(write=False)
+
+    def export_shared(self, name: str) -> SharedMemory:
+        '''
+        copy the entities into a new block of shared memory with the given name
+        returns the block, which should be unlinked once no process is attached to it anymore
+        '''
+        arrays = {'ids': self.ids, 'bounds': self.bounds, 'leaf_bounds': self.leaf_bounds}
+        return export_arrays(name, type(self).__name__, arrays, {'leaf_size': self.leaf_size})
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenRTree':
+        '''get the frozen R-tree that's been exported under the given name, viewing its entities in place'''
+        arrays, meta, segment = attach_arrays(name, cls.__name__)
+
+        frozen_tree = cls.__new__(cls)
+        for attr_name, array in arrays.items():
+            setattr(frozen_tree, attr_name, array)
+        frozen_tree.leaf_size = meta['leaf_size']
+        frozen_tree._segment = segment
+        return frozen_tree
+
+    @staticmethod
+    def _intersect(bounds: np.ndarray, bbox: BBox) -> np.ndarray:
+        '''same as the 'intersect' of the R-tree, boxes that only touch don't intersect'''
+        return (
+            (bounds[:, 0] < bbox.xmax) & (bounds[:, 2] > bbox.xmin)
+            & (bounds[:, 1] < bbox.ymax) & (bounds[:, 3] > bbox.ymin)
+        )
+
+    def _find_intersecting(self, bbox: BBox) -> np.ndarray:
+        '''returns the indexes of the entities that intersect the box'''
+        leaves = np.flatnonzero(self._intersect(self.leaf_bounds, bbox))
+        starts = leaves * self.leaf_size
+        sizes = np.minimum(starts + self.leaf_size, len(self.ids)) - starts
+        index = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        return index[self._intersect(self.bounds[index], bbox)]
+
+    def query(self, bbox: BBox) -> List[UID]:
+        '''returns the ids of all the entities that intersect the box'''
+        return self.ids[self._find_intersecting(bbox)].tolist()
+
+    def collide(self, bbox: BBox) -> bool:
+        '''whether any entity intersects the box'''
+        return len(self._find_intersecting(bbox)) > 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[UID]:
+        yield from self.ids.tolist()
+
+    def __bool__(self) -> bool:
+        return len(self.ids) > 0
@@ -1,6 +1,12 @@
 from collections import deque
-from typing import Dict, NewType, Optional, Protocol, Tuple, Tuple, TypeVar, Union, List
+from typing import TYPE_CHECKING, Dict, NewType, Optional, Protocol, Tuple, Tuple, TypeVar, Union, List
+import sys
 
+from pytree._memory import MemoryUsage, get_deep_size, get_object_size
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+    from pytree.SpatialPartioningtree.Rtree.frozen import FrozenRTree
 
 # NOTE TO tree: TOPLEFT = (0, 0)
 """
@@ -150,6 +156,56 @@ class RTree:
         self.entity_index: Dict[UID, RTreeEntity] = {}
         self.root = RTreeNode(children=[], height=0, is_leaf=True)
 
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the tree, in bytes
+        - the branch/leaf nodes & their lists of children are counted as nodes,
+          the entities as payloads (their ids are only measured with 'deep')
+        - the lookup table from the ids to the entities is counted as an index
+        '''
+        usage = MemoryUsage(indexes=sys.getsizeof(self.entity_index), num_elements=len(self.entity_index))
+        seen = set()
+
+        nodes_to_process = [self.root]
+        while nodes_to_process:
+            node = nodes_to_process.pop()
+
+            if isinstance(node, RTreeEntity):
+                usage.payloads += get_object_size(node)
+                usage.payloads += get_deep_size(node._id, seen) if deep else 0
+                continue
+
+            usage.nodes += get_object_size(node) + sys.getsizeof(node.children)
+            nodes_to_process.extend(node.children)
+
+        return usage
+
+    def freeze(self, leaf_size: int = 64) -> 'FrozenRTree':
+        '''
+        returns an immutable snapshot of the tree, backed by numpy arrays of the entities' ids & bounds
+        for vectorized queries during read-only phases
+        '''
+        # numpy is only imported when a snapshot is requested
+        from pytree.SpatialPartioningtree.Rtree.frozen import FrozenRTree
+
+        entities = self.entity_index.values()
+        bounds = [(entity.xmin, entity.ymin, entity.xmax, entity.ymax) for entity in entities]
+        return FrozenRTree(list(self.entity_index), bounds, leaf_size)
+
+    def export_shared(self, name: str) -> 'SharedMemory':
+        '''
+        freeze the tree into a new block of shared memory with the given name,
+        for other processes to query it through 'attach_shared' without a copy of their own
+        returns the block, which should be unlinked once no process is attached to it anymore
+        '''
+        return self.freeze().export_shared(name)
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenRTree':
+        '''get the frozen R-tree that's been exported under the given name (read-only)'''
+        from pytree.SpatialPartioningtree.Rtree.frozen import FrozenRTree
+        return FrozenRTree.attach_shared(name)
+
     def insert(self, entity: BBox) -> None:
         entity_obj = RTreeEntity(
             _id=entity._id,
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import List
+import os
+import random
+import sys
+import pytest
+
+from pytree import RTree
+from pytree._memory import get_object_size
+from pytree.SpatialPartioningtree.Rtree.rtree import intersect
+
+
+@dataclass
+class Entity:
+    _id: str
+    xmin: float
+    ymin: float
+    xmax: float
+    ymax: float
+
+
+def random_box(_id: str, max_size: float) -> Entity:
+    x, y = random.uniform(0, 1000), random.uniform(0, 1000)
+    return Entity(_id, x, y, x + random.uniform(1, max_size), y + random.uniform(1, max_size))
+
+
+@pytest.fixture
+def entities() -> List[Entity]:
+    return [random_box(f'entity_{i}', 20) for i in range(1000)]
+
+
+@pytest.fixture
+def rtree(entities: List[Entity]) -> RTree:
+    tree = RTree()
+    for entity in entities:
+        tree.insert(entity)
+    return tree
+
+
+def test_freeze(entities: List[Entity], rtree: RTree):
+    pytest.importorskip('numpy')
+
+    frozen = rtree.freeze(leaf_size=8)
+    assert sorted(frozen) == sorted(entity._id for entity in entities)
+
+    for _ in range(50):
+        bbox = random_box('query', 100)
+        assert sorted(frozen.query(bbox)) == sorted(entity._id for entity in entities if intersect(entity, bbox))
+        assert frozen.collide(bbox) == rtree.collide(bbox)
+
+
+def test_shared(entities: List[Entity], rtree: RTree):
+    pytest.importorskip('numpy')
+
+    segment = rtree.export_shared(f'pytree_rtree_{os.getpid()}')
+    try:
+        frozen = RTree.attach_shared(segment.name)
+        bbox = Entity('query', 0, 0, 500, 500)
+        assert len(frozen) == len(entities)
+        assert sorted(frozen.query(bbox)) == sorted(entity._id for entity in entities if intersect(entity, bbox))
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def test_memory_usage(entities: List[Entity], rtree: RTree):
+    shallow = rtree.memory_usage(deep=False)
+    deep = rtree.memory_usage()
+    entity_nodes = list(rtree.entity_index.values())
+
+    assert deep.num_elements == shallow.num_elements == len(entities)
+    assert deep.nodes == shallow.nodes > 0
+    # the entity nodes are always counted as payloads, their ids only with 'deep'
+    assert shallow.payloads == sum(get_object_size(node) for node in entity_nodes)
+    assert deep.payloads == shallow.payloads + sum(sys.getsizeof(node._id) for node in entity_nodes)
+    assert deep.indexes == sys.getsizeof(rtree.entity_index)
+
+    for entity in entities[0: 100]:
+        rtree.remove(entity._id)
+    usage = rtree.memory_usage()
+    assert usage.num_elements == len(entities) - 100 and usage.payloads < deep.payloads
@@ -1,4 +1,31 @@
-from .Quadtree import *
-from .KDtree import *
-from .Rtree import *
-from .utils import *
+from typing import TYPE_CHECKING
+
+from pytree._lazy import attach_lazy
+
+if TYPE_CHECKING:
+    from .Quadtree import *
+    from .KDtree import *
+    from .KDtree.frozen import FrozenKDTree
+    from .Rtree import *
+    from .Rtree.frozen import FrozenRTree
+    from .utils import *
+
+# every tree is only imported on first use,
+# the frozen trees need numpy, the image-based quadtree needs both numpy & PIL
+__getattr__, __dir__ = attach_lazy(__name__, {
+    'BaseQuadTree': '.Quadtree',
+    'QuadNode': '.Quadtree',
+    'EntityQuadTree': '.Quadtree',
+    'QuadEntityNode': '.Quadtree',
+    'ImageBasedQuadTree': '.Quadtree',
+    'KDTree': '.KDtree',
+    'KDT_Node': '.KDtree',
+    'FrozenKDTree': '.KDtree.frozen',
+    'RTree': '.Rtree',
+    'FrozenRTree': '.Rtree.frozen',
+    'BBox': '.utils',
+    'get_squared_distance': '.utils',
+    'get_closest': '.utils',
+    'within_radius': '.utils',
+    'generate_id': '.utils'
+})
@@ -1,9 +1,15 @@
-from typing import List, Tuple
+from typing import TYPE_CHECKING, Callable, Iterable, List, Tuple
+import sys
 
+from pytree._memory import MemoryUsage
 from pytree.SpatialPartioningtree.KDtree.kdt_node import KDT_Node
 from pytree.SpatialPartioningtree.utils import BBox, Point
+from pytree.Binarytree._bulk import is_array, is_in_memory, iter_source
 from pytree.Binarytree._tree import BinaryTree
 
+if TYPE_CHECKING:
+    from pytree.SpatialPartioningtree.KDtree.frozen import FrozenKDTree
+
 
 class KDTree(BinaryTree):
 
@@ -21,6 +27,40 @@ class KDTree(BinaryTree):
         super().insert(point)
         self.bbox.expand_ip(point)
 
+    def _clone(self, new_root: KDT_Node) -> 'KDTree':
+        new_tree = super()._clone(new_root)
+        new_tree.bbox = self.bbox.copy()
+        return new_tree
+
+    def extend(
+        self, points: Iterable[Point], chunk_size: int = 1 << 16, presort: bool = True, parse: Callable[[str], Point] = None
+    ) -> None:
+        # points are not ordered by a single key,
+        # so the sorted/finger insertion of the BinaryTree doesn't apply here ([presort] is ignored),
+        # the points are still streamed in chunks like the BinaryTree
+        chunks = [points] if is_in_memory(points) else iter_source(points, chunk_size, parse)
+        for chunk in chunks:
+            # the rows of a numpy array are converted into tuples
+            if is_array(chunk):
+                chunk = map(tuple, chunk.tolist())
+            for point in chunk:
+                self.insert(point)
+
+    def freeze(self, leaf_size: int = 32) -> 'FrozenKDTree':
+        '''
+        returns an immutable snapshot of the tree, backed by a numpy array of the points
+        for vectorized queries during read-only phases
+        '''
+        # numpy is only imported when a snapshot is requested
+        from pytree.SpatialPartioningtree.KDtree.frozen import FrozenKDTree
+        return FrozenKDTree(self.traverse(), self.root.dimension, leaf_size)
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenKDTree':
+        '''get the frozen k-d tree that's been exported under the given name (read-only)'''
+        from pytree.SpatialPartioningtree.KDtree.frozen import FrozenKDTree
+        return FrozenKDTree.attach_shared(name)
+
     # might abstract out to the bbox class
     def delete(self, point: Point) -> None:
         super().delete(point)
@@ -55,6 +95,42 @@ class KDTree(BinaryTree):
 
         self.bbox.update(x=min_x, y=min_y, w=new_w, h=new_h)
 
+    def _get_minmax_nodes(self) -> Tuple[KDT_Node, KDT_Node]:
+        # the points are only ordered along the split dimension of each level,
+        # the cached min/max nodes & their in-order neighbours of the BinaryTree don't apply here
+        return self.root.find_min_node(), self.root.find_max_node()
+
+    def pop_min(self) -> Point:
+        if self.root.value is None:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+        # removed with 'delete', so that the bbox is kept up to date
+        point = self.find_min()
+        self.delete(point)
+        return point
+
+    def pop_max(self) -> Point:
+        if self.root.value is None:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+        point = self.find_max()
+        self.delete(point)
+        return point
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        usage = super().memory_usage(deep)
+        usage.indexes += sys.getsizeof(self.bbox)
+        return usage
+
+    def delete_range(self, lo: Point, hi: Point) -> int:
+        raise NotImplementedError(f"{type(self).__name__} does not support removing a 1-dimensional range")
+
+    def rebalance(self) -> None:
+        # the nodes split the space along a different dimension on every level,
+        # so they can't be rotated around like the nodes of a binary search tree
+        raise NotImplementedError(f"{type(self).__name__} does not support rebalancing by rotations")
+
+    def nearest(self, value: Point, k: int = 1, max_distance: float = None) -> List[Point]:
+        raise NotImplementedError(f"{type(self).__name__} does not support 1-dimensional nearest values, use 'query' instead")
+
     def query(self,
               target_point: Point,
               radius: int = 0,
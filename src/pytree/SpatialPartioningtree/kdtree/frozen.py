@@ -0,0 +1,179 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Tuple
+import numpy as np
+
+from pytree._shared import attach_arrays, export_arrays
+from pytree.SpatialPartioningtree.utils import Point
+
+
+class FrozenKDTree:
+    '''
+    - an immutable, array-backed snapshot of a k-d tree
+    - the points are kept in a (n, k) numpy array, ordered so that every leaf of the tree
+      is a contiguous slice of it: the points are split in half at the median of their widest dimension
+      until at most [leaf_size] points are left, and every leaf keeps the bounding box of its points
+    - a query only looks into the leaves whose boxes are close enough,
+      all of their points are checked at once in a single vectorized call
+    - can be exported into a named block of shared memory ('export_shared'),
+      so that other processes attach to the same points ('attach_shared') without copying them
+
+    P.S: should be obtained through the 'freeze' method of the k-d tree
+    '''
+
+    __slots__ = ['points', 'leaf_starts', 'leaf_mins', 'leaf_maxs', 'leaf_size', '_segment']
+
+    def __init__(self, points: Iterable[Point], dimension: int = 2, leaf_size: int = 32):
+        if leaf_size < 1:
+            raise ValueError('leaf_size should be at least 1')
+
+        points = np.array(points)
+        if not len(points):
+            points = points.reshape(0, dimension)
+        if points.dtype == object or points.ndim != 2:
+            raise TypeError(f"cannot freeze points of type '{points.dtype}'")
+
+        # split the points into leaves, keeping the leaves in order
+        order = np.arange(len(points))
+        leaf_starts = []
+        bounds_to_split = [(0, len(points))] if len(points) else []
+        while bounds_to_split:
+            lo, hi = bounds_to_split.pop()
+            if hi - lo <= leaf_size:
+                leaf_starts.append(lo)
+                continue
+
+            chunk = points[order[lo: hi]]
+            axis = np.argmax(np.ptp(chunk, axis=0))
+            mid = (hi - lo) // 2
+            order[lo: hi] = order[lo: hi][np.argpartition(chunk[:, axis], mid)]
+
+            bounds_to_split.append((lo + mid, hi))
+            bounds_to_split.append((lo, lo + mid))
+
+        points = points[order]
+        self.points: np.ndarray = points
+        self.leaf_starts: np.ndarray = np.array(leaf_starts + [len(points)], dtype=np.int64)
+        self.leaf_mins: np.ndarray = np.minimum.reduceat(points, self.leaf_starts[:-1], axis=0) \
+            if len(points) else points.copy()
+        self.leaf_maxs: np.ndarray = np.maximum.reduceat(points, self.leaf_starts[:-1], axis=0) \
+            if len(points) else points.copy()
+        self.leaf_size = leaf_size
+        # the block of shared memory the arrays are viewing, if attached
+        self._segment: SharedMemory = None
+
+        for array in (self.points, self.leaf_starts, self.leaf_mins, self.leaf_maxs):
+            array.setflags(write=False)
+
+    @property
+    def dimension(self) -> int:
+        return self.points.shape[1]
+
+    def export_shared(self, name: str) -> SharedMemory:
+        '''
+        copy the points into a new block of shared memory with the given name
+        returns the block, which should be unlinked once no process is attached to it anymore
+        '''
+        arrays = {
+            'points': self.points, 'leaf_starts': self.leaf_starts,
+            'leaf_mins': self.leaf_mins, 'leaf_maxs': self.leaf_maxs
+        }
+        return export_arrays(name, type(self).__name__, arrays, {'leaf_size': self.leaf_size})
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenKDTree':
+        '''get the frozen k-d tree that's been exported under the given name, viewing its points in place'''
+        arrays, meta, segment = attach_arrays(name, cls.__name__)
+
+        frozen_tree = cls.__new__(cls)
+        for attr_name, array in arrays.items():
+            setattr(frozen_tree, attr_name, array)
+        frozen_tree.leaf_size = meta['leaf_size']
+        frozen_tree._segment = segment
+        return frozen_tree
+
+    def _gather_leaves(self, leaves: np.ndarray) -> np.ndarray:
+        '''returns the indexes of all the points within the given leaves'''
+        starts = self.leaf_starts[leaves]
+        sizes = self.leaf_starts[leaves + 1] - starts
+        # the start of every leaf, shifted back by the number of points gathered before it
+        return np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+
+    def _get_distances(self, index: np.ndarray, target: np.ndarray) -> np.ndarray:
+        diff = self.points[index] - target
+        return np.einsum('ij,ij->i', diff, diff)
+
+    def query(self, target_point: Point, radius: float = 0, num: int = 1) -> List[Tuple[Point, float]]:
+        '''
+        find the [num] closest points to the target point (within the radius, if given)
+        returns the points along with their distances, from the closest one
+        '''
+        if not len(self.points) or num < 1:
+            return []
+
+        target = np.asarray(target_point, dtype=np.float64)
+        gaps = np.maximum(self.leaf_mins - target, 0) + np.maximum(target - self.leaf_maxs, 0)
+        leaf_dists = np.einsum('ij,ij->i', gaps, gaps)
+
+        # every leaf (but a lone one) holds at least half of [leaf_size] points,
+        # so the closest few leaves give an upper bound for the distance of the [num]th closest point
+        num_leaves = min(len(leaf_dists), -(-num // -(-self.leaf_size // 2)))
+        closest_leaves = np.argpartition(leaf_dists, num_leaves - 1)[:num_leaves]
+        dists = self._get_distances(self._gather_leaves(closest_leaves), target)
+
+        max_dist = np.partition(dists, num - 1)[num - 1] if len(dists) >= num else np.inf
+        if radius:
+            max_dist = min(max_dist, radius ** 2)
+
+        index = self._gather_leaves(np.flatnonzero(leaf_dists <= max_dist))
+        dists = self._get_distances(index, target)
+        within = dists <= max_dist
+        index, dists = index[within], dists[within]
+
+        if len(dists) > num:
+            closest = np.argpartition(dists, num - 1)[:num]
+            index, dists = index[closest], dists[closest]
+        closest = np.argsort(dists, kind='stable')
+
+        return [
+            (tuple(point), dist ** 0.5)
+            for point, dist in zip(self.points[index[closest]].tolist(), dists[closest].tolist())
+        ]
+
+    def _find_within(self, lows: np.ndarray, highs: np.ndarray) -> np.ndarray:
+        '''returns the indexes of the points within the box [lows, highs] (inclusive) of the first dimensions'''
+        dims = len(lows)
+        leaves = np.flatnonzero(
+            np.all(self.leaf_mins[:, :dims] <= highs, axis=1) & np.all(self.leaf_maxs[:, :dims] >= lows, axis=1)
+        )
+        index = self._gather_leaves(leaves)
+        points = self.points[index, :dims]
+        return index[np.all((points >= lows) & (points <= highs), axis=1)]
+
+    def range(self, x1: float, y1: float, x2: float, y2: float) -> List[Point]:
+        '''returns all the points within the given box (inclusive)'''
+        if (x2 - x1) * (y2 - y1) <= 0:
+            raise ValueError('Area must be positive')
+
+        index = self._find_within(np.array([x1, y1]), np.array([x2, y2]))
+        return list(map(tuple, self.points[index].tolist()))
+
+    def traverse(self) -> List[Point]:
+        return list(map(tuple, self.points.tolist()))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __iter__(self) -> Iterator[Point]:
+        yield from self.traverse()
+
+    def __contains__(self, point: Point) -> bool:
+        if len(point) != self.dimension:
+            return False
+        point = np.asarray(point)
+        return len(self._find_within(point, point)) > 0
+
+    def __bool__(self) -> bool:
+        return len(self.points) > 0
+
+    def __str__(self) -> str:
+        return str(self.traverse())
@@ -51,7 +51,7 @@ class KDT_Node(BST_Node):
                 depth=depth + 1
             )
             self.value = right_subtree_min.value
-            right_subtree_min._delete_node(right_subtree_min.depth)
+            right_subtree_min._delete_node(right_subtree_min.depth % self.dimension)
 
         elif self.left:
             left_subtree_min: 'KDT_Node' = self.left.find_min_node(
@@ -59,7 +59,7 @@ class KDT_Node(BST_Node):
                 depth=depth + 1
             )
             self.value = left_subtree_min.value
-            left_subtree_min._delete_node(left_subtree_min.depth)
+            left_subtree_min._delete_node(left_subtree_min.depth % self.dimension)
             if self.right is None and self.left:
                 self.right, self.left = self.left, self.right
         else:
@@ -1,6 +1,9 @@
+import os
 import pytest
 import random
+import sys
 from pytree import KDTree, KDT_Node
+from pytree._memory import get_object_size
 
 
 def is_binary(kdtree) -> bool:
@@ -130,3 +133,74 @@ def test_bbox_resize_after_deletion(filled_kdtree: KDTree):
 
     x, y, w, h = filled_kdtree.bbox
     assert (x, y, w, h) == (0, 0, 0, 0)
+
+
+def test_pop(kdtree: KDTree):
+    points = list({(random.randint(0, 100), random.randint(0, 100)) for _ in range(50)})
+    kdtree.extend(points)
+
+    popped = [kdtree.pop() for _ in range(5)] + [kdtree.pop(key='max') for _ in range(5)]
+    assert len(set(popped)) == 10 and len(kdtree) == len(points) - 10
+    assert sorted(kdtree.traverse() + popped) == sorted(points) and is_binary(kdtree)
+
+    # the bbox still only covers the points that are left
+    x, y, w, h = kdtree.bbox
+    remaining = kdtree.traverse()
+    assert (x, y) == (min(p[0] for p in remaining), min(p[1] for p in remaining))
+    assert (x + w, y + h) == (max(p[0] for p in remaining), max(p[1] for p in remaining))
+
+
+def test_memory_usage(filled_kdtree: KDTree):
+    shallow = filled_kdtree.memory_usage(deep=False)
+    deep = filled_kdtree.memory_usage()
+
+    assert deep.num_elements == shallow.num_elements == 5
+    assert deep.nodes == shallow.nodes == sum(get_object_size(node) for node in filled_kdtree.root.traverse_node())
+    # the points are only measured with 'deep', the bbox is counted as an index
+    assert shallow.payloads == 0 and deep.payloads >= 5 * sys.getsizeof((0, 1))
+    assert deep.indexes == sys.getsizeof(filled_kdtree.bbox) and deep.slack == 0
+
+    filled_kdtree.delete((8, 4))
+    assert filled_kdtree.memory_usage().num_elements == 4
+    assert filled_kdtree.memory_usage().nodes < deep.nodes
+
+
+def test_rebalance_not_supported(filled_kdtree: KDTree):
+    with pytest.raises(NotImplementedError):
+        filled_kdtree.rebalance()
+    assert is_binary(filled_kdtree)
+
+
+def test_freeze():
+    np = pytest.importorskip('numpy')
+    from pytree.SpatialPartioningtree.utils import get_squared_distance
+
+    points = list({(random.randint(0, 1000), random.randint(0, 1000)) for _ in range(2000)})
+    frozen = KDTree.fill_tree(points).freeze(leaf_size=8)
+    assert sorted(frozen) == sorted(points) and points[0] in frozen and (-1, -1) not in frozen
+
+    for _ in range(50):
+        target = (random.uniform(-100, 1100), random.uniform(-100, 1100))
+        closest = sorted(get_squared_distance(point, target) ** 0.5 for point in points)
+        assert [dist for _, dist in frozen.query(target, num=10)] == pytest.approx(closest[:10])
+        assert [dist for _, dist in frozen.query(target, radius=50, num=10)] == \
+            pytest.approx([dist for dist in closest[:10] if dist <= 50])
+
+        x1, y1 = random.randint(0, 900), random.randint(0, 900)
+        x2, y2 = x1 + random.randint(1, 200), y1 + random.randint(1, 200)
+        assert sorted(frozen.range(x1, y1, x2, y2)) == \
+            sorted(point for point in points if x1 <= point[0] <= x2 and y1 <= point[1] <= y2)
+
+
+def test_shared(filled_kdtree: KDTree):
+    pytest.importorskip('numpy')
+
+    segment = filled_kdtree.export_shared(f'pytree_kdtree_{os.getpid()}')
+    try:
+        frozen = KDTree.attach_shared(segment.name)
+        assert sorted(frozen) == sorted(filled_kdtree)
+        assert frozen.query((1, 1))[0][0] == (0, 1)
+        assert sorted(frozen.range(0, 0, 7, 7)) == [(0, 1), (2, 4)]
+    finally:
+        segment.close()
+        segment.unlink()
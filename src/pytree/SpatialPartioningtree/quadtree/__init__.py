@@ -1,3 +1,7 @@
+from pytree._lazy import attach_lazy
+
 from .entityquadtree import QuadEntityNode, EntityQuadTree
-from .imagequadtree import ImageBasedQuadTree
 from .basequadtree import BaseQuadTree, QuadNode
+
+# the image-based quadtree needs numpy & PIL, so it's only imported on first use
+__getattr__, __dir__ = attach_lazy(__name__, {'ImageBasedQuadTree': '.imagequadtree'})
@@ -1,5 +1,7 @@
 from typing import Optional, List, Union, Tuple
+import sys
 
+from pytree._memory import MemoryUsage, get_object_size
 from pytree.SpatialPartioningtree.utils import BBox
 
 
@@ -92,6 +94,23 @@ class BaseQuadTree:
 
         return traversal_counter(0)
 
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the quad nodes, in bytes
+        -> the freed quad nodes that are kept for reuse are counted as slack
+        -> the quad nodes in use are the elements of a bare quad tree,
+           the subclasses count what they hold instead (entities, pixels, etc)
+        '''
+        usage = MemoryUsage(nodes=sys.getsizeof(self.all_quad_node), num_elements=self.num_quad_node_in_use)
+
+        for qnode in self.all_quad_node:
+            if qnode.in_use:
+                usage.nodes += get_object_size(qnode)
+            else:
+                usage.slack += get_object_size(qnode)
+
+        return usage
+
     @property
     def root(self):
         """returns the first quad node, for conveience"""
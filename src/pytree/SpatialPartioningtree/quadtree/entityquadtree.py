@@ -1,5 +1,7 @@
 from typing import Iterable, Optional, List, Dict, Set, Tuple, Union
+import sys
 
+from pytree._memory import MemoryUsage, get_deep_size, get_object_size
 from pytree.SpatialPartioningtree.Quadtree.basequadtree import BaseQuadTree, QuadNode
 from pytree.SpatialPartioningtree.utils import BBox, generate_id, within_radius
 from pytree.SpatialPartioningtree.type_hints import UID, Point
@@ -75,6 +77,31 @@ class EntityQuadTree(BaseQuadTree):
     def num_entity_node_in_use(self):
         return self.__num_entity_node_in_use
 
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the tree, in bytes
+        - the freed quad/entity nodes that are kept for reuse are counted as slack
+        - the entities' bboxes & ids are only measured with 'deep',
+          the table holding them is counted as an index
+        '''
+        usage = super().memory_usage(deep)
+        usage.nodes += sys.getsizeof(self.all_entity_node)
+
+        for enode in self.all_entity_node:
+            if enode.entity_id is not None:
+                usage.nodes += get_object_size(enode)
+            else:
+                usage.slack += get_object_size(enode)
+
+        usage.indexes += sys.getsizeof(self.all_entity)
+        if deep:
+            seen = set()
+            usage.payloads += sum(get_deep_size(entity_id, seen) for entity_id in self.all_entity)
+            usage.payloads += sum(get_deep_size(entity_bbox, seen) for entity_bbox in self.all_entity.values())
+
+        usage.num_elements = self.num_entity
+        return usage
+
     @classmethod
     def fill_tree(
         cls, entities: List[Union[BBox, Tuple[BBox, UID]]], node_capacity: int = 4, auto_id: bool = True
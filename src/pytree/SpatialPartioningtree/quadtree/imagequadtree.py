@@ -3,6 +3,7 @@ from typing import Optional, Tuple
 import numpy as np
 import os
 
+from pytree._memory import MemoryUsage, get_deep_size
 from pytree.SpatialPartioningtree.Quadtree.basequadtree import BaseQuadTree, QuadNode
 from pytree.SpatialPartioningtree.type_hints import RGB
 from pytree.SpatialPartioningtree.utils import BBox
@@ -37,6 +38,27 @@ class ImageBasedQuadTree(BaseQuadTree):
 
         super().__init__(size=img_to_process.size, max_depth=max_depth)
 
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the tree, in bytes, per pixel of the image
+        - the pixel arrays (the source & the drawn image) are always counted as payloads,
+          the colors of the leaf nodes are only measured with 'deep'
+        - the freed quad nodes that are kept for reuse are counted as slack
+        '''
+        usage = super().memory_usage(deep)
+        usage.payloads += self.img_arr.nbytes
+
+        if self.img is not None:
+            width, height = self.img.size
+            usage.payloads += width * height * len(self.img.getbands())
+
+        if deep:
+            seen = set()
+            usage.payloads += sum(get_deep_size(leaf.first_child, seen) for leaf, _ in self._find_leaves())
+
+        usage.num_elements = self.img_size[0] * self.img_size[1]
+        return usage
+
     def compress(self) -> Image.Image:
 
         def recursive_compress(qnode: QuadNode,
@@ -1,5 +1,6 @@
 from unittest.mock import Base
 import pytest
+import sys
 from typing import List, Tuple
 from pytree import BaseQuadTree
 
@@ -38,6 +39,20 @@ def test_clean_up(basequadtree: BaseQuadTree):
     assert basequadtree.num_quad_node_in_use == 1
 
 
+def test_memory_usage(basequadtree: BaseQuadTree):
+    assert basequadtree.memory_usage().num_elements == 1
+
+    basequadtree._set_branch(basequadtree.root, 0)
+    usage = basequadtree.memory_usage()
+    assert usage.num_elements == basequadtree.num_quad_node_in_use == 5
+    assert usage.nodes > 5 * sys.getsizeof(basequadtree.root) and usage.slack == 0
+
+    # the freed quad nodes are kept for reuse, as slack
+    basequadtree.clean_up()
+    usage = basequadtree.memory_usage()
+    assert usage.num_elements == 1 and usage.slack > 0
+
+
 def test_get_bbox(basequadtree: BaseQuadTree):
     basequadtree._set_branch(basequadtree.root, 0)
     basequadtree._set_branch(basequadtree.all_quad_node[1], 1)
@@ -147,3 +147,16 @@ def test_query_entity_with_circle(
     for entity in entities:
         entityquadtree.insert(entity)
     assert len(entityquadtree.query_entity(radius=point_n_radius)) == num_entity
+
+
+def test_memory_usage(entityquadtree: EntityQuadTree):
+    for bbox in [(0, 0, 10, 10), (0, 90, 50, 50), (900, 0, 60, 60), (0, 100, 10, 10), (10, 10, 5, 5)]:
+        entityquadtree.insert(bbox)
+
+    usage = entityquadtree.memory_usage()
+    assert usage.num_elements == 5
+    assert usage.nodes > 0 and usage.payloads > 0 and usage.indexes > 0
+    assert entityquadtree.memory_usage(deep=False).payloads == 0
+
+    entityquadtree.delete(1)
+    assert entityquadtree.memory_usage().slack > usage.slack
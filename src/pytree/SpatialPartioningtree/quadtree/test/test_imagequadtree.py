@@ -16,3 +16,14 @@ def test_compression_completeness(imgquadtree: ImageBasedQuadTree):
     total_img_area = imgquadtree.img_size[0] * imgquadtree.img_size[1]
     sum_all_bbox_area = sum(bbox.w * bbox.h for _, bbox in imgquadtree._find_leaves())
     assert sum_all_bbox_area == total_img_area
+
+
+def test_memory_usage(imgquadtree: ImageBasedQuadTree):
+    shallow = imgquadtree.memory_usage(deep=False)
+    deep = imgquadtree.memory_usage()
+
+    # every pixel is an element, the pixel array is always counted as a payload
+    assert deep.num_elements == shallow.num_elements == imgquadtree.img_size[0] * imgquadtree.img_size[1]
+    assert shallow.payloads >= imgquadtree.img_arr.nbytes and deep.payloads >= shallow.payloads
+    assert deep.nodes == shallow.nodes > 0
+    assert deep.bytes_per_element == deep.total / deep.num_elements
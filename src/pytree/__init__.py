@@ -1,2 +1,34 @@
-from .Binarytree import *
-from .SpatialPartioningtree import *
+'''
+- the public names of the subpackages are only imported on first use,
+  so the binary trees can be used without paying for the spatial trees
+  (and their numpy & PIL imports) and vice versa
+'''
+from typing import TYPE_CHECKING
+
+from pytree._lazy import attach_lazy
+
+if TYPE_CHECKING:
+    from ._memory import MemoryUsage
+    from .Binarytree import *
+    from .SpatialPartioningtree import *
+
+_BINARYTREE_NAMES = [
+    'BinaryTree', 'RBTree', 'BSTree', 'AVLTree', 'SplayTree',
+    'FrozenTree', 'TreeCursor', 'WindowedQuantiles', 'AdaptiveTree', 'MigrationEvent', 'AsyncTree', 'RadixTree',
+    'SortedIntSet', 'ShardedTree', 'DurableTree',
+    'BST_Node', 'RBT_Node', 'AVL_Node', 'Splay_Node', 'LazyBST_Node', 'MerkleAVL_Node',
+    'CompactBST_Node', 'CompactAVL_Node', 'CompactRBT_Node', 'OrderStatAVL_Node', 'Radix_Node'
+]
+_SPATIAL_NAMES = [
+    'KDTree', 'KDT_Node', 'FrozenKDTree', 'RTree', 'FrozenRTree', 'BaseQuadTree', 'QuadNode',
+    'EntityQuadTree', 'QuadEntityNode', 'ImageBasedQuadTree',
+    'BBox', 'get_squared_distance', 'get_closest', 'within_radius', 'generate_id'
+]
+
+__all__ = _BINARYTREE_NAMES + _SPATIAL_NAMES + ['MemoryUsage']
+
+__getattr__, __dir__ = attach_lazy(__name__, {
+    'MemoryUsage': '._memory',
+    **{name: '.Binarytree' for name in _BINARYTREE_NAMES},
+    **{name: '.SpatialPartioningtree' for name in _SPATIAL_NAMES}
+})
@@ -0,0 +1,26 @@
+from importlib import import_module
+from typing import Callable, Dict, List, Tuple
+
+
+def attach_lazy(package_name: str, lazy_names: Dict[str, str]) -> Tuple[Callable, Callable]:
+    '''
+    set up the lazily imported names of a package, i.e the module
+    that a name comes from is only imported once the name is accessed for the first time
+
+    - lazy_names: the name, and the (relative) module to import it from
+    returns the '__getattr__' & '__dir__' functions for the package
+    '''
+    def __getattr__(name: str) -> object:
+        if name not in lazy_names:
+            raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+
+        attr = getattr(import_module(lazy_names[name], package_name), name)
+
+        # cache the name on the package, so this is only called once per name
+        setattr(import_module(package_name), name, attr)
+        return attr
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(import_module(package_name))) | set(lazy_names))
+
+    return __getattr__, __dir__
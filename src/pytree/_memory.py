@@ -0,0 +1,89 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Set
+import sys
+
+# objects that are only ever counted on their own, without going into them
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, range)
+# shared singletons that no structure really holds
+_SINGLETONS = (None, True, False, Ellipsis, NotImplemented)
+
+
+@dataclass
+class MemoryUsage:
+    '''
+    - the memory held by a tree structure, in bytes, broken down into:
+      nodes: the node objects in use, along with the containers holding them
+      payloads: the values/entities stored in the tree (only with 'deep')
+      slack: the nodes that are allocated but not in use (e.g on a free list)
+      indexes: the auxiliary lookup tables of the tree
+    - 'num_elements' is the number of values/entities/pixels held by the tree
+    '''
+
+    nodes: int = 0
+    payloads: int = 0
+    slack: int = 0
+    indexes: int = 0
+    num_elements: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.nodes + self.payloads + self.slack + self.indexes
+
+    @property
+    def bytes_per_element(self) -> float:
+        return self.total / self.num_elements if self.num_elements else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f'{type(self).__name__}(total={self.total}, nodes={self.nodes}, payloads={self.payloads}, '
+            f'slack={self.slack}, indexes={self.indexes}, bytes_per_element={self.bytes_per_element:.1f})'
+        )
+
+
+def get_object_size(obj: Any) -> int:
+    '''the size of the object itself, along with its instance dictionary, if any'''
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def get_deep_size(obj: Any, seen: Set[int]) -> int:
+    '''
+    the size of the object and everything that it references
+    (the items of containers & the attributes of objects)
+
+    - every object is only counted once across all the calls sharing the same 'seen' set,
+      objects that are shared between values aren't counted twice
+    - numpy arrays are counted along with their buffer, by numpy itself
+    '''
+    size = 0
+    stack = [obj]
+
+    while stack:
+        obj = stack.pop()
+        if any(obj is singleton for singleton in _SINGLETONS) or id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, _ATOMIC_TYPES) or isinstance(obj, type) or hasattr(obj, 'dtype'):
+            continue
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                slots = getattr(cls, '__slots__', ())
+                for slot in [slots] if isinstance(slots, str) else slots:
+                    if not slot.startswith('__') and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+
+    return size
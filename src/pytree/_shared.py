@@ -0,0 +1,111 @@
+'''
+- the layout of the read-only trees that are shared between processes,
+  through a named block of shared memory:
+  * 8 bytes: the size of the header
+  * the header: json of the kind of tree, its metadata & where each of its arrays is
+  * the arrays, each one starting on a 64-byte boundary
+- the attached arrays are views right into the block,
+  so attaching doesn't copy (or unpickle) anything no matter how big the tree is
+'''
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Tuple
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+_SIZE_FORMAT = '<Q'
+_ALIGNMENT = 64
+
+# the blocks exported by this process (or the process it's been forked from),
+# which are already known to the resource tracker shared with their exporter
+_exported_names = set()
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class _AttachedSegment(SharedMemory):
+    '''
+    - a block of shared memory that's attached by name,
+      it's left to the process that exported it to unlink the block
+    - the arrays viewing the block keep it mapped until the last one of them is gone,
+      even after the segment itself is closed/collected
+    '''
+
+    def __init__(self, name: str):
+        if sys.version_info >= (3, 13):
+            super().__init__(name, track=False)
+            return
+
+        super().__init__(name)
+        # the resource tracker would unlink the block as soon as this process exits,
+        # pulling it out from under every other process attached to it
+        if os.name == 'posix' and name not in _exported_names:
+            resource_tracker.unregister(self._name, 'shared_memory')
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            # some arrays are still viewing the block, the mapping goes away along with them
+            pass
+
+
+def export_arrays(name: str, kind: str, arrays: Dict[str, np.ndarray], meta: dict = None) -> SharedMemory:
+    '''
+    copy the arrays into a new block of shared memory with the given name
+    returns the block, which should be unlinked by the caller once no process needs it anymore
+    '''
+    arrays = {key: np.ascontiguousarray(array) for key, array in arrays.items()}
+
+    layout, data_size = {}, 0
+    for key, array in arrays.items():
+        data_size = _align(data_size)
+        layout[key] = [array.dtype.str, list(array.shape), data_size]
+        data_size += array.nbytes
+
+    header = json.dumps({'kind': kind, 'meta': meta or {}, 'arrays': layout}).encode()
+    data_start = _align(struct.calcsize(_SIZE_FORMAT) + len(header))
+
+    segment = SharedMemory(name, create=True, size=max(data_start + data_size, 1))
+    _exported_names.add(name)
+    struct.pack_into(_SIZE_FORMAT, segment.buf, 0, len(header))
+    segment.buf[struct.calcsize(_SIZE_FORMAT): struct.calcsize(_SIZE_FORMAT) + len(header)] = header
+
+    for key, array in arrays.items():
+        offset = data_start + layout[key][2]
+        segment.buf[offset: offset + array.nbytes] = array.reshape(-1).view(np.uint8)
+
+    return segment
+
+
+def attach_arrays(name: str, kind: str) -> Tuple[Dict[str, np.ndarray], dict, SharedMemory]:
+    '''
+    attach to the block of shared memory with the given name,
+    returns read-only views of its arrays, its metadata & the block itself
+    '''
+    segment = _AttachedSegment(name)
+
+    header_start = struct.calcsize(_SIZE_FORMAT)
+    (header_size,) = struct.unpack_from(_SIZE_FORMAT, segment.buf, 0)
+    header = json.loads(bytes(segment.buf[header_start: header_start + header_size]))
+
+    if header['kind'] != kind:
+        segment.close()
+        raise TypeError(f"shared memory '{name}' holds a {header['kind']}, not a {kind}")
+
+    data_start = _align(header_start + header_size)
+    arrays = {}
+    for key, (dtype, shape, offset) in header['arrays'].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(segment.buf, dtype=dtype, count=count, offset=data_start + offset).reshape(shape)
+        array.setflags(write=False)
+        arrays[key] = array
+
+    return arrays, header['meta'], segment
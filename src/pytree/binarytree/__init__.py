@@ -1,3 +1,20 @@
+from pytree._lazy import attach_lazy
+
 from .tree import *
 from ._tree import BinaryTree
+from .cursor import TreeCursor
+from .quantiles import WindowedQuantiles
+from .radix import RadixTree
+from .intset import SortedIntSet
 from .Node import *
+
+# the frozen tree needs numpy & the async tree needs asyncio, so they're only imported on first use,
+# as well as the wrappers that the plain trees don't need
+__getattr__, __dir__ = attach_lazy(__name__, {
+    'FrozenTree': '.frozen',
+    'AsyncTree': '.asynctree',
+    'AdaptiveTree': '.adaptive',
+    'MigrationEvent': '.adaptive',
+    'ShardedTree': '.sharded',
+    'DurableTree': '.durable'
+})
@@ -0,0 +1,172 @@
+from collections import deque
+from heapq import merge
+from itertools import groupby, islice
+from typing import Callable, Iterable, Iterator, List
+import os
+import pickle
+
+from pytree.Binarytree._type_hint import CT
+
+
+def iter_chunks(values: Iterable[CT], chunk_size: int) -> Iterator[Iterable[CT]]:
+    '''
+    split the values into chunks of (at most) the given size
+    - sliceable inputs (lists, numpy arrays, memory-mapped arrays) are sliced,
+      so numpy arrays stay as arrays
+    - any other iterable (e.g generators) is consumed chunk by chunk
+    '''
+    if hasattr(values, '__len__') and hasattr(values, '__getitem__') and not isinstance(values, dict):
+        for start in range(0, len(values), chunk_size):
+            yield values[start: start + chunk_size]
+        return
+
+    iterator = iter(values)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def iter_text_chunks(path: str, chunk_size: int, parse: Callable[[str], CT] = None) -> Iterator[List[CT]]:
+    '''
+    read a newline-delimited text file chunk by chunk, one value per line
+    - every line is stripped & converted with [parse] (kept as a string by default),
+      the empty lines are skipped
+    '''
+    with open(path) as f:
+        lines = (line.strip() for line in f)
+        values = (parse(line) if parse else line for line in lines if line)
+        yield from iter_chunks(values, chunk_size)
+
+
+def iter_source(source, chunk_size: int, parse: Callable[[str], CT] = None) -> Iterator[Iterable[CT]]:
+    '''
+    split a source of values into chunks of (at most) the given size, without loading it as a whole
+    - a path (string or path-like) to a '.npy' file is memory-mapped,
+      so that only the chunk being read is loaded
+    - a path to any other file is read as a newline-delimited text file (see 'iter_text_chunks')
+    - any other iterable goes through 'iter_chunks'
+    '''
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if not path.endswith('.npy'):
+            yield from iter_text_chunks(path, chunk_size, parse)
+            return
+
+        # numpy is only imported for the numpy files
+        import numpy as np
+        source = np.load(path, mmap_mode='r')
+
+    yield from iter_chunks(source, chunk_size)
+
+
+def is_array(values: Iterable[CT]) -> bool:
+    '''whether the values are a numpy (or numpy-like) array, without importing numpy'''
+    return hasattr(values, 'dtype') and hasattr(values, 'tolist')
+
+
+def is_in_memory(values: Iterable[CT]) -> bool:
+    '''whether the values are already held in memory as a whole (i.e not a stream, file or memory-mapped array)'''
+    if isinstance(values, (list, tuple, set, frozenset)):
+        return True
+    # memory-mapped arrays are the only arrays with a backing file
+    return is_array(values) and getattr(values, 'filename', None) is None
+
+
+def sort_chunk(chunk: Iterable[CT]) -> List[CT]:
+    '''sort & deduplicate a single chunk'''
+    if is_array(chunk):
+        # numpy arrays are sorted by numpy itself,
+        # numpy is already loaded if the chunk is an array
+        import numpy as np
+        return np.unique(chunk).tolist()
+
+    return [value for value, _ in groupby(sorted(chunk))]
+
+
+def spill_sorted_chunk(chunk: Iterable[CT], path: str, block_size: int = 1 << 12) -> str:
+    '''
+    sort & deduplicate a single chunk into a file, to be run in a worker process
+    - the sorted values are pickled in blocks of [block_size],
+      so that they can be read back a block at a time (see 'iter_spilled')
+    returns the path of the file
+    '''
+    with open(path, 'wb') as f:
+        for block in iter_chunks(sort_chunk(chunk), block_size):
+            pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def iter_spilled(path: str) -> Iterator[CT]:
+    '''yields the values of a file written by 'spill_sorted_chunk', a block at a time'''
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+def spill_merged_chunks(paths: List[str], path: str, block_size: int = 1 << 12) -> str:
+    '''
+    merge & deduplicate the files written by 'spill_sorted_chunk' into a single file of the same format,
+    to be run in a worker process -> the merged files are removed
+    returns the path of the file
+    '''
+    merged_values = (value for value, _ in groupby(merge(*map(iter_spilled, paths))))
+    with open(path, 'wb') as f:
+        for block in iter_chunks(merged_values, block_size):
+            pickle.dump(block, f, pickle.HIGHEST_PROTOCOL)
+
+    for merged_path in paths:
+        os.remove(merged_path)
+    return path
+
+
+def parallel_sorted(
+    values: Iterable[CT],
+    workers: int,
+    chunk_size: int = 1 << 16,
+    parse: Callable[[str], CT] = None,
+    fan_in: int = 128
+) -> Iterator[CT]:
+    '''
+    sort & deduplicate the values chunk by chunk across a pool of worker processes,
+    then k-way merge the sorted chunks back together
+    - the values can be any source that 'iter_source' accepts
+
+    - only a few chunks are in flight at any time, and every sorted chunk is written
+      into a temporary file by its worker & only read back a block at a time while merging
+      -> neither the input nor the sorted chunks are ever held in memory as a whole
+    - at most [fan_in] of the files are merged at once, with more of them
+      they're first merged in groups of [fan_in] into bigger files across the pool (as many passes as needed)
+      -> the number of open files stays bounded, however big the input is
+    yields all the unique values in sorted order
+    '''
+    if fan_in < 2:
+        raise ValueError('fan_in should be at least 2')
+
+    # the process pool (and multiprocessing) is only imported when it's needed
+    from concurrent.futures import ProcessPoolExecutor
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix='pytree_sort_') as directory:
+        spilled_paths = []
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            for i, chunk in enumerate(iter_source(values, chunk_size, parse)):
+                pending.append(executor.submit(spill_sorted_chunk, chunk, os.path.join(directory, str(i))))
+                if len(pending) >= 2 * workers:
+                    spilled_paths.append(pending.popleft().result())
+
+            spilled_paths.extend(future.result() for future in pending)
+
+            merge_pass = 0
+            while len(spilled_paths) > fan_in:
+                groups = [spilled_paths[i: i + fan_in] for i in range(0, len(spilled_paths), fan_in)]
+                merged_paths = [os.path.join(directory, f'merged_{merge_pass}_{i}') for i in range(len(groups))]
+                spilled_paths = list(executor.map(spill_merged_chunks, groups, merged_paths))
+                merge_pass += 1
+
+        for value, _ in groupby(merge(*map(iter_spilled, spilled_paths))):
+            yield value
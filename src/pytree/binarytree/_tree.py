@@ -1,8 +1,19 @@
-from typing import Generic, Union, Tuple, List
+from bisect import bisect_left, bisect_right
+from copy import deepcopy
+from itertools import groupby
+from math import log2
+from typing import TYPE_CHECKING, Callable, Generic, Iterable, Union, Tuple, List
 import pickle
 
+from pytree._memory import MemoryUsage, get_deep_size, get_object_size
 from pytree.Binarytree._type_hint import CT, BSN
+from pytree.Binarytree._bulk import is_array, is_in_memory, iter_chunks, iter_source, parallel_sorted
 from pytree.Binarytree.Node import BST_Node
+from pytree.Binarytree.cursor import TreeCursor
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+    from pytree.Binarytree.frozen import FrozenTree
 
 
 class BinaryTree(Generic[CT]):
@@ -16,12 +27,33 @@ class BinaryTree(Generic[CT]):
     '''
     _node_type: BSN = None
 
+    # rebuild a part of the tree once a node is found deeper than [rebalance_factor] * log2(n),
+    # see '_observe_depth', only the trees without any balancing information set it
+    rebalance_factor: float = None
+
+    # the shortest run of neighbouring values that 'delete_many' removes with a single 'delete_range',
+    # a split & join costs about as much as 20-30 single deletions
+    _min_range_run: int = 32
+
     def __init__(self):
         if self._node_type is None:
             raise TypeError("Cannot instantiate base class.")
 
         self.root: BST_Node = self._node_type()
 
+        # incremented on every modification of the tree,
+        # used by the cursors to detect that they're no longer valid
+        self._version = 0
+
+        # the nodes with the min & max value of the tree,
+        # only valid while '_minmax_version' is the same as '_version'
+        self._min_node: BST_Node = None
+        self._max_node: BST_Node = None
+        self._minmax_version = -1
+
+        # an estimate of the number of nodes, for the depth threshold of '_observe_depth'
+        self._known_size = 0
+
     @property
     def dtype(self):
         '''returns the data type of that a tree contains'''
@@ -90,35 +122,233 @@ class BinaryTree(Generic[CT]):
         return self.root.value is None
 
     @classmethod
-    def fill_tree(cls, values: List[CT]) -> 'BinaryTree':
-        '''generates a binary tree with all the values from a list'''
+    def fill_tree(
+        cls, values: Iterable[CT], workers: int = None, chunk_size: int = 1 << 16, parse: Callable[[str], CT] = None
+    ) -> 'BinaryTree':
+        '''
+        generates a binary tree with all the values from an iterable or a file (see 'extend')
+
+        - with [workers] > 1, the values are sorted & deduplicated in chunks
+          of [chunk_size] across a pool of processes and merged back together
+          before being built into the tree, meant for very large inputs
+        '''
         new_bst = cls()
-        for value in values:
-            new_bst.insert(value)
+
+        if workers is not None and workers > 1:
+            values = parallel_sorted(values, workers, chunk_size, parse)
+
+        new_bst.extend(values, chunk_size, parse=parse)
+        return new_bst
+
+    @classmethod
+    def from_iterable(
+        cls, values: Iterable[CT], chunk_size: int = 1 << 16, presort: bool = True, parse: Callable[[str], CT] = None
+    ) -> 'BinaryTree':
+        '''generates a binary tree by streaming the values from an iterable or a file (see 'extend')'''
+        new_bst = cls()
+        new_bst.extend(values, chunk_size, presort, parse)
         return new_bst
 
     @classmethod
     def load_pickle(cls, filename: str) -> 'BinaryTree':
+        '''load a tree from a file written by 'pickle' '''
         tree = cls()
+        # the chunks are gathered first, so that the tree is built from the sorted values all at once
+        values = []
         with open(filename, 'rb') as f:
-            tree.extend(pickle.load(f))
+            while True:
+                try:
+                    values.extend(pickle.load(f))
+                except EOFError:
+                    break
+        tree.extend(values, presort=False)
         return tree
 
-    def pickle(self, filename: str) -> None:
+    def pickle(self, filename: str, chunk_size: int = 1 << 16) -> None:
+        '''
+        write the values of the tree into a file, in sorted chunks of [chunk_size]
+        -> the values are never gathered into a single list
+        '''
         with open(filename, 'wb') as f:
-            pickle.dump(self.traverse(), f, pickle.HIGHEST_PROTOCOL)
+            for chunk in iter_chunks(self.cursor(), chunk_size):
+                pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+
+    def copy(self) -> 'BinaryTree':
+        '''
+        returns a copy of the tree in O(n), by cloning the nodes as they are
+        instead of re-inserting (and rebalancing) every value again
+        '''
+        return self._clone(self.root.copy_node())
+
+    def _clone(self, new_root: BSN) -> 'BinaryTree':
+        '''create a tree of the same type with the given root node'''
+        new_tree = object.__new__(type(self))
+        new_tree.__dict__.update(self.__dict__)
+
+        new_tree.root = new_root
+        new_tree._version = 0
+        new_tree._min_node = None
+        new_tree._max_node = None
+        new_tree._minmax_version = -1
+
+        return new_tree
+
+    def __copy__(self) -> 'BinaryTree':
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> 'BinaryTree':
+        new_tree = self._clone(self.root.copy_node(lambda value: deepcopy(value, memo)))
+        memo[id(self)] = new_tree
+        return new_tree
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the tree, in bytes
+        - the nodes that are only marked as deleted (lazy deletion)
+          are counted as slack, along with their values
+        - the values are only measured with 'deep'
+        '''
+        usage = MemoryUsage()
+        seen = set()
+
+        # level-order, so that skewed trees don't go too deep into the recursion
+        for node in self.root.traverse_node('lvl'):
+            node_size = get_object_size(node)
+            value_size = get_deep_size(node.value, seen) if deep else 0
+
+            if node.is_deleted:
+                usage.slack += node_size + value_size
+            else:
+                usage.nodes += node_size
+                usage.payloads += value_size
+                usage.num_elements += node.value is not None
+
+        return usage
+
+    def freeze(self) -> 'FrozenTree':
+        '''
+        returns an immutable snapshot of the tree, backed by a sorted numpy array
+        for vectorized batch lookups during read-only phases
+        '''
+        # numpy is only imported when a snapshot is requested
+        from pytree.Binarytree.frozen import FrozenTree
+        return FrozenTree(self.traverse())
+
+    def export_shared(self, name: str) -> 'SharedMemory':
+        '''
+        freeze the tree into a new block of shared memory with the given name,
+        for other processes to query it through 'attach_shared' without a copy of their own
+        returns the block, which should be unlinked once no process is attached to it anymore
+        '''
+        return self.freeze().export_shared(name)
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenTree':
+        '''get the frozen tree that's been exported under the given name (read-only)'''
+        from pytree.Binarytree.frozen import FrozenTree
+        return FrozenTree.attach_shared(name)
+
+    def extend(
+        self, values: Iterable[CT], chunk_size: int = 1 << 16, presort: bool = True, parse: Callable[[str], CT] = None
+    ) -> None:
+        '''
+        add all the values from an iterable into the tree
+
+        - [values] can be any iterable (e.g generators, numpy or memory-mapped arrays),
+          or the path to a '.npy' file or to a newline-delimited text file, converted with [parse]
+          * the values that are already in memory (lists, sets, numpy arrays, etc) are added all at once
+          * anything else is consumed in chunks of [chunk_size],
+            so that the input is never held in memory as a whole
+            -> except for an empty tree, which gathers the values of all the chunks
+               to be built in a single balanced pass (the nodes hold all of them anyway)
+        - with [presort], every chunk is sorted beforehand, so that every insertion
+          starts from the previously inserted node (the 'finger')
+          and only climbs up as far as needed, instead of starting from the root
+          -> O(k log(n/k)) for k values that lands in a narrow range
+          without it, the values are inserted in the order they came in (e.g for inputs that are already sorted)
+        - an empty tree is built directly into a balanced shape,
+          so no rebalancing is needed at all
+        '''
+        if isinstance(values, BinaryTree):
+            values = values.traverse()
 
-    def extend(self, values: List[CT]) -> None:
-        '''generates a binary tree with all the values from a list'''
+        if is_in_memory(values):
+            self._extend_chunk(values, presort)
+            return
+
+        if self.root.value is None:
+            # built chunk by chunk, only the first one would be balanced & the rest finger-inserted,
+            # i.e a plain BSTree fed a sorted stream would turn into a chain
+            gathered = []
+            for chunk in iter_source(values, chunk_size, parse):
+                gathered.extend(chunk.tolist() if is_array(chunk) else chunk)
+            self._extend_chunk(gathered, presort)
+            return
+
+        for chunk in iter_source(values, chunk_size, parse):
+            self._extend_chunk(chunk, presort)
+
+    def _extend_chunk(self, values: Iterable[CT], presort: bool) -> None:
+        '''add a chunk of values into the tree, see 'extend' '''
+        if is_array(values):
+            # numpy arrays are sorted by numpy & only then converted into python values
+            if presort:
+                values = values.copy()
+                values.sort()
+            values = values.tolist()
+        elif presort:
+            values = sorted(values)
+        else:
+            values = list(values)
+
+        if not values:
+            return
+
+        self._version += 1
+
+        if self.root.value is None:
+            # an empty tree is always built from the sorted values, it's cheaper than inserting them
+            if not presort and any(prev_value > value for prev_value, value in zip(values, values[1:])):
+                values.sort()
+            unique_values = [value for value, _ in groupby(values)]
+            self.root = self._node_type.build_from_sorted(unique_values)
+            self._known_size = len(unique_values)
+            return
+
+        finger = None
         for value in values:
-            self.insert(value)
+            new_node = self.root.insert_node(value, finger)
+            if new_node:
+                finger = new_node
+                self._node_inserted(new_node)
+
+            if self.root.parent is not None:
+                self.root = self.root.get_root()
+
 
     def insert(self, value: CT) -> None:
         '''add a node with the given value into the tree'''
+        minmax_cached = self._minmax_version == self._version
+        self._version += 1
+
         if self.root.value is None:
-            self.root.value = value
+            self._reset_root(value)
+            self._known_size = 1
+            self._cache_minmax_nodes(self.root, self.root)
         else:
-            self.root.insert_node(value)
+            new_node = self.root.insert_node(value)
+
+            # the new node can only replace the cached min/max node,
+            # unless the rotations of compact nodes swapped the nodes' contents around
+            if minmax_cached and not self.root.is_compact:
+                if new_node and new_node.value < self._min_node.value:
+                    self._min_node = new_node
+                elif new_node and new_node.value > self._max_node.value:
+                    self._max_node = new_node
+                self._minmax_version = self._version
+
+            if new_node:
+                self._node_inserted(new_node)
 
         if self.root.parent is not None:
             self.root = self.root.get_root()
@@ -136,17 +366,338 @@ class BinaryTree(Generic[CT]):
         if node_to_delete is None:
             raise ValueError(f'{value} is not in {self.__class__.__name__}')
 
+        self._remove_node(node_to_delete)
+
+    def _remove_node(self, node_to_delete: BSN) -> None:
+        '''remove a node that's known to be in the tree'''
+        min_node, max_node = None, None
+
+        # a non-root node with less than 2 child nodes is simply unlinked,
+        # none of the other nodes get their values swapped around,
+        # so the cached min/max nodes can be carried over
+        # -> not for compact nodes, their deletions & rotations move the values between the nodes
+        if self._minmax_version == self._version and not self.root.is_compact and \
+                node_to_delete.parent and not (node_to_delete.left and node_to_delete.right):
+            min_node, max_node = self._min_node, self._max_node
+            if node_to_delete is min_node:
+                min_node = min_node.get_successor()
+            elif node_to_delete is max_node:
+                max_node = max_node.get_predecessor()
+
+        self._version += 1
+
         self.root.delete_node(node_to_delete)
 
         if self.root.parent is not None:
             self.root = self.root.get_root()
 
+        if min_node is not None:
+            self._cache_minmax_nodes(min_node, max_node)
+
+    def rebalance(self) -> None:
+        '''
+        rebuild the tree into a perfectly balanced shape in place, in O(n) (Day-Stout-Warren)
+        - the nodes are first straightened out into a sorted chain of right child nodes (the 'vine')
+          with right rotations, then the vine is folded back up with left rotations,
+          every pass halving the length of the chain
+        - the nodes are only relinked, none of them are created or copied (O(1) extra space),
+          their balancing information (height, color, etc) is set up again afterwards
+          with a single pass over the now balanced tree
+        - every leaf node ends up on the last or the second last level,
+          the same shape as a tree built by 'extend'
+        '''
+        if self.root.value is None:
+            return
+        self._known_size = self._rebuild_subtree(self.root)
+
+    def _rebuild_subtree(self, subtree_root: BSN) -> int:
+        '''
+        rebuild the subtree under the given node into a perfectly balanced shape, see 'rebalance'
+        returns the number of nodes in the subtree
+        '''
+        minmax_cached = self._minmax_version == self._version
+        self._version += 1
+
+        parent_node = subtree_root.parent
+        is_left = parent_node is not None and parent_node.left is subtree_root
+
+        pseudo_root = self._node_type()
+        pseudo_root.right = subtree_root
+        num_nodes = self._tree_to_vine(pseudo_root)
+
+        # the nodes that don't fit into a perfect tree are folded into the last level first
+        num_leaves = num_nodes + 1 - (1 << ((num_nodes + 1).bit_length() - 1))
+        self._compress_vine(pseudo_root, num_leaves)
+
+        num_folded = num_nodes - num_leaves
+        while num_folded > 1:
+            num_folded //= 2
+            self._compress_vine(pseudo_root, num_folded)
+
+        new_subtree_root = pseudo_root.right
+        self._set_rebuilt_status(new_subtree_root, num_nodes)
+
+        if parent_node is None:
+            self.root = new_subtree_root
+        else:
+            new_subtree_root.parent = parent_node
+            if is_left:
+                parent_node.left = new_subtree_root
+            else:
+                parent_node.right = new_subtree_root
+
+        # the nodes keep their values, so the cached min/max nodes are still valid
+        if minmax_cached:
+            self._minmax_version = self._version
+
+        return num_nodes
+
+    @staticmethod
+    def _tree_to_vine(pseudo_root: BSN) -> int:
+        '''
+        rotate the tree under the pseudo root (its right child) into a chain of right child nodes
+        returns the number of nodes
+        '''
+        tail, node = pseudo_root, pseudo_root.right
+        num_nodes = 0
+
+        while node is not None:
+            if node.left is None:
+                tail, node = node, node.right
+                num_nodes += 1
+                continue
+
+            # rotate right, the left child takes the place of the node
+            left_node = node.left
+            node.left = left_node.right
+            left_node.right = node
+            tail.right = node = left_node
+
+        return num_nodes
+
+    @staticmethod
+    def _compress_vine(pseudo_root: BSN, count: int) -> None:
+        '''rotate every other node of the vine left, [count] times from the top'''
+        scanner = pseudo_root
+        for _ in range(count):
+            # rotate the child of the scanner left, its right child takes its place on the vine
+            child = scanner.right
+            scanner.right = child.right
+            scanner = scanner.right
+            child.right = scanner.left
+            scanner.left = child
+
+    @staticmethod
+    def _set_rebuilt_status(subtree_root: BSN, num_nodes: int) -> None:
+        '''
+        relink the parents & set up the balancing information of every node of a rebuilt subtree,
+        from the bottom up
+        -> the subtree is balanced by now, so the stack never holds more than O(log n) nodes
+        '''
+        max_depth = num_nodes.bit_length() - 1
+        is_compact = subtree_root.is_compact
+        if not is_compact:
+            subtree_root.parent = None
+
+        stack = [(subtree_root, 0, False)]
+        while stack:
+            node, depth, is_visited = stack.pop()
+            if is_visited:
+                node._set_build_status(depth, max_depth)
+                continue
+
+            stack.append((node, depth, True))
+            for child in (node.right, node.left):
+                if child is not None:
+                    if not is_compact:
+                        child.parent = node
+                    stack.append((child, depth + 1, False))
+
+    def _node_inserted(self, node: BSN) -> None:
+        '''called for every node inserted into a tree that wasn't empty'''
+        if self.rebalance_factor is not None:
+            self._known_size += 1
+            self._observe_depth(node)
+
+    def _observe_depth(self, node: BSN) -> None:
+        '''
+        rebuild a part of the tree once a node is found deeper than [rebalance_factor] * log2(n)
+        (scapegoat tree style)
+        - the ancestors of the node are climbed while counting the size of their subtrees,
+          until an ancestor whose subtree on the node's side holds more than
+          [alpha] = 2 ** (-1 / rebalance_factor) of its nodes is found (the 'scapegoat'),
+          only the subtree of that ancestor is rebuilt
+          -> O(log n) amortized, a skewed tree is fixed bit by bit instead of all at once
+        - such an ancestor always exists if the node is too deep for the actual size of the tree,
+          the size used for the threshold is only an estimate (the deletions aren't counted),
+          if no ancestor is found, the tree was simply smaller than estimated
+        - the whole tree is rebalanced if the node is still too deep after that
+        - only meant for the trees that don't keep any balancing information on their nodes,
+          rebuilding a part of a red-black or an AVL tree would break its invariants
+        '''
+        max_depth = self.rebalance_factor * log2(max(self._known_size, 2))
+        if node.depth <= max_depth:
+            return
+
+        alpha = 2 ** (-1 / self.rebalance_factor)
+        ancestor, size = node, self._count_nodes(node)
+
+        while ancestor.parent is not None:
+            parent_node = ancestor.parent
+            sibling_node = parent_node.right if ancestor is parent_node.left else parent_node.left
+            parent_size = size + 1 + self._count_nodes(sibling_node)
+
+            if size > alpha * parent_size:
+                self._rebuild_subtree(parent_node)
+                break
+
+            ancestor, size = parent_node, parent_size
+        else:
+            self._known_size = size
+            return
+
+        # a tree that got skewed without any insertion (e.g by splaying) can still be too deep,
+        # the scapegoat is only guaranteed to fix the trees that have been kept in shape all along
+        if node.depth > max_depth:
+            self.rebalance()
+
+    @staticmethod
+    def _count_nodes(subtree_root: Union[BSN, None]) -> int:
+        '''count the nodes under the given node, without recursing'''
+        num_nodes, stack = 0, [subtree_root] if subtree_root is not None else []
+        while stack:
+            node = stack.pop()
+            num_nodes += 1
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        return num_nodes
+
+    def _get_successor(self, node: BSN) -> Union[BSN, None]:
+        '''
+        get the node with the next bigger value in the tree, if any
+        -> compact nodes can't climb back up, so it's searched from the root instead
+        '''
+        if node.is_compact:
+            return self.root.find_gt_node(node.value)
+        return node.get_successor()
+
+    def _get_predecessor(self, node: BSN) -> Union[BSN, None]:
+        '''get the node with the next smaller value in the tree, if any'''
+        if node.is_compact:
+            return self.root.find_lt_node(node.value)
+        return node.get_predecessor()
+
+    def _cache_minmax_nodes(self, min_node: BSN, max_node: BSN) -> None:
+        self._min_node = min_node
+        self._max_node = max_node
+        self._minmax_version = self._version
+
+    def _get_minmax_nodes(self) -> Tuple[BSN, BSN]:
+        '''get the nodes with the min & max value, looking them up again if needed'''
+        if self._minmax_version != self._version:
+            self._cache_minmax_nodes(self.root.find_min_node(), self.root.find_max_node())
+        return self._min_node, self._max_node
+
+    def peek_min(self) -> CT:
+        '''get the minimum value in the tree in O(1), from the cached min node'''
+        if self.root.value is None:
+            return None
+        return self._get_minmax_nodes()[0].value
+
+    def peek_max(self) -> CT:
+        '''get the maximum value in the tree in O(1), from the cached max node'''
+        if self.root.value is None:
+            return None
+        return self._get_minmax_nodes()[1].value
+
+    def pop_min(self) -> CT:
+        '''get and delete the minimum value by unlinking the cached min node directly'''
+        if self.root.value is None:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+
+        min_node = self._get_minmax_nodes()[0]
+        min_value = min_node.value
+        self._remove_node(min_node)
+
+        return min_value
+
+    def pop_max(self) -> CT:
+        '''get and delete the maximum value by unlinking the cached max node directly'''
+        if self.root.value is None:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+
+        max_node = self._get_minmax_nodes()[1]
+        max_value = max_node.value
+        self._remove_node(max_node)
+
+        return max_value
+
+    def pop_many(self, num: int, key: str = 'min') -> List[CT]:
+        '''
+        get and delete the [num] smallest/largest values in the tree
+        - the values are collected by stepping from the cached min/max node
+          and then removed all at once with 'delete_range'
+        returns the values in the order that they're popped
+        '''
+        if key not in ('min', 'max'):
+            raise ValueError(f'{key} given is not a valid option')
+
+        if self.root.value is None or num <= 0:
+            return []
+
+        min_node, max_node = self._get_minmax_nodes()
+        step = self._get_successor if key == 'min' else self._get_predecessor
+
+        popped_values = []
+        node = min_node if key == 'min' else max_node
+        while node and len(popped_values) < num:
+            popped_values.append(node.value)
+            node = step(node)
+
+        version = self._version
+        if key == 'min':
+            self.delete_range(popped_values[0], popped_values[-1])
+        else:
+            self.delete_range(popped_values[-1], popped_values[0])
+
+        # as long as the nodes were only relinked during the range deletion,
+        # the node next to the popped values is the new min/max node
+        # -> not if the tree was rebuilt along the way (e.g 'BSTree.compact'),
+        #    or for compact nodes, which get their values moved around
+        if node is not None and self._version == version + 1 and not self.root.is_compact:
+            if key == 'min':
+                self._cache_minmax_nodes(node, max_node)
+            else:
+                self._cache_minmax_nodes(min_node, node)
+
+        return popped_values
+
+    def delete_range(self, lo: CT, hi: CT) -> int:
+        '''
+        remove all the values within [lo, hi] from the tree
+        returns the number of removed values
+        '''
+        if self.root.value is None or hi < lo:
+            return 0
+
+        if not isinstance(lo, type(self.root.value)) or not isinstance(hi, type(self.root.value)):
+            raise TypeError(f"tree does not contain value of type '{type(lo).__name__}'")
+
+        self._version += 1
+
+        new_root, num_removed = self.root.delete_node_range(lo, hi)
+        self.root = new_root if new_root is not None else self._node_type()
+
+        return num_removed
+
     def pop(self, value: CT = None, key: str = None) -> CT:
         '''get and delete the given value from the tree'''
         popping_options = {
             'val': self.find,
-            'min': self.find_min,
-            'max': self.find_max
+            'min': self.pop_min,
+            'max': self.pop_max
         }
 
         if self.root.value is None:
@@ -159,25 +710,29 @@ class BinaryTree(Generic[CT]):
         if key and value:
             raise ValueError('only one of the arguements can be given')
 
-        # default settings for the pop method
-        popping_func = popping_options['min']
-
         if value:
-            def popping_func():
-                return popping_options['val'](value)  # noqa: E731
-        elif key:
-            popping_func = popping_options[key]
-
-        found_val = popping_func()
+            found_val = popping_options['val'](value)
+            self.delete(found_val)
+            return found_val
 
-        self.delete(found_val)
-
-        return found_val
+        # the min/max values are popped from their cached nodes directly
+        return popping_options[key or 'min']()
 
     def clear(self) -> None:
+        self._version += 1
+        self._known_size = 0
+        self._reset_root(None)
+
+    def _reset_root(self, value: Union[CT, None]) -> None:
+        '''
+        turn the root into the only node of the tree, holding the given value (None for an empty tree)
+        -> its status (height, size, hash, etc) is set up again, like for a tree of a single node
+           built by 'build_from_sorted', instead of being left over from the previous values
+        '''
         self.root.left = None
         self.root.right = None
-        self.root.value = None
+        self.root.value = value
+        self.root._set_build_status(0, 0)
 
     def traverse(self, key: str = 'in') -> List[Union[BSN, CT]]:
         '''
@@ -191,6 +746,24 @@ class BinaryTree(Generic[CT]):
             return []
         return [n.value for n in self.root.traverse_node(key)]
 
+    def cursor(self, value: CT = None) -> TreeCursor:
+        '''
+        get a cursor pointing at the given value
+        or the closest value that's > it, if the value is not in the tree
+        -> points at the minimum value if no value is given
+        '''
+        cursor = TreeCursor(self)
+        if self.root.value is None:
+            return cursor
+
+        if value is None:
+            cursor.node = self._get_minmax_nodes()[0]
+        else:
+            if not isinstance(value, type(self.root.value)):
+                raise TypeError(f"tree does not contain value of type '{type(value).__name__}'")
+            cursor.seek(value)
+        return cursor
+
     def find(self, value: CT) -> CT:
         '''get the node with the given value'''
         if self.root.value is None:
@@ -248,6 +821,119 @@ class BinaryTree(Generic[CT]):
             return None
         return self.root.find_min_node(**kwargs).value
 
+    def nearest(self, value: CT, k: int = 1, max_distance: CT = None) -> List[CT]:
+        '''
+        get the [k] values that are closest to the given value, from the closest one
+        - the closest values on both sides are found with a single descent,
+          then 2 walkers step outwards through the predecessors & successors
+          -> O(log n + k)
+        - values that are further than 'max_distance' away are left out
+        - ties are broken in favour of the smaller value
+        '''
+        if self.root.value is None or k <= 0:
+            return []
+
+        if not isinstance(value, type(self.root.value)):
+            raise TypeError(f"tree does not contain value of type '{type(value).__name__}'")
+
+        lower_node = self.root.find_le_node(value)
+        upper_node = self._get_successor(lower_node) if lower_node else self._get_minmax_nodes()[0]
+
+        nearest_values = []
+        while len(nearest_values) < k and (lower_node or upper_node):
+            if upper_node is None or (lower_node and value - lower_node.value <= upper_node.value - value):
+                node, lower_node = lower_node, self._get_predecessor(lower_node)
+            else:
+                node, upper_node = upper_node, self._get_successor(upper_node)
+
+            # the walkers only get further away from here on
+            if max_distance is not None and abs(node.value - value) > max_distance:
+                break
+            nearest_values.append(node.value)
+
+        return nearest_values
+
+    def find_many(self, values: Iterable[CT]) -> List[Union[CT, None]]:
+        '''
+        search for all the given values at once
+        returns the found value (None if not found) for each value, in the given order
+        '''
+        values = list(values)
+        order = sorted(range(len(values)), key=values.__getitem__)
+        matched_nodes = self._match_sorted([values[i] for i in order])
+
+        found_values = [None] * len(values)
+        for i, node in zip(order, matched_nodes):
+            if node is not None:
+                found_values[i] = node.value
+        return found_values
+
+    def contains_many(self, values: Iterable[CT]) -> List[bool]:
+        '''returns whether each of the given values is in the tree, in the given order'''
+        return [value is not None for value in self.find_many(values)]
+
+    def delete_many(self, values: Iterable[CT]) -> int:
+        '''
+        remove all the given values that are in the tree, the rest are ignored
+        - the values are found with a single walk down the tree, then every run
+          of at least [_min_range_run] values that are next to each other in the tree
+          is spliced out with a single 'delete_range' (a single split & join),
+          the values of the shorter runs are deleted one by one
+        returns the number of removed values
+        '''
+        unique_values = [value for value, _ in groupby(sorted(values))]
+        found_nodes = [node for node in self._match_sorted(unique_values) if node is not None]
+
+        # the values are taken out before any node gets relinked
+        runs, prev_node = [], None
+        for node in found_nodes:
+            if prev_node is not None and self._get_successor(prev_node) is node:
+                runs[-1].append(node.value)
+            else:
+                runs.append([node.value])
+            prev_node = node
+
+        num_removed = 0
+        for run in runs:
+            if len(run) >= self._min_range_run:
+                num_removed += self.delete_range(run[0], run[-1])
+                continue
+
+            for value in run:
+                self.delete(value)
+            num_removed += len(run)
+
+        return num_removed
+
+    def _match_sorted(self, values: List[CT]) -> List[Union[BSN, None]]:
+        '''
+        find the nodes holding a sorted list of values with a single walk down the tree
+        - the values are split up at every node, only the values that are smaller/bigger
+          are passed down to the left/right child, so the nodes shared by the paths
+          of neighbouring values are only visited once
+        returns the node (None if not found) for each value
+        '''
+        matched_nodes = [None] * len(values)
+        if self.root.value is None or not values:
+            return matched_nodes
+
+        stack = [(self.root, 0, len(values))]
+        while stack:
+            node, lo, hi = stack.pop()
+            mid_lo = bisect_left(values, node.value, lo, hi)
+            mid_hi = bisect_right(values, node.value, mid_lo, hi)
+
+            if not node.is_deleted:
+                for i in range(mid_lo, mid_hi):
+                    matched_nodes[i] = node
+
+            if node.left and lo < mid_lo:
+                stack.append((node.left, lo, mid_lo))
+            if node.right and mid_hi < hi:
+                stack.append((node.right, mid_hi, hi))
+
+        return matched_nodes
+
     def __add__(self, other: Union[CT, 'BinaryTree']) -> 'BinaryTree':
         '''add this tree to another tree, omitting all repeated values'''
         if isinstance(other, type(self)):
@@ -257,10 +943,14 @@ class BinaryTree(Generic[CT]):
                 raise TypeError(
                     f"cannot add '{type(self).__name__}({self.dtype.__name__})' \
                       with '{type(other).__name__}({other.dtype.__name__})'")
-            return type(self).fill_tree([val for val in self] + [val for val in other])
+            new_tree = self.copy()
+            new_tree.extend(other)
+            return new_tree
 
         try:
-            return type(self).fill_tree(self.traverse()).insert(other)
+            new_tree = self.copy()
+            new_tree.insert(other)
+            return new_tree
         except TypeError:
             raise TypeError(
                 f"cannot insert value of type '{other.__class__.__name__}' \
@@ -298,11 +988,14 @@ class BinaryTree(Generic[CT]):
                 raise TypeError(
                     f"cannot subtract {type(self).__name__}('{self.dtype.__name__}') from \
                       '{type(other).__name__}({other.dtype.__name__})'")
-            return type(self).fill_tree(
-                [val for val in self if val not in other])
+            new_tree = self.copy()
+            [new_tree.delete(val) for val in other if val in new_tree]
+            return new_tree
 
         try:
-            return type(self).fill_tree(self.traverse()).delete(other)
+            new_tree = self.copy()
+            new_tree.delete(other)
+            return new_tree
         except TypeError:
             raise TypeError(
                 f"cannot delete value of type '{other.__class__.__name__}' from \
@@ -350,6 +1043,31 @@ class BinaryTree(Generic[CT]):
                 return False
         return True
 
+    def diff(self, other: 'BinaryTree') -> Tuple[List[CT], List[CT]]:
+        '''
+        compare the values of this tree with another tree
+        returns the values that are only in this tree
+        and the values that are only in the other tree, both in sorted order
+        '''
+        this_values, other_values = self.traverse(), other.traverse()
+        this_only, other_only = [], []
+
+        i, j = 0, 0
+        while i < len(this_values) and j < len(other_values):
+            if this_values[i] == other_values[j]:
+                i, j = i + 1, j + 1
+            elif this_values[i] < other_values[j]:
+                this_only.append(this_values[i])
+                i += 1
+            else:
+                other_only.append(other_values[j])
+                j += 1
+
+        this_only.extend(this_values[i:])
+        other_only.extend(other_values[j:])
+
+        return this_only, other_only
+
     def difference(self, other: 'BinaryTree') -> 'BinaryTree':
         return self - other
 
@@ -362,7 +1080,8 @@ class BinaryTree(Generic[CT]):
 
     def intersection_update(self, other: 'BinaryTree') -> None:
         common_val = [val for val in self if val in other]
-        self.root = self.fill_tree(common_val).root
+        self.clear()
+        self.extend(common_val)
 
     def __getitem__(self, key):
         mod_key = len(self) - abs(key) if key < 0 else key
@@ -393,5 +1112,13 @@ class BinaryTree(Generic[CT]):
     def __bool__(self) -> bool:
         return self.root.value is not None
 
+    def __eq__(self, other: 'BinaryTree') -> bool:
+        if not isinstance(other, BinaryTree):
+            return NotImplemented
+        return self.traverse() == other.traverse()
+
+    # the trees are mutable, so they're still hashed by their identity (e.g to be kept in sets or as keys)
+    __hash__ = object.__hash__
+
     def __str__(self):
         return str(self.traverse())
@@ -0,0 +1,253 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Type
+import time
+
+from pytree.Binarytree._type_hint import CT, BSN
+from pytree.Binarytree._tree import BinaryTree
+from pytree.Binarytree.Node import BST_Node
+from pytree.Binarytree.tree import AVLTree, RBTree, SplayTree
+
+
+@dataclass(frozen=True)
+class MigrationEvent:
+    '''
+    - a record of the AdaptiveTree moving its values from one backend to another
+    - 'write_ratio' & 'skew' are the workload profile of the window that triggered it
+    '''
+
+    source: str
+    target: str
+    num_values: int
+    op_count: int
+    write_ratio: float
+    skew: float
+    duration: float
+
+
+def _get_value(found):
+    # the splay tree's finds gives back the node itself
+    return found.value if isinstance(found, BST_Node) else found
+
+
+class AdaptiveTree:
+    '''
+    - a sorted container that picks the tree variant that suits its workload:
+      * write-heavy: RBTree, the cheapest rebalancing on insert/delete
+      * read-heavy & skewed (the same few values looked up repeatedly): SplayTree,
+        the hot values stay near the root
+      * read-heavy & uniform: AVLTree, the shallowest tree to search through
+
+    - the operations are sampled over windows of [window] operations, at the end of each window
+      * write_ratio = (inserts + deletes) / operations
+      * skew = 1 - (distinct values looked up / lookups)
+      the best backend for that profile is chosen with [write_threshold] & [skew_threshold]
+    - the values are only migrated once the same backend is chosen for [patience] windows in a row,
+      so that a short burst doesn't cause the tree to flip back & forth,
+      the migration itself is an O(n) bulk rebuild from the sorted values
+
+    - every migration is recorded in 'migrations' & passed to [on_migrate], if given
+    - only the operations of the Tree protocol are sampled,
+      any other attribute (pop_min, cursor, etc) is read straight off the backend
+    - the finds (find, find_lt/gt/le/ge, find_min/max) always give back the value,
+      whichever the backend is (the SplayTree's finds give back the node)
+    '''
+
+    __slots__ = [
+        'tree', 'window', 'write_threshold', 'skew_threshold', 'patience', 'on_migrate', 'migrations',
+        '_op_count', '_num_ops', '_num_writes', '_num_lookups', '_looked_up', '_candidate', '_candidate_streak'
+    ]
+
+    def __init__(
+        self,
+        backend: Type[BinaryTree] = RBTree,
+        window: int = 1024,
+        write_threshold: float = 0.5,
+        skew_threshold: float = 0.5,
+        patience: int = 2,
+        on_migrate: Optional[Callable[[MigrationEvent], None]] = None
+    ):
+        if window < 1 or patience < 1:
+            raise ValueError('window & patience should be at least 1')
+        if not 0 <= write_threshold <= 1 or not 0 <= skew_threshold <= 1:
+            raise ValueError('thresholds should be within [0, 1]')
+
+        self.tree: BinaryTree = backend()
+        self.window = window
+        self.write_threshold = write_threshold
+        self.skew_threshold = skew_threshold
+        self.patience = patience
+        self.on_migrate = on_migrate
+        self.migrations: List[MigrationEvent] = []
+
+        self._op_count = 0
+        self._reset_window()
+        self._candidate: Type[BinaryTree] = None
+        self._candidate_streak = 0
+
+    @property
+    def root(self) -> BSN:
+        return self.tree.root
+
+    @property
+    def backend(self) -> Type[BinaryTree]:
+        return type(self.tree)
+
+    @property
+    def dtype(self):
+        '''returns the data type of that a tree contains'''
+        return self.tree.dtype
+
+    @property
+    def height(self) -> int:
+        return self.tree.height
+
+    @classmethod
+    def fill_tree(cls, values: Iterable[CT], **kwargs) -> 'AdaptiveTree':
+        '''generates an adaptive tree with all the values from an iterable'''
+        new_tree = cls(**kwargs)
+        new_tree.extend(values)
+        return new_tree
+
+    def _reset_window(self) -> None:
+        self._num_ops = 0
+        self._num_writes = 0
+        self._num_lookups = 0
+        self._looked_up = set()
+
+    def _record(self, num_writes: int = 0, looked_up: CT = None) -> None:
+        '''
+        sample an operation, the backend is re-evaluated once the window is full
+        -> a bulk write counts as 1 operation per value
+        '''
+        num_ops = max(num_writes, 1)
+        self._op_count += num_ops
+        self._num_ops += num_ops
+        self._num_writes += num_writes
+
+        if looked_up is not None:
+            self._num_lookups += 1
+            self._looked_up.add(looked_up)
+
+        if self._num_ops >= self.window:
+            self._evaluate()
+
+    def _choose_backend(self, write_ratio: float, skew: float) -> Type[BinaryTree]:
+        if write_ratio >= self.write_threshold:
+            return RBTree
+        if skew >= self.skew_threshold:
+            return SplayTree
+        return AVLTree
+
+    def _evaluate(self) -> None:
+        write_ratio = self._num_writes / self._num_ops
+        skew = 1 - len(self._looked_up) / self._num_lookups if self._num_lookups else 0.0
+        self._reset_window()
+
+        candidate = self._choose_backend(write_ratio, skew)
+        if candidate is self.backend:
+            self._candidate, self._candidate_streak = None, 0
+            return
+
+        if candidate is self._candidate:
+            self._candidate_streak += 1
+        else:
+            self._candidate, self._candidate_streak = candidate, 1
+
+        if self._candidate_streak >= self.patience:
+            self.migrate(candidate, write_ratio, skew)
+
+    def migrate(self, backend: Type[BinaryTree], write_ratio: float = 0.0, skew: float = 0.0) -> MigrationEvent:
+        '''
+        move all the values into a new tree of the given type, in O(n)
+        -> the values are already sorted, so the new tree is built directly into a balanced shape
+        '''
+        start = time.perf_counter()
+        source = self.backend
+
+        new_tree = backend()
+        new_tree.extend(self.tree.traverse())
+        self.tree = new_tree
+        self._candidate, self._candidate_streak = None, 0
+
+        event = MigrationEvent(
+            source=source.__name__,
+            target=backend.__name__,
+            num_values=len(self.tree),
+            op_count=self._op_count,
+            write_ratio=write_ratio,
+            skew=skew,
+            duration=time.perf_counter() - start
+        )
+        self.migrations.append(event)
+        if self.on_migrate is not None:
+            self.on_migrate(event)
+        return event
+
+    def extend(self, values: Iterable[CT]) -> None:
+        values = list(values)
+        self.tree.extend(values)
+        self._record(num_writes=len(values))
+
+    def insert(self, value: CT) -> None:
+        '''add a node with the given value into the tree'''
+        self.tree.insert(value)
+        self._record(num_writes=1)
+
+    def delete(self, value: CT) -> None:
+        '''remove the node that contains the specified value from the tree'''
+        self.tree.delete(value)
+        self._record(num_writes=1)
+
+    def clear(self) -> None:
+        self.tree.clear()
+
+    def traverse(self, key: str = 'in') -> List[CT]:
+        return self.tree.traverse(key)
+
+    def find(self, value: CT) -> CT:
+        '''get the node with the given value'''
+        found = self.tree.find(value)
+        self._record(looked_up=value)
+        return _get_value(found)
+
+    def find_lt(self, value: CT) -> CT:
+        return _get_value(self.tree.find_lt(value))
+
+    def find_gt(self, value: CT) -> CT:
+        return _get_value(self.tree.find_gt(value))
+
+    def find_le(self, value: CT) -> CT:
+        return _get_value(self.tree.find_le(value))
+
+    def find_ge(self, value: CT) -> CT:
+        return _get_value(self.tree.find_ge(value))
+
+    def find_min(self) -> CT:
+        return _get_value(self.tree.find_min())
+
+    def find_max(self) -> CT:
+        return _get_value(self.tree.find_max())
+
+    def __getattr__(self, attr_name: str):
+        # only reached for the attributes that the adaptive tree doesn't have itself
+        if attr_name == 'tree':
+            raise AttributeError(attr_name)
+        return getattr(self.tree, attr_name)
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def __iter__(self) -> Iterator[CT]:
+        yield from self.tree
+
+    def __contains__(self, value: CT) -> bool:
+        return self.tree.root.value is not None and self.find(value) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self.tree)
+
+    def __str__(self) -> str:
+        return str(self.tree)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(backend={self.backend.__name__}, size={len(self)})'
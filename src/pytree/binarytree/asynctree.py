@@ -0,0 +1,163 @@
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Optional, Tuple
+import asyncio
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree._tree import BinaryTree
+from pytree.Binarytree.tree import RBTree
+
+# a pending write: the value, whether it's an insertion & the future to resolve once it's applied
+Write = Tuple[CT, bool, asyncio.Future]
+
+_get_value = itemgetter(0)
+_get_is_insert = itemgetter(1)
+
+
+class AsyncTree:
+    '''
+    - a front end for a tree that's shared by many coroutines
+    - the insertions & deletions are queued up & applied to the tree in batches,
+      either after [flush_interval] seconds or once [batch_size] writes are pending
+      * every write gives back a future, that's resolved once the write is applied
+        (or fails with the same error as the tree, e.g deleting a missing value,
+        or with whatever the comparison of its value raised)
+      * the batch is sorted, so that the runs of insertions are added with a single 'extend'
+        (every insertion starts from the previous one instead of from the root),
+        the writes to the same value are still applied in the order they came in
+      * a write that's cancelled before its batch is applied is dropped
+    - the reads go straight to the tree without waiting for the pending writes
+
+    - needs to be used from within a running event loop
+    '''
+
+    __slots__ = ['tree', 'batch_size', 'flush_interval', '_pending', '_flush_handle']
+
+    def __init__(self, tree: Optional[BinaryTree] = None, batch_size: int = 256, flush_interval: float = 0.005):
+        if batch_size < 1:
+            raise ValueError('batch_size should be at least 1')
+        if flush_interval < 0:
+            raise ValueError('flush_interval should not be negative')
+
+        self.tree = tree if tree is not None else RBTree()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._pending: List[Write] = []
+        self._flush_handle: asyncio.TimerHandle = None
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._pending)
+
+    def insert(self, value: CT) -> asyncio.Future:
+        '''queue up the insertion of the value, the future resolves once it's in the tree'''
+        return self._queue(True, value)
+
+    def delete(self, value: CT) -> asyncio.Future:
+        '''queue up the deletion of the value, the future resolves once it's removed from the tree'''
+        return self._queue(False, value)
+
+    def _queue(self, is_insert: bool, value: CT) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((value, is_insert, future))
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self.flush)
+
+        return future
+
+    def flush(self) -> None:
+        '''apply all the pending writes to the tree right away'''
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch = self._pending
+        self._pending = []
+
+        try:
+            try:
+                # stable, so the writes to the same value stay in their original order
+                batch.sort(key=_get_value)
+            except Exception:
+                # values that can't be compared with each other, applied one by one in order
+                for write in batch:
+                    self._apply([write])
+                return
+
+            for _, run in groupby(batch, key=_get_is_insert):
+                self._apply(list(run))
+        finally:
+            # whatever escaped, none of the writes of the batch are left waiting forever
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError('the batch of the write could not be applied'))
+
+    def _apply(self, run: List[Write]) -> None:
+        '''apply a run of writes of the same kind'''
+        run = [write for write in run if not write[2].cancelled()]
+        if not run:
+            return
+        is_insert = run[0][1]
+
+        if is_insert and len(run) > 1:
+            try:
+                self.tree.extend(map(_get_value, run))
+            except Exception:
+                # the values that made it in are ignored when inserted again one by one
+                pass
+            else:
+                for _, _, future in run:
+                    future.set_result(None)
+                return
+
+        for value, _, future in run:
+            try:
+                if is_insert:
+                    self.tree.insert(value)
+                else:
+                    self.tree.delete(value)
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+    async def drain(self) -> None:
+        '''apply all the pending writes & wait for them'''
+        pending = [future for _, _, future in self._pending]
+        self.flush()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def __aenter__(self) -> 'AsyncTree':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.drain()
+
+    def __getattr__(self, attr_name: str):
+        # the reads (and anything else) go straight to the tree
+        if attr_name == 'tree':
+            raise AttributeError(attr_name)
+        return getattr(self.tree, attr_name)
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def __iter__(self):
+        yield from self.tree
+
+    def __contains__(self, value: CT) -> bool:
+        return value in self.tree
+
+    def __bool__(self) -> bool:
+        return bool(self.tree)
+
+    def __str__(self) -> str:
+        return str(self.tree)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(tree={type(self.tree).__name__}, pending={self.num_pending})'
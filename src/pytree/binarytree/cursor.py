@@ -0,0 +1,97 @@
+from typing import TYPE_CHECKING, Iterator, Union
+
+from pytree.Binarytree._type_hint import CT, BSN
+
+if TYPE_CHECKING:
+    from pytree.Binarytree._tree import BinaryTree
+
+
+class TreeCursor:
+    '''
+    - a position within a binary tree, pointing at one of its nodes
+    - stepping to the next/previous value follows the parent references
+      of the nodes instead of searching from the root again,
+      which is O(1) amortized for every step
+
+    - the cursor becomes invalid once the tree is modified
+      by anything other than the cursor itself,
+      it can only be used again after a 'seek'
+
+    P.S: should be obtained through the 'cursor' method of the tree
+    '''
+
+    __slots__ = ['tree', 'node', '_version']
+
+    def __init__(self, tree: 'BinaryTree', node: Union[BSN, None] = None):
+        self.tree = tree
+        self.node = node
+        self._version = tree._version
+
+    @property
+    def value(self) -> CT:
+        '''the value that the cursor is pointing at, None if out of bound'''
+        self._check_validity()
+        return self.node.value if self.node else None
+
+    def next(self) -> CT:
+        '''move the cursor to the next bigger value and return it'''
+        self._check_validity()
+        if self.node:
+            self.node = self.tree._get_successor(self.node)
+        return self.node.value if self.node else None
+
+    def prev(self) -> CT:
+        '''move the cursor to the next smaller value and return it'''
+        self._check_validity()
+        if self.node:
+            self.node = self.tree._get_predecessor(self.node)
+        return self.node.value if self.node else None
+
+    def seek(self, value: CT) -> CT:
+        '''
+        move the cursor to the given value or the closest value that's > it
+        -> searches from the root, so it also revalidates the cursor
+        '''
+        root = self.tree.root
+        self.node = root.find_ge_node(value) if root.value is not None else None
+        self._version = self.tree._version
+        return self.node.value if self.node else None
+
+    def delete(self) -> CT:
+        '''
+        remove the value that the cursor is pointing at from the tree
+        and move the cursor to the next bigger value
+        '''
+        self._check_validity()
+        if self.node is None:
+            raise IndexError('cursor is not pointing at any value')
+
+        # the nodes might have their values swapped around
+        # during the deletion, so the successor is looked up by its value
+        successor = self.tree._get_successor(self.node)
+        successor_value = successor.value if successor else None
+
+        self.tree._remove_node(self.node)
+
+        if successor is None:
+            self.node = None
+            self._version = self.tree._version
+            return None
+        return self.seek(successor_value)
+
+    def _check_validity(self) -> None:
+        if self._version != self.tree._version:
+            raise RuntimeError(f'{type(self.tree).__name__} has been modified, cursor is no longer valid')
+
+    def __iter__(self) -> Iterator[CT]:
+        '''yields the values from the cursor's position onwards'''
+        while self.value is not None:
+            yield self.value
+            self.next()
+
+    def __bool__(self) -> bool:
+        return self.node is not None
+
+    def __repr__(self) -> str:
+        value = self.node.value if self.node else None
+        return f'{type(self).__name__}({type(self.tree).__name__}, value={value})'
@@ -0,0 +1,429 @@
+from typing import BinaryIO, Iterable, List, Tuple, Type
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree._bulk import is_array
+from pytree.Binarytree._tree import BinaryTree
+from pytree.Binarytree.cursor import TreeCursor
+from pytree.Binarytree.tree import RBTree
+
+# the kinds of changes written into the log
+_INSERT, _DELETE, _DELETE_RANGE, _CLEAR = range(4)
+# how every value is encoded
+_INT, _FLOAT, _STR, _PICKLE = range(4)
+# the attributes that are read straight off the tree, none of them changes its values
+_READ_ONLY_ATTRIBUTES = frozenset([
+    'find', 'find_lt', 'find_gt', 'find_le', 'find_ge', 'find_min', 'find_max',
+    'find_many', 'contains_many', 'nearest', 'peek_min', 'peek_max', 'rank', 'select',
+    'traverse', 'copy', 'freeze', 'export_shared', 'pickle', 'memory_usage',
+    'merkle_hash', 'diff', 'difference', 'intersection', 'is_subset', 'is_superset',
+    'is_disjoint', 'dtype', 'height', 'is_empty', 'is_complete', 'is_perfect'
+])
+
+# every batch of records: the size of its records & their crc32, followed by the records
+_BATCH_HEADER = struct.Struct('<II')
+_INT_FORMAT = struct.Struct('<q')
+_FLOAT_FORMAT = struct.Struct('<d')
+_SIZE_FORMAT = struct.Struct('<I')
+
+
+def _encode_value(value: CT, buffer: bytearray) -> None:
+    '''append the value to the buffer, the common types of values get their own compact encoding'''
+    value_type = type(value)
+    if value_type is int and -(1 << 63) <= value < 1 << 63:
+        buffer.append(_INT)
+        buffer += _INT_FORMAT.pack(value)
+    elif value_type is float:
+        buffer.append(_FLOAT)
+        buffer += _FLOAT_FORMAT.pack(value)
+    elif value_type is str:
+        data = value.encode()
+        buffer.append(_STR)
+        buffer += _SIZE_FORMAT.pack(len(data)) + data
+    else:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        buffer.append(_PICKLE)
+        buffer += _SIZE_FORMAT.pack(len(data)) + data
+
+
+def _decode_value(data: bytes, offset: int) -> Tuple[CT, int]:
+    '''returns the value encoded at the offset, along with the offset right after it'''
+    tag = data[offset]
+    offset += 1
+    if tag == _INT:
+        return _INT_FORMAT.unpack_from(data, offset)[0], offset + _INT_FORMAT.size
+    if tag == _FLOAT:
+        return _FLOAT_FORMAT.unpack_from(data, offset)[0], offset + _FLOAT_FORMAT.size
+
+    (size,) = _SIZE_FORMAT.unpack_from(data, offset)
+    offset += _SIZE_FORMAT.size
+    raw = data[offset: offset + size]
+    return (raw.decode() if tag == _STR else pickle.loads(raw)), offset + size
+
+
+class _RecordingCursor(TreeCursor):
+    '''a cursor over the tree of a DurableTree, its deletions are recorded into the log'''
+
+    __slots__ = ['durable_tree']
+
+    def delete(self) -> CT:
+        self._check_validity()
+        value = self.node.value if self.node else None
+
+        next_value = super().delete()
+        self.durable_tree._record(_DELETE, value)
+        return next_value
+
+
+class DurableTree:
+    '''
+    - a tree that's kept on disk in the [path] directory, as a checkpoint of all of its values
+      plus a write-ahead log of the changes (insert, delete, delete_range, pop, clear, etc) made since then
+      -> persisting costs as much as the number of changes, not the size of the tree
+
+    - every change is applied to the tree & appended to the log as a compact binary record
+      * the records are committed in groups: written to the log (& fsync-ed, with [fsync])
+        once [batch_size] of them are pending, once [commit_interval] seconds have passed
+        since the first one of them, or with 'commit' -> the changes are only durable once committed
+      * the interval is kept by a background timer, so the last changes before an idle
+        stretch are committed as well, without waiting for the next change to come along
+      * every group is written with its size & checksum, so a group that's only been written
+        halfway through when the process died is detected (& dropped) on recovery
+    - a checkpoint writes all the values into a new file (in the format of 'BinaryTree.pickle'),
+      swaps it with the previous one & empties the log
+      -> it's done by itself once the log is bigger than both the checkpoint & [min_log_size],
+         i.e the cost of the checkpoints is spread across the changes
+    - on opening, the tree is recovered from the last checkpoint & the changes of the log are replayed on top
+      -> replaying a change that's already in the checkpoint leaves the tree the same,
+         so a crash between swapping the checkpoint & emptying the log is harmless
+
+    - the reads (find, traverse, etc) are passed straight to the tree, the rest of
+      the methods that change the tree (the in-place set operations, load_pickle, etc)
+      aren't available, since their changes wouldn't be logged
+      * the cursors record their deletions into the log as well
+      -> the tree should only be changed through this class
+    - should be closed (or used as a context manager) to commit the last changes
+    '''
+
+    __slots__ = [
+        'tree', 'path', 'batch_size', 'commit_interval', 'fsync', 'min_log_size',
+        '_log', '_pending', '_num_pending', '_first_pending_time', '_checkpoint_size',
+        '_lock', '_timer'
+    ]
+
+    CHECKPOINT_NAME = 'checkpoint'
+    LOG_NAME = 'wal'
+
+    def __init__(
+        self,
+        path: str,
+        backend: Type[BinaryTree] = RBTree,
+        batch_size: int = 1024,
+        commit_interval: float = 0.01,
+        fsync: bool = True,
+        min_log_size: int = 1 << 20
+    ):
+        if batch_size < 1:
+            raise ValueError('batch_size should be at least 1')
+        if commit_interval < 0:
+            raise ValueError('commit_interval should not be negative')
+
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.min_log_size = min_log_size
+
+        self._pending = bytearray()
+        self._num_pending = 0
+        self._first_pending_time = 0.0
+        # the pending records & the log are shared with the timer thread
+        self._lock = threading.Lock()
+        self._timer: threading.Timer = None
+
+        os.makedirs(self.path, exist_ok=True)
+        checkpoint_path = os.path.join(self.path, self.CHECKPOINT_NAME)
+        self.tree: BinaryTree = backend()
+        self._checkpoint_size = 0
+        if os.path.exists(checkpoint_path):
+            self._load_checkpoint(checkpoint_path)
+
+        self._log: BinaryIO = open(os.path.join(self.path, self.LOG_NAME), 'a+b')
+        self._replay_log()
+
+    @property
+    def log_size(self) -> int:
+        '''the size of the log in bytes, the pending records excluded'''
+        return self._log.tell()
+
+    @property
+    def num_pending(self) -> int:
+        return self._num_pending
+
+    def _load_checkpoint(self, checkpoint_path: str) -> None:
+        '''
+        load the values of the checkpoint (sorted chunks, see 'BinaryTree.pickle')
+        -> the chunks are gathered first, so that the tree is built from the sorted values all at once
+        '''
+        values = []
+        with open(checkpoint_path, 'rb') as f:
+            while True:
+                try:
+                    values.extend(pickle.load(f))
+                except EOFError:
+                    break
+
+        self.tree.extend(values, presort=False)
+        self._checkpoint_size = os.path.getsize(checkpoint_path)
+
+    def _replay_log(self) -> None:
+        '''apply all the complete groups of the log to the tree, cutting off whatever comes after them'''
+        self._log.seek(0)
+        data = self._log.read()
+
+        offset = 0
+        while offset + _BATCH_HEADER.size <= len(data):
+            size, checksum = _BATCH_HEADER.unpack_from(data, offset)
+            records = data[offset + _BATCH_HEADER.size: offset + _BATCH_HEADER.size + size]
+            if len(records) < size or zlib.crc32(records) != checksum:
+                break
+
+            self._apply_records(records)
+            offset += _BATCH_HEADER.size + size
+
+        if offset < len(data):
+            self._log.truncate(offset)
+            self._sync()
+        self._log.seek(offset)
+
+    def _apply_records(self, records: bytes) -> None:
+        offset = 0
+        while offset < len(records):
+            kind = records[offset]
+            offset += 1
+
+            if kind == _CLEAR:
+                self.tree.clear()
+                continue
+
+            value, offset = _decode_value(records, offset)
+            if kind == _INSERT:
+                self.tree.insert(value)
+            elif kind == _DELETE:
+                # the value might be gone already, if the checkpoint was made after the deletion
+                if value in self.tree:
+                    self.tree.delete(value)
+            else:
+                hi, offset = _decode_value(records, offset)
+                self.tree.delete_range(value, hi)
+
+    def _record(self, kind: int, *values: CT) -> None:
+        '''add a record of a change to the pending group, which is committed once it's full or old enough'''
+        with self._lock:
+            if not self._num_pending:
+                self._first_pending_time = time.monotonic()
+
+            self._pending.append(kind)
+            for value in values:
+                _encode_value(value, self._pending)
+            self._num_pending += 1
+
+            is_due = self._num_pending >= self.batch_size or \
+                time.monotonic() - self._first_pending_time >= self.commit_interval
+            if not is_due and self._timer is None:
+                # daemon, so that an open tree doesn't keep the process alive
+                self._timer = threading.Timer(self.commit_interval, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if is_due:
+            self.commit()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        '''write the pending records into the log as a single group, the lock should be held'''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._num_pending and not self._log.closed:
+            records = bytes(self._pending)
+            self._log.write(_BATCH_HEADER.pack(len(records), zlib.crc32(records)) + records)
+            self._sync()
+
+            self._pending.clear()
+            self._num_pending = 0
+
+    def _sync(self) -> None:
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def commit(self) -> None:
+        '''write all the pending records into the log as a single group, they're durable once it returns'''
+        with self._lock:
+            self._write_pending()
+
+        if self.log_size > max(self.min_log_size, self._checkpoint_size):
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        '''write all the values into a new checkpoint & empty the log'''
+        with self._lock:
+            self._write_pending()
+            self._write_checkpoint()
+
+    def _write_checkpoint(self) -> None:
+        checkpoint_path = os.path.join(self.path, self.CHECKPOINT_NAME)
+        new_checkpoint_path = checkpoint_path + '.tmp'
+        self.tree.pickle(new_checkpoint_path)
+
+        if self.fsync:
+            with open(new_checkpoint_path, 'rb') as f:
+                os.fsync(f.fileno())
+        os.replace(new_checkpoint_path, checkpoint_path)
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            # the swap of the checkpoints is only durable once the directory is synced
+            dir_fd = os.open(self.path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+        self._checkpoint_size = os.path.getsize(checkpoint_path)
+        self._log.seek(0)
+        self._log.truncate()
+        self._sync()
+
+    def close(self) -> None:
+        '''commit the pending records & close the log'''
+        if self._log.closed:
+            return
+        self.commit()
+        with self._lock:
+            self._log.close()
+
+    def extend(self, values: Iterable[CT]) -> None:
+        if isinstance(values, BinaryTree):
+            values = values.traverse()
+        values = values.tolist() if is_array(values) else list(values)
+
+        self.tree.extend(values)
+        for value in values:
+            self._record(_INSERT, value)
+
+    def insert(self, value: CT) -> None:
+        '''add a node with the given value into the tree'''
+        self.tree.insert(value)
+        self._record(_INSERT, value)
+
+    def delete(self, value: CT) -> None:
+        '''remove the node that contains the specified value from the tree'''
+        self.tree.delete(value)
+        self._record(_DELETE, value)
+
+    def delete_range(self, lo: CT, hi: CT) -> int:
+        '''
+        remove all the values within [lo, hi] from the tree
+        returns the number of removed values
+        '''
+        num_removed = self.tree.delete_range(lo, hi)
+        if num_removed:
+            self._record(_DELETE_RANGE, lo, hi)
+        return num_removed
+
+    def delete_many(self, values: Iterable[CT]) -> int:
+        '''
+        remove all the given values that are in the tree, the rest are ignored
+        - only the values that are found in the tree are recorded
+        returns the number of removed values
+        '''
+        found_values = [value for value in self.tree.find_many(values) if value is not None]
+        num_removed = self.tree.delete_many(found_values)
+        for value in found_values:
+            self._record(_DELETE, value)
+        return num_removed
+
+    def pop(self, value: CT = None, key: str = None) -> CT:
+        '''get and delete the given value from the tree, or its min/max value with [key]'''
+        if value is not None and key is not None:
+            raise ValueError('only one of the arguements can be given')
+
+        if value is not None:
+            self.delete(value)
+            return value
+
+        popped_value = self.tree.pop(key=key)
+        self._record(_DELETE, popped_value)
+        return popped_value
+
+    def pop_many(self, num: int, key: str = 'min') -> List[CT]:
+        '''
+        get and delete the [num] smallest/largest values in the tree
+        - the popped values are next to each other in the tree, so they're recorded as a single range
+        '''
+        popped_values = self.tree.pop_many(num, key)
+        if popped_values:
+            lo, hi = popped_values[0], popped_values[-1]
+            self._record(_DELETE_RANGE, *((lo, hi) if key == 'min' else (hi, lo)))
+        return popped_values
+
+    def pop_min(self) -> CT:
+        value = self.tree.pop_min()
+        self._record(_DELETE, value)
+        return value
+
+    def pop_max(self) -> CT:
+        value = self.tree.pop_max()
+        self._record(_DELETE, value)
+        return value
+
+    def cursor(self, value: CT = None) -> TreeCursor:
+        '''get a cursor pointing at the given value (see 'BinaryTree.cursor'), its deletions are recorded as well'''
+        tree_cursor = self.tree.cursor(value)
+        cursor = _RecordingCursor(self.tree, tree_cursor.node)
+        cursor.durable_tree = self
+        return cursor
+
+    def clear(self) -> None:
+        self.tree.clear()
+        self._record(_CLEAR)
+
+    def __getattr__(self, attr_name: str):
+        # only reached for the attributes that the durable tree doesn't have itself
+        if attr_name not in _READ_ONLY_ATTRIBUTES:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{attr_name}'")
+        return getattr(self.tree, attr_name)
+
+    def __enter__(self) -> 'DurableTree':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def __iter__(self):
+        yield from self.tree
+
+    def __contains__(self, value: CT) -> bool:
+        return value in self.tree
+
+    def __bool__(self) -> bool:
+        return bool(self.tree)
+
+    def __str__(self) -> str:
+        return str(self.tree)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.path!r}, backend={type(self.tree).__name__})'
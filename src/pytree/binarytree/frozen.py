@@ -0,0 +1,136 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, Union
+import numpy as np
+
+from pytree._shared import attach_arrays, export_arrays
+from pytree.Binarytree._type_hint import CT
+
+
+class FrozenTree:
+    '''
+    - an immutable, array-backed snapshot of a binary tree
+    - the values are kept in a sorted numpy array, so lookups
+      are done with binary searches (np.searchsorted) instead of
+      descending down the nodes one by one
+    - all the '_many' methods take an array of keys
+      and answer all of them in a single vectorized call
+    - can be exported into a named block of shared memory ('export_shared'),
+      so that other processes attach to the same values ('attach_shared')
+      without copying them, e.g the workers of a prefork server
+
+    P.S: should be obtained through the 'freeze' method of the tree
+    '''
+
+    __slots__ = ['values', '_segment']
+
+    def __init__(self, values: Union[np.ndarray, Iterable[CT]]):
+        values = np.array(values)
+
+        if values.dtype == object or values.ndim != 1:
+            raise TypeError(f"cannot freeze values of type '{values.dtype}'")
+
+        values.setflags(write=False)
+        self.values: np.ndarray = values
+        # the block of shared memory the values are viewing, if attached
+        self._segment: SharedMemory = None
+
+    def export_shared(self, name: str) -> SharedMemory:
+        '''
+        copy the values into a new block of shared memory with the given name
+        returns the block, which should be unlinked once no process is attached to it anymore
+        '''
+        return export_arrays(name, type(self).__name__, {'values': self.values})
+
+    @classmethod
+    def attach_shared(cls, name: str) -> 'FrozenTree':
+        '''get the frozen tree that's been exported under the given name, viewing its values in place'''
+        arrays, _, segment = attach_arrays(name, cls.__name__)
+
+        frozen_tree = cls.__new__(cls)
+        frozen_tree.values = arrays['values']
+        frozen_tree._segment = segment
+        return frozen_tree
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    def find_min(self) -> CT:
+        return self.values[0].item() if len(self.values) else None
+
+    def find_max(self) -> CT:
+        return self.values[-1].item() if len(self.values) else None
+
+    def contains_many(self, keys: Iterable[CT]) -> np.ndarray:
+        '''returns a boolean array, whether each key is in the tree'''
+        keys = np.asarray(keys)
+        index = np.searchsorted(self.values, keys, side='left')
+        found = index < len(self.values)
+        found[found] = self.values[index[found]] == keys[found]
+        return found
+
+    def rank_many(self, keys: Iterable[CT]) -> np.ndarray:
+        '''returns the number of values in the tree that's < each key'''
+        return np.searchsorted(self.values, np.asarray(keys), side='left')
+
+    def find_ge_many(self, keys: Iterable[CT]) -> np.ma.MaskedArray:
+        '''
+        find the closest value that's >= each key
+        keys without any such value are masked out
+        '''
+        index = np.searchsorted(self.values, np.asarray(keys), side='left')
+        return self._take_masked(index, index == len(self.values))
+
+    def find_gt_many(self, keys: Iterable[CT]) -> np.ma.MaskedArray:
+        '''
+        find the closest value that's > each key
+        keys without any such value are masked out
+        '''
+        index = np.searchsorted(self.values, np.asarray(keys), side='right')
+        return self._take_masked(index, index == len(self.values))
+
+    def find_le_many(self, keys: Iterable[CT]) -> np.ma.MaskedArray:
+        '''
+        find the closest value that's <= each key
+        keys without any such value are masked out
+        '''
+        index = np.searchsorted(self.values, np.asarray(keys), side='right') - 1
+        return self._take_masked(index, index < 0)
+
+    def find_lt_many(self, keys: Iterable[CT]) -> np.ma.MaskedArray:
+        '''
+        find the closest value that's < each key
+        keys without any such value are masked out
+        '''
+        index = np.searchsorted(self.values, np.asarray(keys), side='left') - 1
+        return self._take_masked(index, index < 0)
+
+    def count_range_many(self, lows: Iterable[CT], highs: Iterable[CT]) -> np.ndarray:
+        '''returns the number of values within [low, high] for each pair of bounds'''
+        lo_index = np.searchsorted(self.values, np.asarray(lows), side='left')
+        hi_index = np.searchsorted(self.values, np.asarray(highs), side='right')
+        return np.maximum(hi_index - lo_index, 0)
+
+    def _take_masked(self, index: np.ndarray, mask: np.ndarray) -> np.ma.MaskedArray:
+        if not len(self.values):
+            return np.ma.masked_all(index.shape, dtype=self.values.dtype)
+        found = self.values[np.clip(index, 0, len(self.values) - 1)]
+        return np.ma.masked_array(found, mask=mask)
+
+    def traverse(self) -> list:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[CT]:
+        yield from self.values.tolist()
+
+    def __contains__(self, value: CT) -> bool:
+        return bool(self.contains_many([value])[0])
+
+    def __bool__(self) -> bool:
+        return len(self.values) > 0
+
+    def __str__(self) -> str:
+        return str(self.traverse())
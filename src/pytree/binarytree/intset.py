@@ -0,0 +1,277 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Union
+
+from pytree._memory import MemoryUsage
+from pytree.Binarytree._bulk import is_array
+
+# every bitmap holds 64 bits, i.e every level takes 6 bits off the key
+_WORD_BITS = 6
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def _lowest_bit(bitmap: int) -> int:
+    return (bitmap & -bitmap).bit_length() - 1
+
+
+def _highest_bit(bitmap: int) -> int:
+    return bitmap.bit_length() - 1
+
+
+class SortedIntSet:
+    '''
+    - a sorted set of non-negative integers within [0, 2 ** bits), e.g ids or timestamps
+    - the integers are kept in a 64-way trie of bitmaps instead of a comparison tree:
+      * the bottom level maps (key >> 6) to a 64-bit bitmap of the keys' last 6 bits
+      * every level above maps (key >> 6 * (level + 1)) to a 64-bit bitmap
+        of which of the buckets below it aren't empty
+      -> ceil(bits / 6) levels, i.e 6 levels for 32-bit keys & 11 levels for 64-bit keys
+
+    - insert, delete, the neighbour queries (find_lt/gt/le/ge) & min/max are all O(bits / 6),
+      going up & down the levels at most once and finding the next set bit
+      of a bitmap in O(1) with bit tricks, regardless of the number of keys
+    - find (and 'in') is a single lookup on the bottom level
+    - dense keys take a couple of bytes each, as 64 neighbouring keys share a single bitmap
+    '''
+
+    __slots__ = ['bits', 'levels', '_size']
+
+    def __init__(self, bits: int = 64):
+        if bits < 1:
+            raise ValueError('bits should be at least 1')
+
+        self.bits = bits
+        # the bitmaps of every level, from the bottom (the keys) up to the top (a single bitmap)
+        self.levels: List[Dict[int, int]] = [{} for _ in range(-(-bits // _WORD_BITS))]
+        self._size = 0
+
+    @property
+    def dtype(self):
+        '''returns the data type of that a tree contains'''
+        return int if self._size else None
+
+    @property
+    def height(self) -> int:
+        return len(self.levels)
+
+    @classmethod
+    def fill_tree(cls, values: Iterable[int], bits: int = 64) -> 'SortedIntSet':
+        '''generates a sorted int set with all the values from an iterable'''
+        new_set = cls(bits)
+        new_set.extend(values)
+        return new_set
+
+    def _check_value(self, value: int) -> None:
+        if not isinstance(value, int):
+            raise TypeError(f"{type(self).__name__} only contains values of type 'int'")
+        if not 0 <= value < 1 << self.bits:
+            raise ValueError(f'{value} is out of the range of {type(self).__name__} [0, 2 ** {self.bits})')
+
+    def extend(self, values: Iterable[int]) -> None:
+        # numpy arrays are converted into python integers all at once
+        if is_array(values):
+            values = values.tolist()
+        for value in values:
+            self.insert(value)
+
+    def insert(self, value: int) -> None:
+        '''add the value into the set'''
+        self._check_value(value)
+
+        key = value
+        for level in self.levels:
+            bit = 1 << (key & _WORD_MASK)
+            key >>= _WORD_BITS
+            bitmap = level.get(key, 0)
+
+            if bitmap & bit:
+                return
+            level[key] = bitmap | bit
+
+            # the bucket wasn't empty, so the levels above already know about it
+            if bitmap:
+                break
+
+        self._size += 1
+
+    def delete(self, value: int) -> None:
+        '''remove the value from the set'''
+        if value not in self:
+            raise ValueError(f'{value} is not in {type(self).__name__}')
+
+        key = value
+        for level in self.levels:
+            bit = 1 << (key & _WORD_MASK)
+            key >>= _WORD_BITS
+            bitmap = level[key] & ~bit
+
+            if bitmap:
+                level[key] = bitmap
+                break
+
+            # the bucket is now empty, remove it from the level above as well
+            del level[key]
+
+        self._size -= 1
+
+    def clear(self) -> None:
+        for level in self.levels:
+            level.clear()
+        self._size = 0
+
+    def traverse(self, key: str = 'in') -> List[int]:
+        '''returns a list of all the values in the set from min-to-max, only in-order is supported'''
+        if key != 'in':
+            raise ValueError(f"{type(self).__name__} can only be traversed in order, not '{key}'")
+        return list(self)
+
+    def find(self, value: int) -> Union[int, None]:
+        '''get the value if it's in the set'''
+        self._check_value(value)
+        return value if value in self else None
+
+    def _descend(self, key: int, level_index: int, get_bit) -> int:
+        '''go down from the bucket at the given level to a value, picking the bit to follow at every level'''
+        levels = self.levels
+        for index in range(level_index, -1, -1):
+            key = (key << _WORD_BITS) | get_bit(levels[index][key])
+        return key
+
+    def _find_next(self, value: int, inclusive: bool) -> Union[int, None]:
+        '''
+        get the smallest value that's > (or >= with [inclusive]) the given value
+        -> go up the levels until a bucket has a set bit after the one on the value's path,
+           then go down through the smallest bits of the buckets below it
+        '''
+        key = value
+        for index, level in enumerate(self.levels):
+            low = key & _WORD_MASK
+            key >>= _WORD_BITS
+            bitmap = level.get(key, 0) & ((-1 if inclusive else -2) << low)
+
+            if bitmap:
+                return self._descend((key << _WORD_BITS) | _lowest_bit(bitmap), index - 1, _lowest_bit)
+
+            # the bucket on the value's path (if any) is already exhausted
+            inclusive = False
+
+        return None
+
+    def _find_prev(self, value: int, inclusive: bool) -> Union[int, None]:
+        '''
+        get the biggest value that's < (or <= with [inclusive]) the given value
+        -> go up the levels until a bucket has a set bit before the one on the value's path,
+           then go down through the biggest bits of the buckets below it
+        '''
+        key = value
+        for index, level in enumerate(self.levels):
+            low = key & _WORD_MASK
+            key >>= _WORD_BITS
+            bitmap = level.get(key, 0) & ((2 << low if inclusive else 1 << low) - 1)
+
+            if bitmap:
+                return self._descend((key << _WORD_BITS) | _highest_bit(bitmap), index - 1, _highest_bit)
+
+            inclusive = False
+
+        return None
+
+    def _check_query(self, value: int) -> None:
+        '''the neighbour queries accept any integer, the ones outside of the range are clamped into it'''
+        if not isinstance(value, int):
+            raise TypeError(f"{type(self).__name__} only contains values of type 'int'")
+
+    def find_lt(self, value: int) -> Union[int, None]:
+        '''get the biggest value that's < the given value'''
+        self._check_query(value)
+        if value <= 0:
+            return None
+        return self._find_prev(min(value, 1 << self.bits) - 1, True)
+
+    def find_le(self, value: int) -> Union[int, None]:
+        '''get the biggest value that's <= the given value'''
+        self._check_query(value)
+        if value < 0:
+            return None
+        return self._find_prev(min(value, (1 << self.bits) - 1), True)
+
+    def find_gt(self, value: int) -> Union[int, None]:
+        '''get the smallest value that's > the given value'''
+        self._check_query(value)
+        if value >= (1 << self.bits) - 1:
+            return None
+        return self._find_next(max(value + 1, 0), True)
+
+    def find_ge(self, value: int) -> Union[int, None]:
+        '''get the smallest value that's >= the given value'''
+        self._check_query(value)
+        if value >= 1 << self.bits:
+            return None
+        return self._find_next(max(value, 0), True)
+
+    def find_min(self) -> Union[int, None]:
+        if not self._size:
+            return None
+        top_index = len(self.levels) - 1
+        return self._descend(_lowest_bit(self.levels[top_index][0]), top_index - 1, _lowest_bit)
+
+    def find_max(self) -> Union[int, None]:
+        if not self._size:
+            return None
+        top_index = len(self.levels) - 1
+        return self._descend(_highest_bit(self.levels[top_index][0]), top_index - 1, _highest_bit)
+
+    def pop_min(self) -> int:
+        if not self._size:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__}')
+        min_value = self.find_min()
+        self.delete(min_value)
+        return min_value
+
+    def pop_max(self) -> int:
+        if not self._size:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__}')
+        max_value = self.find_max()
+        self.delete(max_value)
+        return max_value
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the set, in bytes
+        -> the bottom level (the bitmaps of the values) is counted as the nodes,
+           the levels above it as an index
+        '''
+        usage = MemoryUsage(num_elements=self._size)
+        for index, level in enumerate(self.levels):
+            level_size = sys.getsizeof(level) + sum(
+                sys.getsizeof(key) + sys.getsizeof(bitmap) for key, bitmap in level.items()
+            )
+            if index == 0:
+                usage.nodes += level_size
+            else:
+                usage.indexes += level_size
+        return usage
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        '''yields the values in sorted order, bucket by bucket'''
+        bottom_level = self.levels[0]
+        for key in sorted(bottom_level):
+            base = key << _WORD_BITS
+            bitmap = bottom_level[key]
+            while bitmap:
+                bit = bitmap & -bitmap
+                yield base | (bit.bit_length() - 1)
+                bitmap ^= bit
+
+    def __contains__(self, value: int) -> bool:
+        if not isinstance(value, int) or value < 0:
+            return False
+        return bool(self.levels[0].get(value >> _WORD_BITS, 0) >> (value & _WORD_MASK) & 1)
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __str__(self) -> str:
+        return str(self.traverse())
@@ -2,3 +2,8 @@ from .rbt_node import RBT_Node
 from .splay_node import Splay_Node
 from .avl_node import AVL_Node
 from .bst_node import BST_Node
+from .lazy_bst_node import LazyBST_Node
+from .merkle_avl_node import MerkleAVL_Node
+from .compact_node import CompactBST_Node, CompactAVL_Node, CompactRBT_Node
+from .order_stat_avl_node import OrderStatAVL_Node
+from .radix_node import Radix_Node
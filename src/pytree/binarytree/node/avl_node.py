@@ -22,65 +22,128 @@ class AVL_Node(BST_Node):
     height: int = field(default=0, compare=False)
     b_factor: int = field(default=0, compare=False)
 
-    def insert_node(self, value: CT) -> None:
-        new_node = self._insert_node(value)
+    # the nodes that keep a summary of their whole subtree (a hash, a size, etc)
+    # have to be updated all the way up to the root after every change,
+    # not only until the heights stop changing
+    update_to_root = False
+
+    def _set_build_status(self, depth: int, max_depth: int) -> None:
+        self._update_node_status()
+
+    def insert_node(self, value: CT, finger: 'AVL_Node' = None) -> 'AVL_Node':
+        start_node = finger._find_insertion_start(value) if finger else self
+        new_node = start_node._insert_node(value)
         if new_node:
             # only update the node if a new node has been inserted
             # the '_insert_node' will return None if the value already exists
             new_node._update_node()
+        return new_node
 
     def delete_node(self, node_to_delete: 'AVL_Node') -> None:
         deleted_node = node_to_delete._delete_node()
         deleted_node._update_node()
 
-    def _update_node(self) -> 'AVL_Node':
+    @classmethod
+    def _join(cls, left: 'AVL_Node', pivot: 'AVL_Node', right: 'AVL_Node') -> 'AVL_Node':
+        '''
+        join 2 detached trees together with a pivot node in between
+
+        - if both trees have similar height, the pivot simply becomes the new root
+        - otherwise, go down the inner spine of the taller tree until
+          a subtree with similar height to the shorter tree is found,
+          replace that subtree with the pivot (holding both of them)
+          and rebalance upwards like a normal insertion
+        '''
+        left_height = left.height if left else -1
+        right_height = right.height if right else -1
+
+        if abs(left_height - right_height) <= 1:
+            BST_Node._join(left, pivot, right)
+            pivot._update_node_status()
+            return pivot
+
+        if left_height > right_height:
+            parent_node, node = None, left
+            while node and node.height > right_height + 1:
+                parent_node, node = node, node.right
+            BST_Node._join(node, pivot, right)
+            parent_node.right = pivot
+        else:
+            parent_node, node = None, right
+            while node and node.height > left_height + 1:
+                parent_node, node = node, node.left
+            BST_Node._join(left, pivot, node)
+            parent_node.left = pivot
+
+        pivot.parent = parent_node
+        pivot._update_node()
+
+        return pivot.get_root()
+
+    def _update_node(self) -> None:
         '''
         internal function of the AVL node
 
         responsible for:
-        - updating the balancing factor and height of nodes
+        - updating the balancing factor and height of nodes,
+          from the node that has changed up to the root
         - doing the neccessary rotations that is invloved
+
+        - stops as soon as the height of a node stays the same,
+          as none of the nodes above it would change either
+          (unless the nodes have to be updated up to the root, see 'update_to_root')
         '''
-        self._update_node_status()
+        node = self
+        is_changed_node = True
+
+        while node:
+            old_height = node.height
+            node._update_node_status()
 
-        if self.b_factor > 1 or self.b_factor < -1:
-            self._rebalance()
+            if node.b_factor > 1 or node.b_factor < -1:
+                node = node._rebalance()
+            elif node.height == old_height and not is_changed_node and not node.update_to_root:
+                return
 
-        # keep going until the root node is reached
-        # then, just return the node for caching in the <Tree> class
-        if self.parent:
-            self.parent._update_node()
+            is_changed_node = False
+            node = node.parent
 
-    def _rebalance(self) -> None:
+    def _rebalance(self) -> 'AVL_Node':
         '''
         performs neccessary rotations based on the balancing factor of the node
-        updates the balancing factor of the node and the height
+        updates the balancing factor & the height of the rotated nodes, once each & from the bottom up
         -> to be used for the '_update_node' method
+        returns the node that took over the node's place
         '''
         # ROTATION PHASE
         # the node is skewed to the left / 'left heavy'
-        if self.b_factor == -2:
-            if self.left.b_factor <= 0:
+        if self.b_factor < 0:
+            left_node = self.left
+            if left_node.b_factor <= 0:
+                top_node = left_node
                 self._rotate_right()
             else:
-                self.left._rotate_left()
+                top_node = left_node.right
+                left_node._rotate_left()
                 self._rotate_right()
+                left_node._update_node_status()
 
         # the node is skewed to the right / 'right heavy'
-        if self.b_factor == +2:
-            if self.right.b_factor >= 0:
+        else:
+            right_node = self.right
+            if right_node.b_factor >= 0:
+                top_node = right_node
                 self._rotate_left()
             else:
-                self.right._rotate_right()
+                top_node = right_node.left
+                right_node._rotate_right()
                 self._rotate_left()
+                right_node._update_node_status()
 
         # UPDATING PHASE
-        if self.grandparent:
-            self.grandparent._update_node_status()
-
-        self.parent._update_node_status()
-        self.parent.right._update_node_status()
-        self.parent.left._update_node_status()
+        self._update_node_status()
+        top_node._update_node_status()
+        return top_node
 
     def _update_node_status(self) -> None:
         '''
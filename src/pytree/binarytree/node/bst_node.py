@@ -1,5 +1,5 @@
-from dataclasses import dataclass, field
-from typing import Generic, List, Union
+from dataclasses import dataclass, field, replace
+from typing import Callable, Generic, List, Sequence, Tuple, Union
 
 from pytree.Binarytree._type_hint import CT
 
@@ -19,41 +19,45 @@ class BST_Node(Generic[CT]):
     left: 'BST_Node' = field(default=None, repr=False, compare=False)
     right: 'BST_Node' = field(default=None, repr=False, compare=False)
 
+    # only the nodes of a lazily deleting tree can be marked as deleted
+    is_deleted = False
+    # compact nodes don't have any reference to their parent
+    is_compact = False
+
     @property
     def grandparent(self) -> Union['BST_Node', None]:
         '''get the parent of the parent of the node, if any'''
-        try:
-            return self.parent.parent
-        except AttributeError:
-            return None
+        parent_node = self.parent
+        return parent_node.parent if parent_node is not None else None
 
     @property
     def uncle(self) -> Union['BST_Node', None]:
         '''get the uncle of the parent of the node, if any'''
-        try:
-            return self.grandparent.right \
-                if self.parent is self.grandparent.left \
-                else self.grandparent.left
-
-        except AttributeError:
+        grandparent_node = self.grandparent
+        if grandparent_node is None:
             return None
 
+        return grandparent_node.right \
+            if self.parent is grandparent_node.left \
+            else grandparent_node.left
+
     @property
     def sibling(self) -> Union['BST_Node', None]:
         '''get the sibling of the node, if any'''
-        try:
-            # in case the node calling this has been deleted
-            if self.parent.left is None:
-                return self.parent.right
-            elif self.parent.right is None:
-                return self.parent.left
-
-            return self.parent.left \
-                if self is self.parent.right \
-                else self.parent.right
-        except AttributeError:
+        parent_node = self.parent
+        if parent_node is None:
             return None
 
+        # in case the node calling this has been deleted
+        if parent_node.left is None:
+            return parent_node.right
+        elif parent_node.right is None:
+            return parent_node.left
+
+        return parent_node.left \
+            if self is parent_node.right \
+            else parent_node.right
+
     @property
     def depth(self) -> int:
         depth = 0
@@ -65,14 +69,12 @@ class BST_Node(Generic[CT]):
 
     @property
     def height(self) -> int:
-        '''recursively get the height of the node'''
-        def traversal_counter(node) -> int:
-            if node is None:
-                return -1
-            return 1 + max(traversal_counter(node.left),
-                           traversal_counter(node.right))
-
-        return traversal_counter(self)
+        '''get the height of the node, level by level (a skewed tree can be deeper than the recursion limit)'''
+        height, level = -1, [self]
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return height
 
     @property
     def is_leaf(self) -> bool:
@@ -93,29 +95,48 @@ class BST_Node(Generic[CT]):
         post-order ['post']: root node as the end, from left to right
         level-order ['lvl']: from top-to-bottom, left-to-right, kinda like BST
         '''
+        # the traversals keep their own stack instead of recursing,
+        # so that a skewed tree doesn't run into the recursion limit
         def inorder_traversal(node: 'BST_Node', path: list) -> List[CT]:
-            if node.left:
-                inorder_traversal(node.left, path)
-            path.append(node)
-            if node.right:
-                inorder_traversal(node.right, path)
-            return path
+            stack = []
+            push, pop, visit = stack.append, stack.pop, path.append
+            while True:
+                while node is not None:
+                    push(node)
+                    node = node.left
+                if not stack:
+                    return path
+                node = pop()
+                visit(node)
+                node = node.right
 
         def postorder_traversal(node: 'BST_Node', path: list) -> List[CT]:
-            if node.left:
-                postorder_traversal(node.left, path)
-            if node.right:
-                postorder_traversal(node.right, path)
-            path.append(node)
-            return path
+            # the reverse of a pre-order traversal that goes to the right child first
+            stack = []
+            push, pop, visit = stack.append, stack.pop, path.append
+            while True:
+                while node is not None:
+                    visit(node)
+                    if node.left is not None:
+                        push(node.left)
+                    node = node.right
+                if not stack:
+                    path.reverse()
+                    return path
+                node = pop()
 
         def preorder_traversal(node: 'BST_Node', path: list) -> List[CT]:
-            path.append(node)
-            if node.left:
-                preorder_traversal(node.left, path)
-            if node.right:
-                preorder_traversal(node.right, path)
-            return path
+            stack = []
+            push, pop, visit = stack.append, stack.pop, path.append
+            while True:
+                while node is not None:
+                    visit(node)
+                    if node.right is not None:
+                        push(node.right)
+                    node = node.left
+                if not stack:
+                    return path
+                node = pop()
 
         def levelorder_traversal(node: 'BST_Node', path: list) -> List[CT]:
             from collections import deque
@@ -144,118 +165,217 @@ class BST_Node(Generic[CT]):
 
         return traversing_option[key](self, [])
 
-    def insert_node(self, value: CT) -> None:
-        '''insert a value into the binary tree'''
-        self._insert_node(value)
+    @classmethod
+    def build_from_sorted(cls, values: Sequence[CT]) -> 'BST_Node':
+        '''
+        build a height-balanced tree out of a sorted sequence of unique values
+        in O(n), the middle value of every slice becomes the parent node
+        returns the root node of the newly built tree
+        '''
+        # the depth of the deepest level of the tree,
+        # since the slices on both side differ in size by at most 1,
+        # every leaf node ends up on the last or second last level
+        max_depth = len(values).bit_length() - 1
 
-    def _insert_node(self, value: CT) -> Union[None, 'BST_Node']:
-        '''internal function of the binary tree where the recursions happen'''
-        if value == self.value:
-            return None
+        def build(lo: int, hi: int, parent: 'BST_Node', depth: int) -> Union['BST_Node', None]:
+            if lo >= hi:
+                return None
 
-        if value < self.value:
-            if self.left is None:
-                self.left = self.__class__(value, parent=self)
-                return self.left
-            else:
-                return self.left._insert_node(value)
+            mid = (lo + hi) // 2
+            node = cls(values[mid], parent=parent)
+            node.left = build(lo, mid, node, depth + 1)
+            node.right = build(mid + 1, hi, node, depth + 1)
+            node._set_build_status(depth, max_depth)
 
-        elif value > self.value:
-            if self.right is None:
-                self.right = self.__class__(value, parent=self)
-                return self.right
-            else:
-                return self.right._insert_node(value)
+            return node
 
-    def find_node(self, value: CT) -> Union[None, 'BST_Node']:
-        '''search for the given value in the binary tree'''
-        if self.value is None:
-            return None
-        elif self.value == value:
-            return self
-        if self.left and value < self.value:
-            return self.left.find_node(value)
-        elif self.right and value > self.value:
-            return self.right.find_node(value)
+        root = build(0, len(values), None, 0)
+        return root if root is not None else cls()
 
-    def find_gt_node(self, value: CT) -> Union['BST_Node', None]:
+    def _set_build_status(self, depth: int, max_depth: int) -> None:
         '''
-        find the node with the closest value
-        that's less than or equal to the given value
+        hook for the node variants to set up their balancing information
+        during 'build_from_sorted', both child nodes are already built
         '''
-        if value < self.value:
-            if self.left and value <= self.left.value:
-                return self.left.find_gt_node(value)
-            else:
-                return self
-        else:
-            if self.right:
-                return self.right.find_gt_node(value)
-            return None
+        pass
 
-    def find_lt_node(self, value: CT) -> Union['BST_Node', None]:
+    def copy_node(self, copy_value: Callable[[CT], CT] = None) -> 'BST_Node':
+        '''
+        clone the tree under this node, node by node, in a single iterative pass
+        - every other field of the nodes (height, color, etc) is copied as is,
+          so no rebalancing is needed for the cloned tree
+        - the values are shared with the original nodes,
+          unless a function to copy the values is given
+        returns the root node of the cloned tree
+        '''
+        def clone(node: 'BST_Node', parent: Union['BST_Node', None]) -> 'BST_Node':
+            value = copy_value(node.value) if copy_value else node.value
+            return replace(node, value=value, parent=parent, left=None, right=None)
+
+        new_root = clone(self, None)
+        stack = [(self, new_root)]
+
+        while stack:
+            node, new_node = stack.pop()
+            if node.left:
+                new_node.left = clone(node.left, new_node)
+                stack.append((node.left, new_node.left))
+            if node.right:
+                new_node.right = clone(node.right, new_node)
+                stack.append((node.right, new_node.right))
+
+        return new_root
+
+    def insert_node(self, value: CT, finger: 'BST_Node' = None) -> Union[None, 'BST_Node']:
         '''
-        find the node with the closest value
-        that's less than or equal to the given value
+        insert a value into the binary tree
+        - if a 'finger' node is given, the search starts from that node
+          instead of the root node
+        returns the newly inserted node, if any
         '''
+        start_node = finger._find_insertion_start(value) if finger else self
+        return start_node._insert_node(value)
+
+    def _find_insertion_start(self, value: CT) -> 'BST_Node':
+        '''
+        climb up from this node until the lowest ancestor
+        whose subtree is guaranteed to hold the given value is reached
+
+        - every subtree is bounded by the values of its ancestors,
+          since the value lies on one side of this node, only the bound
+          on that side has to be checked while climbing up
+        - for values close to this node, only a few levels are climbed
+        '''
+        node = self
         if value > self.value:
-            if self.right and value >= self.right.value:
-                return self.right.find_lt_node(value)
-            else:
-                return self
+            while node.parent and not (node is node.parent.left and value < node.parent.value):
+                node = node.parent
         else:
-            if self.left:
-                return self.left.find_lt_node(value)
-            return None
+            while node.parent and not (node is node.parent.right and value > node.parent.value):
+                node = node.parent
+        return node
 
-    def find_le_node(self, value: CT) -> Union['BST_Node', None]:
+    def _insert_node(self, value: CT) -> Union[None, 'BST_Node']:
         '''
-        find the node with the closest value
-        that's less than or equal to the given value
+        internal function of the binary tree, going down from this node to where the value belongs
+        -> a loop rather than a recursion, so that a skewed tree doesn't run into the recursion limit
         '''
+        node = self
+        while True:
+            if value == node.value:
+                # only the nodes of a lazily deleting tree can be brought back
+                if node.is_deleted:
+                    node.is_deleted = False
+                    return node
+                return None
+
+            if value < node.value:
+                if node.left is None:
+                    node.left = node.__class__(value, parent=node)
+                    return node.left
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = node.__class__(value, parent=node)
+                    return node.right
+                node = node.right
 
-        # if the leaf node has been reached, but the value is still smaller
-        # than the smallest value in the tree
-        if not (self.left and self.right) and value < self.value:
+    def find_node(self, value: CT) -> Union[None, 'BST_Node']:
+        '''search for the given value in the binary tree'''
+        if self.value is None:
             return None
 
-        if self.value <= value and \
-           (self.right is None or self.right.value > value):
-            return self
+        node = self
+        while node is not None:
+            if node.value == value:
+                return node
+            node = node.left if value < node.value else node.right
+        return None
 
-        if self.value >= value:
-            return self.left.find_lt_node(value)
-        else:
-            return self.right.find_lt_node(value)
+    def find_gt_node(self, value: CT) -> Union['BST_Node', None]:
+        '''find the node with the closest value that's > the given value'''
+        # every node that's bigger than the value is a candidate,
+        # go left to look for a closer one, otherwise go right
+        node, candidate = self, None
+        while node:
+            if node.value > value:
+                candidate, node = node, node.left
+            else:
+                node = node.right
+        return candidate
+
+    def find_lt_node(self, value: CT) -> Union['BST_Node', None]:
+        '''find the node with the closest value that's < the given value'''
+        node, candidate = self, None
+        while node:
+            if node.value < value:
+                candidate, node = node, node.right
+            else:
+                node = node.left
+        return candidate
+
+    def find_le_node(self, value: CT) -> Union['BST_Node', None]:
+        '''find the node with the closest value that's <= the given value'''
+        node, candidate = self, None
+        while node:
+            if node.value == value:
+                return node
+            if node.value < value:
+                candidate, node = node, node.right
+            else:
+                node = node.left
+        return candidate
 
     def find_ge_node(self, value: CT) -> Union['BST_Node', None]:
         '''find the node with the closest value that's >= the given value'''
+        node, candidate = self, None
+        while node:
+            if node.value == value:
+                return node
+            if node.value > value:
+                candidate, node = node, node.left
+            else:
+                node = node.right
+        return candidate
 
-        # if the leaf node has been reached, but the value is still bigger
-        # than the biggest value in the tree
-        if not (self.left and self.right) and value > self.value:
-            return None
+    def get_successor(self) -> Union['BST_Node', None]:
+        '''
+        get the node with the next bigger value in the tree, if any
+        - the min node of the right subtree, if there's a right subtree
+        - otherwise, the first ancestor that has this node in its left subtree
+        -> O(1) amortized when stepping through consecutive nodes
+        '''
+        if self.right:
+            return self.right.find_min_node()
 
-        # if the node's value is greater or equal to the given value
-        if self.value >= value and (self.left is None or self.left.value < value):
-            return self
+        node = self
+        while node.parent and node is node.parent.right:
+            node = node.parent
+        return node.parent
 
-        if self.value <= value:
-            return self.right.find_gt_node(value)
-        else:
-            return self.left.find_gt_node(value)
+    def get_predecessor(self) -> Union['BST_Node', None]:
+        '''get the node with the next smaller value in the tree, if any'''
+        if self.left:
+            return self.left.find_max_node()
+
+        node = self
+        while node.parent and node is node.parent.left:
+            node = node.parent
+        return node.parent
 
     def find_min_node(self) -> 'BST_Node':
         '''find the minimum value relative to a specific node in the tree'''
-        if self.left is None:
-            return self
-        return self.left.find_min_node()
+        node = self
+        while node.left is not None:
+            node = node.left
+        return node
 
     def find_max_node(self) -> 'BST_Node':
         '''find the maximum value relative to a specific node in the tree'''
-        if self.right is None:
-            return self
-        return self.right.find_max_node()
+        node = self
+        while node.right is not None:
+            node = node.right
+        return node
 
     def delete_node(self, node_to_delete: 'BST_Node') -> None:
         '''remove the given vaue from the binary tree'''
@@ -353,7 +473,7 @@ class BST_Node(Generic[CT]):
         # CASE 1: node have 0 child
         if self.left is None and self.right is None:
             if self.parent:
-                if self.parent.left == self:
+                if self.parent.left is self:
                     self.parent.left = None
                 else:
                     self.parent.right = None
@@ -377,7 +497,7 @@ class BST_Node(Generic[CT]):
 
                 # rewire the relationship
                 child_node.parent = self.parent
-                if self.parent.left == self:
+                if self.parent.left is self:
                     self.parent.left = child_node
                 else:
                     self.parent.right = child_node
@@ -385,24 +505,128 @@ class BST_Node(Generic[CT]):
             # if the node is the root node
             else:
 
-                # swap identity with the child node
-                self.update(
-                    parent=child_node.parent,
-                    left=child_node.left,
-                    right=child_node.right,
-                    value=child_node.value
-                )
+                # swap identity with the child node,
+                # the node stays as the root, so it keeps its (lack of) parent
+                self.left = child_node.left
+                self.right = child_node.right
+                self.value = child_node.value
 
                 if child_node.right:
                     child_node.right.parent = self
                 if child_node.left:
                     child_node.left.parent = self
 
-                # get rid of the cyclic reference after the identity swap
-                self.parent = None
-
             return child_node
 
+    def delete_node_range(self, lo: CT, hi: CT) -> Tuple[Union['BST_Node', None], int]:
+        '''
+        remove all the values within [lo, hi] from the tree (this node should be the root)
+
+        - the tree is split into 3 parts at the bounds: < lo, [lo, hi] and > hi
+        - the middle part is dropped as a whole and the other 2 parts
+          are joined back together
+        - the balance of the tree is restored during the splits & the joins
+          instead of after the removal of every single value
+
+        returns the new root node (None if the tree is emptied)
+        and the number of removed values
+        '''
+        node_type = type(self)
+
+        left, lo_node, rest = node_type._split(self, lo)
+        middle, hi_node, right = node_type._split(rest, hi)
+
+        # nodes that are only marked as deleted don't count
+        num_removed = sum(not node.is_deleted for node in middle.traverse_node()) if middle else 0
+        num_removed += sum(not node.is_deleted for node in (lo_node, hi_node) if node is not None)
+
+        return node_type._join_trees(left, right), num_removed
+
+    @classmethod
+    def _split(
+        cls,
+        node: Union['BST_Node', None],
+        value: CT
+    ) -> Tuple[Union['BST_Node', None], Union['BST_Node', None], Union['BST_Node', None]]:
+        '''
+        split the tree into 2 detached trees, with values < and > the given value
+        returns the 2 trees and the node with the given value in between, if any
+
+        - the path down to the value is walked first, then the nodes along it
+          are joined back up onto either side, from the bottom to the top
+          -> no recursion, so that a skewed tree doesn't run into the recursion limit
+        '''
+        path = []
+        left, found_node, right = None, None, None
+
+        while node is not None:
+            node_left, node_right = node.left, node.right
+            if node_left:
+                node_left.parent = None
+            if node_right:
+                node_right.parent = None
+
+            if value == node.value:
+                left, found_node, right = node_left, node, node_right
+                break
+
+            # the node goes to the side opposite to the one the value is on, along with its other subtree
+            if value < node.value:
+                path.append((node, node_right, True))
+                node = node_left
+            else:
+                path.append((node, node_left, False))
+                node = node_right
+
+        for node, other_subtree, is_right_side in reversed(path):
+            if is_right_side:
+                right = cls._join(right, node, other_subtree)
+            else:
+                left = cls._join(other_subtree, node, left)
+
+        return left, found_node, right
+
+    @classmethod
+    def _join(
+        cls,
+        left: Union['BST_Node', None],
+        pivot: 'BST_Node',
+        right: Union['BST_Node', None]
+    ) -> 'BST_Node':
+        '''
+        join 2 detached trees together with a pivot node in between
+        -> all values in left < pivot's value < all values in right
+        returns the root node of the joined tree
+        '''
+        pivot.parent = None
+        pivot.left = left
+        pivot.right = right
+
+        if left:
+            left.parent = pivot
+        if right:
+            right.parent = pivot
+
+        return pivot
+
+    @classmethod
+    def _join_trees(
+        cls,
+        left: Union['BST_Node', None],
+        right: Union['BST_Node', None]
+    ) -> Union['BST_Node', None]:
+        '''
+        join 2 detached trees together, all values in left < all values in right
+        -> the min node of the right tree is taken out to be the pivot
+        '''
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        _, pivot, right = cls._split(right, right.find_min_node().value)
+        return cls._join(left, pivot, right)
+
     def _rotate_left(self) -> None:
         """
         Rotates left:
@@ -441,7 +665,7 @@ class BST_Node(Generic[CT]):
 
         if parent_node:
             # set the role of X based of the role of Y (right_child/left_child)
-            if parent_node.right == self:
+            if parent_node.right is self:
                 parent_node.right = right_node
             else:
                 parent_node.left = right_node
@@ -483,7 +707,7 @@ class BST_Node(Generic[CT]):
 
         if parent_node:
             # set the role of X based of the role of Y (right_child/left_child)
-            if parent_node.left == self:
+            if parent_node.left is self:
                 parent_node.left = left_node
             else:
                 parent_node.right = left_node
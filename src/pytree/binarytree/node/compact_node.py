@@ -0,0 +1,466 @@
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Generic, List, Sequence, Tuple, Union
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree.Node.bst_node import BST_Node
+
+
+@dataclass(order=True, slots=True)
+class CompactBST_Node(Generic[CT]):
+    '''
+    - a binary search tree node without any reference to its parent,
+      saving a reference per node & the extra writes in every rotation
+
+    - every modification starts from the root node, the nodes on the way down
+      are recorded on a stack (the 'path') and the rebalancing goes back up
+      through that stack instead of following the parent references
+
+    - the root node always stays as the same object,
+      a rotation at the root swaps the contents of the 2 rotated nodes instead
+
+    P.S: NOT to be used independantly as is,
+         should use the 'Tree' class as the interface
+    '''
+
+    value: CT = None
+    left: 'CompactBST_Node' = field(default=None, repr=False, compare=False)
+    right: 'CompactBST_Node' = field(default=None, repr=False, compare=False)
+
+    # compact nodes never know their parent,
+    # so every node looks like a root node to the 'Tree' class
+    parent = None
+    is_compact = True
+    is_deleted = False
+
+    # the methods that only ever go downwards are shared with the normal nodes
+    height = BST_Node.height
+    is_leaf = BST_Node.is_leaf
+    is_branch = BST_Node.is_branch
+    traverse_node = BST_Node.traverse_node
+    find_node = BST_Node.find_node
+    find_gt_node = BST_Node.find_gt_node
+    find_lt_node = BST_Node.find_lt_node
+    find_le_node = BST_Node.find_le_node
+    find_ge_node = BST_Node.find_ge_node
+    find_min_node = BST_Node.find_min_node
+    find_max_node = BST_Node.find_max_node
+    _set_build_status = BST_Node._set_build_status
+
+    @classmethod
+    def build_from_sorted(cls, values: Sequence[CT]) -> 'CompactBST_Node':
+        '''
+        build a height-balanced tree out of a sorted sequence of unique values
+        in O(n), the middle value of every slice becomes the parent node
+        '''
+        max_depth = len(values).bit_length() - 1
+
+        def build(lo: int, hi: int, depth: int) -> Union['CompactBST_Node', None]:
+            if lo >= hi:
+                return None
+
+            mid = (lo + hi) // 2
+            node = cls(values[mid])
+            node.left = build(lo, mid, depth + 1)
+            node.right = build(mid + 1, hi, depth + 1)
+            node._set_build_status(depth, max_depth)
+
+            return node
+
+        root = build(0, len(values), 0)
+        return root if root is not None else cls()
+
+    def copy_node(self, copy_value: Callable[[CT], CT] = None) -> 'CompactBST_Node':
+        '''clone the tree under this node, node by node, in a single iterative pass'''
+        def clone(node: 'CompactBST_Node') -> 'CompactBST_Node':
+            value = copy_value(node.value) if copy_value else node.value
+            return replace(node, value=value, left=None, right=None)
+
+        new_root = clone(self)
+        stack = [(self, new_root)]
+
+        while stack:
+            node, new_node = stack.pop()
+            if node.left:
+                new_node.left = clone(node.left)
+                stack.append((node.left, new_node.left))
+            if node.right:
+                new_node.right = clone(node.right)
+                stack.append((node.right, new_node.right))
+
+        return new_root
+
+    def _get_path(self, value: CT) -> List['CompactBST_Node']:
+        '''
+        go down from this node towards the given value
+        returns all the nodes on the way, ending with the node
+        with the given value or the node that the value would be attached to
+        '''
+        path, node = [], self
+        while node:
+            path.append(node)
+            if value == node.value:
+                break
+            node = node.left if value < node.value else node.right
+        return path
+
+    def insert_node(self, value: CT, finger: 'CompactBST_Node' = None) -> Union[None, 'CompactBST_Node']:
+        '''
+        insert a value into the tree (this node should be the root)
+        - there's no way to climb up from a 'finger' node, so it's ignored
+        returns the node holding the newly inserted value, if any
+        '''
+        path = self._get_path(value)
+        if path[-1].value == value:
+            return None
+
+        new_node = self.__class__(value)
+        if value < path[-1].value:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        self._update_insert(path, new_node)
+
+        # a rotation at the root might have moved the value into the root node
+        return new_node if new_node.value == value else self
+
+    def _update_insert(self, path: List['CompactBST_Node'], new_node: 'CompactBST_Node') -> None:
+        '''hook for the balanced variants, to rebalance after the insertion'''
+        pass
+
+    def delete_node(self, node_to_delete: 'CompactBST_Node') -> None:
+        '''
+        remove the given node from the tree (this node should be the root)
+        -> the node is looked up again from the root by its value,
+           to record the path down to it
+        '''
+        self._delete_value(node_to_delete.value)
+
+    def _delete_value(self, value: CT) -> None:
+        path = self._get_path(value)
+
+        # CASE 2: node have 2 child, take the value of its successor instead
+        node = path[-1]
+        if node.left and node.right:
+            successor_node = node.right
+            path.append(successor_node)
+            while successor_node.left:
+                successor_node = successor_node.left
+                path.append(successor_node)
+            node.value = successor_node.value
+
+        # CASE 1 & 3: node have 0/1 child, replace it with the child
+        removed_node = path.pop()
+        child_node = removed_node.left if removed_node.left else removed_node.right
+
+        if not path:
+            if child_node:
+                # the root node takes over everything from its only child
+                for node_field in fields(self):
+                    setattr(self, node_field.name, getattr(child_node, node_field.name))
+                self._update_delete_root()
+            else:
+                self.value = None
+            return
+
+        if path[-1].left is removed_node:
+            path[-1].left = child_node
+        else:
+            path[-1].right = child_node
+
+        self._update_delete(path, removed_node, child_node)
+
+    def _update_delete(
+        self,
+        path: List['CompactBST_Node'],
+        removed_node: 'CompactBST_Node',
+        child_node: Union['CompactBST_Node', None]
+    ) -> None:
+        '''hook for the balanced variants, to rebalance after the deletion'''
+        pass
+
+    def _update_delete_root(self) -> None:
+        '''hook for the balanced variants, after the root node took over its only child'''
+        pass
+
+    def delete_node_range(self, lo: CT, hi: CT) -> Tuple[Union['CompactBST_Node', None], int]:
+        '''
+        remove all the values within [lo, hi] from the tree (this node should be the root)
+        -> without the parent references the tree can't be split & joined,
+           so the values are removed one by one, O(k log n)
+        '''
+        values_to_delete = []
+
+        def collect_values(node: Union['CompactBST_Node', None]) -> None:
+            if node is None:
+                return
+            if node.value > lo:
+                collect_values(node.left)
+            if lo <= node.value <= hi:
+                values_to_delete.append(node.value)
+            if node.value < hi:
+                collect_values(node.right)
+
+        collect_values(self)
+        for value in values_to_delete:
+            self._delete_value(value)
+
+        return (self if self.value is not None else None), len(values_to_delete)
+
+    def _rotate_path(self, path: List['CompactBST_Node'], index: int, to_left: bool) -> None:
+        '''
+        rotate the node at the given index of the path (to the left/right)
+        and update the path to match, the rotated node moves down by 1 level
+
+        - the parent of the node is taken from the path
+        - the root node is kept as the same object by swapping
+          the contents of the 2 rotated nodes
+        '''
+        node = path[index]
+        top_node = node._rotate_left() if to_left else node._rotate_right()
+
+        if index == 0:
+            node._swap_contents(top_node)
+            node, top_node = top_node, node
+        elif path[index - 1].left is node:
+            path[index - 1].left = top_node
+        else:
+            path[index - 1].right = top_node
+
+        path[index] = top_node
+        path.insert(index + 1, node)
+
+    def _swap_contents(self, other: 'CompactBST_Node') -> None:
+        '''swap everything between the 2 nodes, keeping the references between them intact'''
+        for node_field in fields(self):
+            self_attr = getattr(self, node_field.name)
+            setattr(self, node_field.name, getattr(other, node_field.name))
+            setattr(other, node_field.name, self_attr)
+
+        if self.left is self:
+            self.left = other
+        elif self.right is self:
+            self.right = other
+
+    def _rotate_left(self) -> 'CompactBST_Node':
+        '''
+        rotate the node down to the left, its right child takes its place
+        returns the right child, the parent should be relinked to it
+        '''
+        right_node = self.right
+        self.right = right_node.left
+        right_node.left = self
+        return right_node
+
+    def _rotate_right(self) -> 'CompactBST_Node':
+        '''
+        rotate the node down to the right, its left child takes its place
+        returns the left child, the parent should be relinked to it
+        '''
+        left_node = self.left
+        self.left = left_node.right
+        left_node.right = self
+        return left_node
+
+
+@dataclass(order=True, slots=True)
+class CompactAVL_Node(CompactBST_Node):
+    '''
+    - the compact version of the AVL node, no parent & no stored balancing factor
+    - the heights are updated going back up the path,
+      and the updating stops as soon as a subtree keeps its old height
+    '''
+
+    height: int = field(default=0, compare=False)
+
+    @property
+    def b_factor(self) -> int:
+        left_height = self.left.height if self.left else -1
+        right_height = self.right.height if self.right else -1
+        return right_height - left_height
+
+    def _set_build_status(self, depth: int, max_depth: int) -> None:
+        self._update_node_status()
+
+    def _update_node_status(self) -> None:
+        left_height = self.left.height if self.left else -1
+        right_height = self.right.height if self.right else -1
+        self.height = 1 + max(left_height, right_height)
+
+    def _update_insert(self, path: List['CompactAVL_Node'], new_node: 'CompactAVL_Node') -> None:
+        self._rebalance_path(path)
+
+    def _update_delete(
+        self,
+        path: List['CompactAVL_Node'],
+        removed_node: 'CompactAVL_Node',
+        child_node: Union['CompactAVL_Node', None]
+    ) -> None:
+        self._rebalance_path(path)
+
+    def _rebalance_path(self, path: List['CompactAVL_Node']) -> None:
+        '''
+        go back up the path, updating the heights & rotating the skewed nodes
+        -> the nodes above a subtree that kept its height are left untouched
+        '''
+        for index in range(len(path) - 1, -1, -1):
+            node = path[index]
+            old_height = node.height
+            node._update_node_status()
+
+            b_factor = node.b_factor
+            if b_factor < -1:
+                if node.left.b_factor > 0:
+                    node.left = node.left._rotate_left()
+                self._rotate_path(path, index, to_left=False)
+            elif b_factor > 1:
+                if node.right.b_factor < 0:
+                    node.right = node.right._rotate_right()
+                self._rotate_path(path, index, to_left=True)
+
+            if path[index].height == old_height:
+                break
+
+    def _rotate_left(self) -> 'CompactAVL_Node':
+        top_node = CompactBST_Node._rotate_left(self)
+        self._update_node_status()
+        top_node._update_node_status()
+        return top_node
+
+    def _rotate_right(self) -> 'CompactAVL_Node':
+        top_node = CompactBST_Node._rotate_right(self)
+        self._update_node_status()
+        top_node._update_node_status()
+        return top_node
+
+
+@dataclass(order=True, slots=True)
+class CompactRBT_Node(CompactBST_Node):
+    '''
+    - the compact version of the Red-Black tree node
+    - the grandparent/uncle/sibling of a node are read off the path
+      instead of following the parent references
+    '''
+
+    is_red: bool = field(default=True, compare=False)
+
+    @property
+    def is_black(self) -> bool:
+        return not self.is_red
+
+    def _set_build_status(self, depth: int, max_depth: int) -> None:
+        self.is_red = depth == max_depth and depth > 0
+
+    def _update_insert(self, path: List['CompactRBT_Node'], new_node: 'CompactRBT_Node') -> None:
+        '''
+        - CASE 2 (red uncle): recolor and continue from the grandparent,
+          2 levels up the path
+        - CASE 1 (black uncle): rotate the grandparent (twice for a {<} or {>} shape),
+          then the rotated subtree is valid again
+        '''
+        node = new_node
+        while len(path) >= 2 and path[-1].is_red:
+            parent_node, grandparent_node = path[-1], path[-2]
+            is_left = parent_node is grandparent_node.left
+            uncle_node = grandparent_node.right if is_left else grandparent_node.left
+
+            # CASE 2
+            if uncle_node and uncle_node.is_red:
+                parent_node.is_red = False
+                uncle_node.is_red = False
+                grandparent_node.is_red = True
+
+                node = grandparent_node
+                del path[-2:]
+                continue
+
+            # CASE 1
+            if is_left:
+                if node is parent_node.right:
+                    grandparent_node.left = parent_node._rotate_left()
+                grandparent_node.left.is_red = False
+            else:
+                if node is parent_node.left:
+                    grandparent_node.right = parent_node._rotate_right()
+                grandparent_node.right.is_red = False
+
+            grandparent_node.is_red = True
+            self._rotate_path(path, len(path) - 2, to_left=not is_left)
+            break
+
+        self.is_red = False
+
+    def _update_delete_root(self) -> None:
+        self.is_red = False
+
+    def _update_delete(
+        self,
+        path: List['CompactRBT_Node'],
+        removed_node: 'CompactRBT_Node',
+        child_node: Union['CompactRBT_Node', None]
+    ) -> None:
+        '''
+        - removing a red node, or a black node with a red child
+          (which is colored black) keeps every black height the same
+        - otherwise the child's spot is 'double black' and is resolved
+          going back up the path, with the same cases as the normal node:
+
+          CASE 3 (red sibling): rotate the parent, then the sibling is black
+          CASE 2 (black sibling, black children): recolor and move up 1 level
+          CASE 1 (black sibling, red child): rotate (twice for a {<} or {>} shape) and end
+        '''
+        if removed_node.is_red:
+            return
+
+        if child_node and child_node.is_red:
+            child_node.is_red = False
+            return
+
+        node = child_node
+        while path:
+            parent_node = path[-1]
+            is_left = parent_node.left is node
+            sibling_node = parent_node.right if is_left else parent_node.left
+
+            # CASE 3
+            if sibling_node.is_red:
+                sibling_node.is_red = False
+                parent_node.is_red = True
+                self._rotate_path(path, len(path) - 1, to_left=is_left)
+                continue
+
+            near_node = sibling_node.left if is_left else sibling_node.right
+            far_node = sibling_node.right if is_left else sibling_node.left
+
+            # CASE 2
+            if not (near_node and near_node.is_red) and not (far_node and far_node.is_red):
+                sibling_node.is_red = True
+                if parent_node.is_red:
+                    parent_node.is_red = False
+                    break
+
+                node = path.pop()
+                continue
+
+            # CASE 1
+            if not (far_node and far_node.is_red):
+                near_node.is_red = False
+                sibling_node.is_red = True
+                if is_left:
+                    sibling_node = parent_node.right = sibling_node._rotate_right()
+                else:
+                    sibling_node = parent_node.left = sibling_node._rotate_left()
+                far_node = sibling_node.right if is_left else sibling_node.left
+
+            sibling_node.is_red = parent_node.is_red
+            parent_node.is_red = False
+            far_node.is_red = False
+            self._rotate_path(path, len(path) - 1, to_left=is_left)
+            break
+
+        self.is_red = False
+
+    def __str__(self):
+        return str(f" \
+            CompactRBT_Node(value: {self.value}, \
+            color: {'red' if self.is_red else 'black'})")
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import Union
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree.Node.bst_node import BST_Node
+
+
+@dataclass(order=True, slots=True)
+class LazyBST_Node(BST_Node):
+    '''
+    - the node class for a binary search tree with lazy deletion
+    - a deleted node is only marked as deleted (a 'tombstone')
+      and stays in the tree until the tree gets rebuilt
+    - all the searches skip over the marked nodes,
+      re-inserting a deleted value simply unmarks its node
+
+    P.S: the structural methods (rotations, find_min_node, etc)
+         still see every node, marked or not
+    '''
+
+    is_deleted: bool = field(default=False, compare=False)
+
+    def find_node(self, value: CT) -> Union[None, 'LazyBST_Node']:
+        found_node = BST_Node.find_node(self, value)
+        return found_node if found_node and not found_node.is_deleted else None
+
+    def find_gt_node(self, value: CT) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.find_gt_node(self, value), BST_Node.get_successor)
+
+    def find_ge_node(self, value: CT) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.find_ge_node(self, value), BST_Node.get_successor)
+
+    def find_lt_node(self, value: CT) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.find_lt_node(self, value), BST_Node.get_predecessor)
+
+    def find_le_node(self, value: CT) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.find_le_node(self, value), BST_Node.get_predecessor)
+
+    def get_successor(self) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.get_successor(self), BST_Node.get_successor)
+
+    def get_predecessor(self) -> Union[None, 'LazyBST_Node']:
+        return self._skip_deleted(BST_Node.get_predecessor(self), BST_Node.get_predecessor)
+
+    @staticmethod
+    def _skip_deleted(node: Union[None, 'LazyBST_Node'], step) -> Union[None, 'LazyBST_Node']:
+        '''keep stepping to the neighbouring node until an unmarked one is found'''
+        while node and node.is_deleted:
+            node = step(node)
+        return node
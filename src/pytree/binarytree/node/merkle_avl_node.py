@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Union
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree.Node.avl_node import AVL_Node
+
+HASH_MASK = (1 << 64) - 1
+
+
+def get_digest(value: CT) -> int:
+    '''
+    a 64-bit digest of the value that stays the same across processes
+    (unlike the builtin 'hash', which is salted for strings)
+    '''
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+        # splitmix64 finalizer, mixes up the bits of small integers
+        x = (value + 0x9E3779B97F4A7C15) & HASH_MASK
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & HASH_MASK
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & HASH_MASK
+        return x ^ (x >> 31)
+
+    return int.from_bytes(blake2b(repr(value).encode(), digest_size=8).digest(), 'little')
+
+
+@dataclass(order=True, slots=True)
+class MerkleAVL_Node(AVL_Node):
+    '''
+    - an AVL node that also keeps the hash of its whole subtree
+
+    - the subtree hash is the sum of the digests of all the values
+      within the subtree, so it only depends on the values and
+      not on the shape of the tree
+      -> 2 trees holding the same values in different shapes
+         still get the same hash, as do any 2 ranges of values
+
+    - the hash is updated along with the height of the node,
+      which happens for every node on the path of an insert/delete
+      and for every rotated node
+    '''
+
+    subtree_hash: int = field(default=0, repr=False, compare=False)
+
+    # the summary of the subtree changes for every node above a changed node
+    update_to_root = True
+
+    def _update_node_status(self) -> None:
+        AVL_Node._update_node_status(self)
+
+        left_hash = self.left.subtree_hash if self.left else 0
+        right_hash = self.right.subtree_hash if self.right else 0
+        self.subtree_hash = (get_digest(self.value) + left_hash + right_hash) & HASH_MASK
+
+    def get_range_hash(self, lo: Union[CT, None], hi: Union[CT, None]) -> int:
+        '''
+        get the combined hash of all the values within the (lo, hi) range,
+        exclusive on both ends, a bound of None means unbounded
+        -> only walks down the 2 paths to the bounds, O(log n)
+        '''
+        # go down until the node that splits the range is found
+        node = self
+        while node:
+            if lo is not None and node.value <= lo:
+                node = node.right
+            elif hi is not None and node.value >= hi:
+                node = node.left
+            else:
+                break
+
+        if node is None:
+            return 0
+
+        range_hash = get_digest(node.value)
+
+        # every value in the left subtree is < hi, only lo has to be checked
+        left_node = node.left
+        while left_node:
+            if lo is None or left_node.value > lo:
+                range_hash += get_digest(left_node.value)
+                range_hash += left_node.right.subtree_hash if left_node.right else 0
+                left_node = left_node.left
+            else:
+                left_node = left_node.right
+
+        # every value in the right subtree is > lo, only hi has to be checked
+        right_node = node.right
+        while right_node:
+            if hi is None or right_node.value < hi:
+                range_hash += get_digest(right_node.value)
+                range_hash += right_node.left.subtree_hash if right_node.left else 0
+                right_node = right_node.right
+            else:
+                right_node = right_node.left
+
+        return range_hash & HASH_MASK
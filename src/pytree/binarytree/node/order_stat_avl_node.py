@@ -0,0 +1,76 @@
+from dataclasses import dataclass, field
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree.Node.avl_node import AVL_Node
+
+
+@dataclass(order=True, slots=True)
+class OrderStatAVL_Node(AVL_Node):
+    '''
+    - an AVL node that also keeps the number of values within its subtree,
+      so the rank of a value & the value at a rank are both found in O(log n)
+
+    - a node can hold its value multiple times, 'count' being the multiplicity,
+      and every value is counted as many times as it's held in the sizes
+
+    - the size is updated along with the height of the node,
+      which happens for every node on the path of an insert/delete
+      and for every rotated node
+    '''
+
+    count: int = field(default=1, compare=False)
+    size: int = field(default=1, compare=False)
+
+    # the summary of the subtree changes for every node above a changed node
+    update_to_root = True
+
+    def _update_node_status(self) -> None:
+        AVL_Node._update_node_status(self)
+
+        left_size = self.left.size if self.left else 0
+        right_size = self.right.size if self.right else 0
+        self.size = self.count + left_size + right_size
+
+    def _delete_node(self) -> 'OrderStatAVL_Node':
+        # the node takes over the value of its successor (2 child nodes)
+        # or of its only child (root node), along with the value's count
+        if self.left and self.right:
+            self.count = self.right.find_min_node().count
+        elif self.parent is None and (self.left or self.right):
+            self.count = (self.left if self.left else self.right).count
+
+        return AVL_Node._delete_node(self)
+
+    def update_count(self, change: int) -> None:
+        '''change the count of the node's value, along with the sizes of all the nodes above'''
+        self.count += change
+
+        node = self
+        while node:
+            node.size += change
+            node = node.parent
+
+    def get_rank(self, value: CT) -> int:
+        '''get the number of values within the tree that's < the given value'''
+        rank, node = 0, self
+        while node:
+            if value <= node.value:
+                node = node.left
+            else:
+                rank += node.count + (node.left.size if node.left else 0)
+                node = node.right
+        return rank
+
+    def select_node(self, index: int) -> 'OrderStatAVL_Node':
+        '''get the node holding the value at the given index of the sorted values'''
+        node = self
+        while node:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.count:
+                return node
+            else:
+                index -= left_size + node.count
+                node = node.right
+        return None
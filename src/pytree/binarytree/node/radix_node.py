@@ -0,0 +1,342 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple, Union
+
+
+# a child of a node is either a node, or just its label if it's a leaf (a key without any key below it)
+Child = Union['Radix_Node', str]
+
+
+def get_label(child: Child) -> str:
+    return child if type(child) is str else child.label
+
+
+def get_min_key(child: Child, prefix: str) -> str:
+    '''get the smallest key below the child, the child's key being the given prefix + its label'''
+    labels = [prefix]
+    while type(child) is not str:
+        labels.append(child.label)
+        if child.is_key:
+            return ''.join(labels)
+        child = child.children[0]
+
+    labels.append(child)
+    return ''.join(labels)
+
+
+def get_max_key(child: Child, prefix: str) -> str:
+    '''get the biggest key below the child, the child's key being the given prefix + its label'''
+    labels = [prefix]
+    while type(child) is not str:
+        labels.append(child.label)
+        # only the root can be a node without any child
+        if not child.children:
+            return ''.join(labels)
+        child = child.children[-1]
+
+    labels.append(child)
+    return ''.join(labels)
+
+
+def iter_keys(child: Child, prefix: str) -> Iterator[str]:
+    '''yields all the keys below the child in sorted order, the child's key being the given prefix + its label'''
+    stack = [(child, prefix)]
+    while stack:
+        node, prefix = stack.pop()
+        if type(node) is str:
+            yield prefix + node
+            continue
+
+        prefix += node.label
+        if node.is_key:
+            yield prefix
+        stack.extend((child, prefix) for child in reversed(node.children))
+
+
+@dataclass(slots=True)
+class Radix_Node:
+    '''
+    - a node of the radix tree (compressed trie)
+    - every node holds a piece of the key (its label), the full key of a node
+      is made up of all the labels from the root down to the node
+    - a node only splits off when the keys below it stop sharing their prefix,
+      so a chain of single child nodes never exists (other than the root)
+    - the leaves (most of the keys) aren't nodes at all, only their label is kept
+      in the place of the child node -> a key only costs the string of its own distinct tail
+
+    - the child nodes are kept in the order of the first character of their label
+      along with a string of those first characters, to be bisected
+      -> the keys come out in sorted order from a pre-order traversal,
+         a node's own key is a prefix of (i.e smaller than) all the keys below it
+    - the children & their first characters are kept in a tuple & a string,
+      so that they take as little memory as possible
+
+    P.S: NOT to be used independantly as is,
+         should use the 'RadixTree' class as the interface
+    '''
+
+    label: str = ''
+    is_key: bool = False
+    first_chars: str = field(default='', repr=False)
+    children: Tuple[Child, ...] = field(default=(), repr=False)
+
+    def _add_child(self, child: Child, index: int) -> None:
+        self.first_chars = self.first_chars[:index] + get_label(child)[0] + self.first_chars[index:]
+        self.children = self.children[:index] + (child,) + self.children[index:]
+
+    def _replace_child(self, child: Child, index: int) -> None:
+        '''replace the child at the given index with a child starting with the same character'''
+        self.children = self.children[:index] + (child,) + self.children[index + 1:]
+
+    def _remove_child(self, index: int) -> None:
+        self.first_chars = self.first_chars[:index] + self.first_chars[index + 1:]
+        self.children = self.children[:index] + self.children[index + 1:]
+
+    def _compress_child(self, index: int) -> None:
+        '''put the child node at the given index back into its compressed shape, after a key below it was removed'''
+        child = self.children[index]
+        if type(child) is str:
+            return
+
+        # a key without any key below it turns back into a leaf
+        if not child.children:
+            self._replace_child(child.label, index)
+
+        # a node that isn't a key on its own is merged with its only child
+        elif not child.is_key and len(child.children) == 1:
+            only_child = child.children[0]
+            if type(only_child) is str:
+                self._replace_child(child.label + only_child, index)
+            else:
+                only_child.label = child.label + only_child.label
+                self._replace_child(only_child, index)
+
+    def insert_node(self, key: str) -> bool:
+        '''add the key below the node, returns whether it's a new key'''
+        node, i = self, 0
+
+        while i < len(key):
+            index = bisect_left(node.first_chars, key[i])
+
+            # no child node shares the next character, the rest of the key becomes a new leaf
+            if index == len(node.first_chars) or node.first_chars[index] != key[i]:
+                node._add_child(key[i:], index)
+                return True
+
+            child = node.children[index]
+            label = get_label(child)
+            if key.startswith(label, i):
+                if type(child) is not str:
+                    node, i = child, i + len(label)
+                    continue
+                if i + len(label) == len(key):
+                    return False
+
+                # the key goes on past a leaf, which becomes a node for the key to go below
+                child = Radix_Node(label, True)
+                node._replace_child(child, index)
+                node, i = child, i + len(label)
+                continue
+
+            # the key only shares a part of the child's label, split the label where they differ
+            shared = 1
+            while i + shared < len(key) and key[i + shared] == label[shared]:
+                shared += 1
+
+            split_node = Radix_Node(label[:shared])
+            if type(child) is str:
+                child = label[shared:]
+            else:
+                child.label = label[shared:]
+            split_node._add_child(child, 0)
+            node._replace_child(split_node, index)
+
+            node, i = split_node, i + shared
+            if i < len(key):
+                node._add_child(key[i:], 0 if key[i] < label[shared] else 1)
+                return True
+
+        if node.is_key:
+            return False
+        node.is_key = True
+        return True
+
+    def has_key(self, key: str) -> bool:
+        '''whether the key is below the node'''
+        node, i = self, 0
+
+        while i < len(key):
+            # the characters are unique, no need to bisect them to find an exact one
+            index = node.first_chars.find(key[i])
+            if index < 0:
+                return False
+
+            node = node.children[index]
+            if type(node) is str:
+                return i + len(node) == len(key) and key.startswith(node, i)
+            if not key.startswith(node.label, i):
+                return False
+            i += len(node.label)
+
+        return node.is_key
+
+    def delete_node(self, key: str) -> bool:
+        '''remove the key from below the node, returns whether the key was found'''
+        # the path of (parent, index of the child) down to the node
+        path: List[Tuple['Radix_Node', int]] = []
+        node, i = self, 0
+
+        while i < len(key):
+            index = node.first_chars.find(key[i])
+            if index < 0:
+                return False
+
+            child = node.children[index]
+            if type(child) is str:
+                if i + len(child) != len(key) or not key.startswith(child, i):
+                    return False
+                node._remove_child(index)
+                break
+
+            path.append((node, index))
+            node = child
+            if not key.startswith(node.label, i):
+                return False
+            i += len(node.label)
+        else:
+            if not node.is_key:
+                return False
+            node.is_key = False
+
+        # put the tree back into its compressed shape
+        if path:
+            parent_node, index = path[-1]
+            parent_node._compress_child(index)
+
+        return True
+
+    def find_next_key(self, key: str, inclusive: bool) -> Union[str, None]:
+        '''
+        get the smallest key that's > (or >= with [inclusive]) the given key, with a single walk down
+        - the walk follows the key for as long as it matches,
+          while keeping track of the closest bigger subtree found along the way
+          (the next child node, each one deeper is closer to the key)
+        - the node reached by the walk has the same key as the part that's been matched,
+          i.e key[:i]
+        '''
+        node, i = self, 0
+        next_child, next_prefix = None, None
+
+        while i < len(key):
+            first_chars = node.first_chars
+            index = bisect_left(first_chars, key[i])
+
+            if index == len(first_chars) or first_chars[index] != key[i]:
+                # all the keys below the next child node are bigger
+                if index < len(first_chars):
+                    return get_min_key(node.children[index], key[:i])
+                break
+
+            if index + 1 < len(first_chars):
+                next_child, next_prefix = node.children[index + 1], key[:i]
+
+            child = node.children[index]
+            label = get_label(child)
+            if not key.startswith(label, i):
+                # the key ends or differs midway through the label
+                if label > key[i: i + len(label)]:
+                    return get_min_key(child, key[:i])
+                break
+
+            i += len(label)
+            if type(child) is str:
+                # there's nothing below a leaf, its key is either the given key or smaller
+                if i == len(key) and inclusive:
+                    return key
+                break
+            node = child
+        else:
+            if node.is_key and inclusive:
+                return key
+            if node.children:
+                return get_min_key(node.children[0], key)
+
+        return get_min_key(next_child, next_prefix) if next_child is not None else None
+
+    def find_prev_key(self, key: str, inclusive: bool) -> Union[str, None]:
+        '''
+        get the biggest key that's < (or <= with [inclusive]) the given key, with a single walk down
+        - the walk follows the key for as long as it matches,
+          while keeping track of the closest smaller key/subtree found along the way
+          (the keys of the nodes on the way & the previous child nodes,
+           each one deeper is closer to the key)
+        '''
+        node, i = self, 0
+        prev_child, prev_prefix = None, None
+
+        while i < len(key):
+            # a node's key is a prefix of the given key, so it's smaller
+            if node.is_key:
+                prev_child, prev_prefix = None, key[:i]
+
+            first_chars = node.first_chars
+            index = bisect_left(first_chars, key[i])
+            if index > 0:
+                prev_child, prev_prefix = node.children[index - 1], key[:i]
+
+            if index == len(first_chars) or first_chars[index] != key[i]:
+                break
+
+            child = node.children[index]
+            label = get_label(child)
+            if not key.startswith(label, i):
+                if label < key[i: i + len(label)]:
+                    return get_max_key(child, key[:i])
+                break
+
+            i += len(label)
+            if type(child) is str:
+                # the leaf's key is a prefix of the given key, with nothing below it
+                if i < len(key) or inclusive:
+                    return key[:i]
+                break
+            node = child
+        else:
+            if node.is_key and inclusive:
+                return key
+
+        if prev_child is not None:
+            return get_max_key(prev_child, prev_prefix)
+        return prev_prefix
+
+    def find_prefix_child(self, prefix: str) -> Tuple[Union[Child, None], str]:
+        '''
+        get the highest child whose key starts with the given prefix
+        returns the child along with the key of its parent node
+        '''
+        node, i = self, 0
+
+        while i < len(prefix):
+            index = bisect_left(node.first_chars, prefix[i])
+            if index == len(node.first_chars) or node.first_chars[index] != prefix[i]:
+                return None, ''
+
+            child = node.children[index]
+            label = get_label(child)
+            # the prefix ends midway through the label
+            if label.startswith(prefix[i:]):
+                return child, prefix[:i]
+            if type(child) is str or not prefix.startswith(label, i):
+                return None, ''
+            node, i = child, i + len(label)
+
+        return node, prefix[:i - len(node.label)]
+
+    def traverse_node(self) -> Iterator[Child]:
+        '''yields every node & leaf below the node (itself included) in pre-order'''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if type(node) is not str:
+                stack.extend(reversed(node.children))
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Union
+from typing import Tuple, Union
 
 from pytree.Binarytree._type_hint import CT
 from pytree.Binarytree.Node.bst_node import BST_Node
@@ -35,30 +35,35 @@ class RBT_Node(BST_Node):
     def is_black(self) -> bool:
         return not self.is_red
 
-    def get_red_child(self) -> Union['RBT_Node', None]:
-        '''
-        returns a red child, if any, of the specific node
-        - only used in the delete_node's internal function,
-          '_resolve_double_black'
+    @property
+    def has_red_left(self) -> bool:
+        return self.left is not None and self.left.is_red
+
+    @property
+    def has_red_right(self) -> bool:
+        return self.right is not None and self.right.is_red
 
+    def _set_build_status(self, depth: int, max_depth: int) -> None:
+        '''
+        every path of a tree built by 'build_from_sorted' ends
+        on the last or the second last level, so coloring only
+        the last level red keeps the black height the same for every path
         '''
-        red_children = []
-        if self.left and self.left.is_red:
-            red_children.append(self.left)
-        if self.right and self.right.is_red:
-            red_children.append(self.right)
-        return red_children
-
-    def insert_node(self, value: CT) -> None:
+        self.is_red = depth == max_depth and depth > 0
+
+    def insert_node(self, value: CT, finger: 'RBT_Node' = None) -> 'RBT_Node':
         '''add a node with the given value into the tree'''
         if self.parent is None:
             self.is_red = False
 
-        new_node = self._insert_node(value)
+        start_node = finger._find_insertion_start(value) if finger else self
+        new_node = start_node._insert_node(value)
 
         if new_node:
             new_node._update_insert()
 
+        return new_node
+
     def _update_insert(self) -> None:
         '''
         _______________________________________________________________________________________________________
@@ -106,38 +111,115 @@ class RBT_Node(BST_Node):
             5(*)               5(*)
 
         '''
-        if not self.parent or self.parent.is_black:
-            return
-
-        # CASE 2
-        if self.uncle and self.uncle.is_red:
-            # RECOLORING PHASE
-            self.grandparent.is_red = True
-            self.uncle.is_red = False
-            self.parent.is_red = False
-
-            self.grandparent._update_insert()
-
-        # CASE 1
-        else:
-            grandparent_node = self.grandparent
-            parent_node = self.parent
-
+        # the relatives are kept in local variables, instead of going through
+        # the 'grandparent' & 'uncle' properties over & over again
+        node = self
+        parent_node = node.parent
+
+        # a red parent is never the root, so the grandparent always exists
+        while parent_node is not None and parent_node.is_red:
+            grandparent_node = parent_node.parent
+            is_left_parent = parent_node is grandparent_node.left
+            uncle_node = grandparent_node.right if is_left_parent else grandparent_node.left
+
+            # CASE 2
+            if uncle_node is not None and uncle_node.is_red:
+                # RECOLORING PHASE
+                grandparent_node.is_red = True
+                uncle_node.is_red = False
+                parent_node.is_red = False
+
+                # rinse and repeat with the grandparent
+                node = grandparent_node
+                parent_node = node.parent
+                continue
+
+            # CASE 1
             # ROTATION PHASE
-            if parent_node is grandparent_node.left:
-                if parent_node.right is self:
+            if is_left_parent:
+                if parent_node.right is node:
                     parent_node._rotate_left()
                 grandparent_node._rotate_right()
-
-            elif parent_node is grandparent_node.right:
-                if parent_node.left is self:
+            else:
+                if parent_node.left is node:
                     parent_node._rotate_right()
                 grandparent_node._rotate_left()
 
             # RE-COLORING PHASE
-            self.is_red = grandparent_node.parent is not self
-            parent_node.is_red = not self.is_red
+            node.is_red = grandparent_node.parent is not node
+            parent_node.is_red = not node.is_red
             grandparent_node.is_red = True
+            return
+
+    def delete_node_range(self, lo: CT, hi: CT) -> Tuple[Union['RBT_Node', None], int]:
+        root, num_removed = BST_Node.delete_node_range(self, lo, hi)
+
+        # the root of a tree that's left over from the splitting might be red
+        if root:
+            root.is_red = False
+
+        return root, num_removed
+
+    @classmethod
+    def _join(cls, left: 'RBT_Node', pivot: 'RBT_Node', right: 'RBT_Node') -> 'RBT_Node':
+        '''
+        join 2 detached trees together with a pivot node in between
+
+        - if both trees have the same black height,
+          the pivot becomes the new root and is colored black
+        - otherwise, go down the inner spine of the taller tree until
+          a black node with the same black height as the shorter tree is found,
+          replace that subtree with the red pivot (holding both of them)
+          and fix the red pivot upwards like a normal insertion
+        '''
+        # coloring the root black keeps a valid tree valid
+        if left:
+            left.is_red = False
+        if right:
+            right.is_red = False
+
+        left_black_height = cls._get_black_height(left)
+        right_black_height = cls._get_black_height(right)
+
+        if left_black_height == right_black_height:
+            BST_Node._join(left, pivot, right)
+            pivot.is_red = False
+            return pivot
+
+        if left_black_height > right_black_height:
+            parent_node, node, black_height = None, left, left_black_height
+            while black_height > right_black_height or (node and node.is_red):
+                if not node.is_red:
+                    black_height -= 1
+                parent_node, node = node, node.right
+            BST_Node._join(node, pivot, right)
+            parent_node.right = pivot
+        else:
+            parent_node, node, black_height = None, right, right_black_height
+            while black_height > left_black_height or (node and node.is_red):
+                if not node.is_red:
+                    black_height -= 1
+                parent_node, node = node, node.left
+            BST_Node._join(left, pivot, node)
+            parent_node.left = pivot
+
+        pivot.parent = parent_node
+        pivot.is_red = True
+        pivot._update_insert()
+
+        root = pivot.get_root()
+        root.is_red = False
+        return root
+
+    @staticmethod
+    def _get_black_height(node: Union['RBT_Node', None]) -> int:
+        '''number of black nodes from the node down to any of its leaf nodes'''
+        black_height = 0
+        while node:
+            if not node.is_red:
+                black_height += 1
+            node = node.left
+        return black_height
 
     def delete_node(self, node_to_delete: 'RBT_Node') -> None:
         '''remove the node that contains the specified value from the tree'''
@@ -146,7 +228,7 @@ class RBT_Node(BST_Node):
         # check if the deleted node has any red child
         # if not, the node is considered as a 'double black node' when deleted
         # and that will have to be rebalanced in the '_update_delete' method
-        double_black = deleted_node.get_red_child() == []
+        double_black = not deleted_node.has_red_left and not deleted_node.has_red_right
 
         deleted_node._update_delete(double_black)
 
@@ -236,56 +318,61 @@ consider the following example:
                                  \
                                   15(DB)
         '''
-
-        # CASE 1 or 2: sibling is BLACK
-        if not self.sibling.is_red:
-
-            red_children = self.sibling.get_red_child()
-            num_red_child = len(red_children)
-
-            # CASE 1: sibling has red children
-            if red_children:
-
-                # ROTATION PHASE
-                if self.parent.right == self.sibling:
-                    if self.sibling.left in red_children and num_red_child == 1:
-                        self.sibling._rotate_right()
-                    self.parent._rotate_left()
-                else:
-                    if self.sibling.right in red_children and num_red_child == 1:
-                        self.sibling._rotate_left()
-                    self.parent._rotate_right()
-
-                # RE-COLROING PHASE
-                self.grandparent.is_red = self.parent.is_red
-                self.grandparent.left.is_red = False
-                self.grandparent.right.is_red = False
-
-            # CASE 2: sibling has black children
-            else:
-
+        # the relatives are kept in local variables, instead of going through
+        # the 'sibling' & 'grandparent' properties over & over again
+        node = self
+
+        while True:
+            parent_node = node.parent
+            sibling_node = node.sibling
+
+            # CASE 1 or 2: sibling is BLACK
+            if not sibling_node.is_red:
+                has_red_left = sibling_node.has_red_left
+                has_red_right = sibling_node.has_red_right
+
+                # CASE 1: sibling has red children
+                if has_red_left or has_red_right:
+
+                    # ROTATION PHASE
+                    if parent_node.right is sibling_node:
+                        if has_red_left and not has_red_right:
+                            sibling_node._rotate_right()
+                        parent_node._rotate_left()
+                    else:
+                        if has_red_right and not has_red_left:
+                            sibling_node._rotate_left()
+                        parent_node._rotate_right()
+
+                    # RE-COLORING PHASE
+                    top_node = parent_node.parent
+                    top_node.is_red = parent_node.is_red
+                    top_node.left.is_red = False
+                    top_node.right.is_red = False
+                    return
+
+                # CASE 2: sibling has black children
                 # RE-COLORING PHASE
-                self.sibling.is_red = True
+                sibling_node.is_red = True
 
-                if not self.parent.is_red and self.grandparent:
-                    self.parent._resolve_double_black()
+                if not parent_node.is_red and parent_node.parent is not None:
+                    node = parent_node
                 else:
-                    self.parent.is_red = False
+                    parent_node.is_red = False
+                    return
 
-        # CASE 3: sibling is black
-        else:
-
-            # ROTATION PHASE
-            if self.parent.right == self.sibling:
-                self.parent._rotate_left()
+            # CASE 3: sibling is red
             else:
-                self.parent._rotate_right()
 
-            # RE-COLORING PHASE
-            self.grandparent.is_red = False
-            self.parent.is_red = True
+                # ROTATION PHASE
+                if parent_node.right is sibling_node:
+                    parent_node._rotate_left()
+                else:
+                    parent_node._rotate_right()
 
-            self._resolve_double_black()
+                # RE-COLORING PHASE
+                sibling_node.is_red = False
+                parent_node.is_red = True
 
     def __str__(self):
         return str(f" \
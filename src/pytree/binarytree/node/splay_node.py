@@ -17,31 +17,33 @@ class Splay_Node(BST_Node):
     def _update_node(self) -> None:
         '''
         internal function for the splay tree's node
-        recursively move the intended node up until it is the root node
+        move the intended node up until it is the root node
+        -> a loop rather than a recursion, so that splaying a node deep down a skewed tree
+           doesn't run into the recursion limit
         '''
-        if self.parent is None:
-            return self
+        while self.parent is not None:
+            if self is self.parent.right:
+                self.parent._rotate_left()
+            else:
+                self.parent._rotate_right()
 
-        if self is self.parent.right:
-            self.parent._rotate_left()
+        return self
 
-        elif self is self.parent.left:
-            self.parent._rotate_right()
-
-        return self._update_node()
-
-    def insert_node(self, value: CT) -> None:
+    def insert_node(self, value: CT, finger: 'Splay_Node' = None) -> 'Splay_Node':
         '''
         add a node with the given value into the tree
         update/splay the node to the root upon a succesfully insert
         returns a node to be designated as the 'root node'
         if the value is succesfully inserted
         '''
-        new_node = self._insert_node(value)
+        start_node = finger._find_insertion_start(value) if finger else self
+        new_node = start_node._insert_node(value)
 
         if new_node:
             new_node._update_node()
 
+        return new_node
+
     def delete_node(self, node_to_delete: 'Splay_Node') -> None:
         '''
         remove the node that contains the given value from the tree
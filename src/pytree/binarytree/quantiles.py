@@ -0,0 +1,104 @@
+from math import floor
+from typing import Iterable, Iterator
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree.tree import AVLTree
+
+
+class WindowedQuantiles:
+    '''
+    - running quantiles (median, p95, p99, etc) of a sliding window of values
+    - values are pushed as they come in & evicted once they leave the window,
+      the quantiles are read off an order-statistic AVL tree at any time
+      instead of sorting the whole window again
+
+    - the same value can be in the window multiple times,
+      it's kept as a single node with a count
+
+    - push, evict & quantile are all O(log n) for a window of n values
+    '''
+
+    __slots__ = ['tree']
+
+    def __init__(self, values: Iterable[CT] = ()):
+        self.tree = AVLTree(order_stats=True)
+        for value in values:
+            self.push(value)
+
+    def push(self, value: CT) -> None:
+        '''add a value into the window'''
+        root = self.tree.root
+        node = root.find_node(value) if root.value is not None else None
+
+        if node is None:
+            self.tree.insert(value)
+        else:
+            node.update_count(1)
+
+    def evict(self, value: CT) -> None:
+        '''remove a single occurrence of the value from the window'''
+        root = self.tree.root
+        node = root.find_node(value) if root.value is not None else None
+
+        if node is None:
+            raise ValueError(f'{value} is not in {type(self).__name__}')
+
+        if node.count > 1:
+            node.update_count(-1)
+        else:
+            self.tree.delete(value)
+
+    def quantile(self, q: float, interpolation: str = 'linear') -> CT:
+        '''
+        get the q-th quantile of the values in the window, 0 <= q <= 1
+        the position of the quantile is q * (n - 1), if it lands between 2 values:
+        linear  ['linear']: interpolated between both values
+        lower   ['lower']: the smaller value
+        higher  ['higher']: the bigger value
+        nearest ['nearest']: the value closer to the position (ties go to the even index)
+        '''
+        if interpolation not in ('linear', 'lower', 'higher', 'nearest'):
+            raise ValueError(f'{interpolation} given is not a valid option')
+        if not 0 <= q <= 1:
+            raise ValueError('quantile should be within [0, 1]')
+        if not self:
+            raise IndexError(f'trying to get a quantile from an empty {type(self).__name__}')
+
+        position = q * (len(self) - 1)
+        lower_index = floor(position)
+        fraction = position - lower_index
+
+        if fraction == 0 or interpolation == 'lower':
+            return self.tree.select(lower_index)
+        if interpolation == 'higher':
+            return self.tree.select(lower_index + 1)
+        if interpolation == 'nearest':
+            # ties go to the even index, the same as numpy
+            return self.tree.select(round(position))
+
+        lower_value = self.tree.select(lower_index)
+        higher_value = self.tree.select(lower_index + 1)
+        return lower_value + (higher_value - lower_value) * fraction
+
+    def median(self) -> CT:
+        return self.quantile(0.5)
+
+    def __len__(self) -> int:
+        return self.tree.root.size if self.tree.root.value is not None else 0
+
+    def __iter__(self) -> Iterator[CT]:
+        '''yields every value in the window in sorted order, duplicates included'''
+        if self.tree.root.value is None:
+            return
+        for node in self.tree.root.traverse_node():
+            for _ in range(node.count):
+                yield node.value
+
+    def __contains__(self, value: CT) -> bool:
+        return self.tree.root.value is not None and self.tree.root.find_node(value) is not None
+
+    def __bool__(self) -> bool:
+        return self.tree.root.value is not None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(size={len(self)})'
@@ -0,0 +1,168 @@
+import sys
+from typing import Iterable, Iterator, List, Union
+
+from pytree._memory import MemoryUsage, get_object_size
+from pytree.Binarytree.Node.radix_node import Radix_Node, get_max_key, get_min_key, iter_keys
+
+
+class RadixTree:
+    '''
+    - a sorted set of strings, kept in a radix tree (compressed trie)
+    - the keys that share a prefix share the nodes holding it,
+      so long keys with common prefixes (paths, URLs, etc) are only stored once up to where they differ
+    - a lookup goes down the tree piece by piece of the key,
+      comparing each character of the key at most once,
+      instead of comparing the whole key against the value of every node on the way
+    - meant for keys whose shared prefixes are long compared to their distinct tails,
+      it takes less memory than a BinaryTree & scans a prefix faster,
+      but a single lookup is slower (a python-level step per piece, see 'benchmarks/bench_radix.py')
+
+    - has the same ordered api as the BinaryTree (find, find_lt/gt/le/ge, pop_min/max, etc)
+      plus 'prefix_iter' to get all the keys starting with a prefix in sorted order
+    - the order is the same as the order of python's strings (by code point)
+    '''
+
+    __slots__ = ['root', '_size']
+
+    def __init__(self):
+        self.root = Radix_Node()
+        self._size = 0
+
+    @property
+    def dtype(self):
+        '''returns the data type of that a tree contains'''
+        return str if self._size else None
+
+    @property
+    def height(self) -> int:
+        '''the number of nodes on the longest path down from the root (the root excluded)'''
+        height, level = -1, [self.root]
+        while level:
+            height += 1
+            level = [child for node in level if type(node) is not str for child in node.children]
+        return height
+
+    @classmethod
+    def fill_tree(cls, values: Iterable[str]) -> 'RadixTree':
+        '''generates a radix tree with all the values from an iterable'''
+        new_tree = cls()
+        new_tree.extend(values)
+        return new_tree
+
+    def _check_type(self, value: str) -> None:
+        if not isinstance(value, str):
+            raise TypeError(f"{type(self).__name__} only contains values of type 'str'")
+
+    def extend(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.insert(value)
+
+    def insert(self, value: str) -> None:
+        '''add the value into the tree'''
+        self._check_type(value)
+        if self.root.insert_node(value):
+            self._size += 1
+
+    def delete(self, value: str) -> None:
+        '''remove the value from the tree'''
+        self._check_type(value)
+        if not self.root.delete_node(value):
+            raise ValueError(f'{value} is not in {type(self).__name__}')
+        self._size -= 1
+
+    def clear(self) -> None:
+        self.root = Radix_Node()
+        self._size = 0
+
+    def traverse(self, key: str = 'in') -> List[str]:
+        '''returns a list of all the values in the tree from min-to-max, only in-order is supported'''
+        if key != 'in':
+            raise ValueError(f"{type(self).__name__} can only be traversed in order, not '{key}'")
+        return list(self)
+
+    def prefix_iter(self, prefix: str) -> Iterator[str]:
+        '''yields all the values that start with the given prefix in sorted order'''
+        self._check_type(prefix)
+        child, parent_key = self.root.find_prefix_child(prefix)
+        if child is not None:
+            yield from iter_keys(child, parent_key)
+
+    def find(self, value: str) -> Union[str, None]:
+        '''get the value if it's in the tree'''
+        self._check_type(value)
+        return value if self.root.has_key(value) else None
+
+    def find_lt(self, value: str) -> Union[str, None]:
+        '''get the biggest value that's < the given value'''
+        self._check_type(value)
+        return self.root.find_prev_key(value, False)
+
+    def find_le(self, value: str) -> Union[str, None]:
+        '''get the biggest value that's <= the given value'''
+        self._check_type(value)
+        return self.root.find_prev_key(value, True)
+
+    def find_gt(self, value: str) -> Union[str, None]:
+        '''get the smallest value that's > the given value'''
+        self._check_type(value)
+        return self.root.find_next_key(value, False)
+
+    def find_ge(self, value: str) -> Union[str, None]:
+        '''get the smallest value that's >= the given value'''
+        self._check_type(value)
+        return self.root.find_next_key(value, True)
+
+    def find_min(self) -> Union[str, None]:
+        return get_min_key(self.root, '') if self._size else None
+
+    def find_max(self) -> Union[str, None]:
+        return get_max_key(self.root, '') if self._size else None
+
+    def pop_min(self) -> str:
+        if not self._size:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+        min_value = self.find_min()
+        self.delete(min_value)
+        return min_value
+
+    def pop_max(self) -> str:
+        if not self._size:
+            raise IndexError(f'trying to pop from an empty {type(self).__name__} tree')
+        max_value = self.find_max()
+        self.delete(max_value)
+        return max_value
+
+    def memory_usage(self, deep: bool = True) -> MemoryUsage:
+        '''
+        get the memory held by the tree, in bytes
+        -> the nodes are counted along with their children (& their first characters),
+           the labels (the pieces of the keys, the whole leaves) are only measured with 'deep'
+        '''
+        usage = MemoryUsage(num_elements=self._size)
+        for node in self.root.traverse_node():
+            if type(node) is str:
+                usage.payloads += sys.getsizeof(node) if deep else 0
+                continue
+
+            usage.nodes += get_object_size(node)
+            # the empty tuple & string of a childless root are shared
+            if node.children:
+                usage.nodes += sys.getsizeof(node.first_chars) + sys.getsizeof(node.children)
+            usage.payloads += sys.getsizeof(node.label) if deep else 0
+        return usage
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        if self._size:
+            yield from iter_keys(self.root, '')
+
+    def __contains__(self, value: str) -> bool:
+        return isinstance(value, str) and self.root.has_key(value)
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __str__(self) -> str:
+        return str(self.traverse())
@@ -0,0 +1,441 @@
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from pytree.Binarytree._type_hint import CT
+from pytree.Binarytree._bulk import is_array, parallel_sorted
+from pytree.Binarytree._tree import BinaryTree
+from pytree.Binarytree.Node import BST_Node
+from pytree.Binarytree.tree import RBTree
+
+# the shards (& the other tree of a set operation) that the forked worker processes read from,
+# set right before the workers are forked off
+_forked_trees: Tuple[List[BinaryTree], object] = ([], None)
+
+
+def _run_forked(func: Callable, index: int, args: tuple):
+    '''run a task on one of the shards, from within a forked worker process'''
+    shards, other = _forked_trees
+    return func(shards[index], other, *args)
+
+
+def _get_value(found):
+    # the splay tree's finds gives back the node itself
+    return found.value if isinstance(found, BST_Node) else found
+
+
+def _scan_shard(shard: BinaryTree, other, lo: CT, hi: CT) -> List[CT]:
+    '''the values of the shard within [lo, hi], an unbounded end is None'''
+    values = []
+    for value in shard.cursor(lo):
+        if hi is not None and value > hi:
+            break
+        values.append(value)
+    return values
+
+
+def _count_shard(shard: BinaryTree, other, lo: CT, hi: CT) -> int:
+    '''the number of values of the shard within [lo, hi], an unbounded end is None'''
+    count = 0
+    for value in shard.cursor(lo):
+        if hi is not None and value > hi:
+            break
+        count += 1
+    return count
+
+
+def _filter_shard(shard: BinaryTree, other, keep: bool) -> List[CT]:
+    '''the values of the shard that are (or with not [keep], aren't) in the other tree'''
+    return [value for value in shard if (value in other) == keep]
+
+
+def _extend_shard(shard: BinaryTree, other, values: List[CT]) -> int:
+    '''add the sorted & unique values into the shard, returns the number of values that weren't in it'''
+    if shard:
+        values = [value for value in values if value not in shard]
+    shard.extend(values, presort=False)
+    return len(values)
+
+
+def _delete_range_shard(shard: BinaryTree, other, lo: CT, hi: CT) -> int:
+    return shard.delete_range(lo, hi)
+
+
+class ShardedTree:
+    '''
+    - a sorted container that splits its values by range across [num_shards] trees of the [backend] type
+      (the shards), so that the bulk operations can be split up shard by shard
+      * the shards are separated by the splitters, the shard i holds the values within
+        [splitters[i - 1], splitters[i]), so the shards are in order of their values too
+      * the point operations (insert, delete, find, etc) go straight to the shard of the value,
+        found by bisecting the splitters
+
+    - the bulk operations that only read the shards (the set operations, range scans & counts)
+      run shard by shard on a pool of [workers], a shard is never touched by 2 workers at once
+      * [executor] 'thread': a pool of threads, they only run at the same time
+        if the comparisons of the values release the GIL, i.e hardly ever for python values
+      * [executor] 'process': a pool of processes forked off from this one for every operation,
+        that read the shards as they are (copy-on-write) instead of having them pickled,
+        it also sorts the values for 'extend' (see 'fill_tree' of the BinaryTree)
+        -> the results are pickled back, so it only pays off on several cores for the operations
+           that send back little compared to the work they do, e.g 'count_range' on big shards
+        -> needs the 'fork' start method, i.e not on Windows
+    - the writes (extend, delete_range & the rebalancing) are always applied by this process,
+      one shard after another: the threads would only take turns under the GIL
+      & the forked processes can't write back into the shards
+
+    - the number of values in every shard is kept track of,
+      once a shard holds more than [imbalance] times its fair share of the values
+      or less than 1 / [imbalance] of it (& the tree holds at least [min_shard_size] values per shard),
+      all the values are split again at their quantiles into shards of equal sizes, in O(n)
+      -> checked after every insertion & deletion, in O(num_shards)
+      -> the first shard takes in all the values until then, so the first splitters come from the values themselves
+    '''
+
+    __slots__ = [
+        'shards', 'splitters', 'backend', 'workers', 'executor', 'imbalance', 'min_shard_size', 'num_rebalances',
+        '_sizes', '_size'
+    ]
+
+    def __init__(
+        self,
+        num_shards: int = 8,
+        backend: Type[BinaryTree] = RBTree,
+        workers: int = None,
+        executor: str = 'thread',
+        imbalance: float = 2.0,
+        min_shard_size: int = 1024,
+        splitters: Optional[Sequence[CT]] = None
+    ):
+        if num_shards < 1:
+            raise ValueError('num_shards should be at least 1')
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"executor should be either 'thread' or 'process', not '{executor}'")
+        if imbalance <= 1:
+            raise ValueError('imbalance should be > 1')
+        if min_shard_size < 1:
+            raise ValueError('min_shard_size should be at least 1')
+
+        if executor == 'process':
+            # multiprocessing is only imported when it's used
+            import multiprocessing
+            if 'fork' not in multiprocessing.get_all_start_methods():
+                raise ValueError("the 'process' executor needs the 'fork' start method")
+
+        if splitters is not None:
+            splitters = list(splitters)
+            if len(splitters) != num_shards - 1:
+                raise ValueError(f'{num_shards} shards are split by {num_shards - 1} splitters, not {len(splitters)}')
+            if any(prev_splitter >= splitter for prev_splitter, splitter in zip(splitters, splitters[1:])):
+                raise ValueError('splitters should be strictly increasing')
+
+        self.backend = backend
+        self.shards: List[BinaryTree] = [backend() for _ in range(num_shards)]
+        self.splitters: List[CT] = splitters if splitters is not None else []
+        self.workers = workers
+        self.executor = executor
+        self.imbalance = imbalance
+        self.min_shard_size = min_shard_size
+        self.num_rebalances = 0
+
+        self._sizes = [0] * num_shards
+        self._size = 0
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.shards)
+
+    @property
+    def shard_sizes(self) -> List[int]:
+        return list(self._sizes)
+
+    @property
+    def dtype(self):
+        '''returns the data type of that a tree contains'''
+        shard = next((shard for shard in self.shards if shard), None)
+        return shard.dtype if shard is not None else None
+
+    @property
+    def height(self) -> int:
+        '''the height of the tallest shard'''
+        return max(shard.height for shard in self.shards)
+
+    @classmethod
+    def fill_tree(cls, values: Iterable[CT], **kwargs) -> 'ShardedTree':
+        '''generates a sharded tree with all the values from an iterable'''
+        new_tree = cls(**kwargs)
+        new_tree.extend(values)
+        return new_tree
+
+    def _get_index(self, value: CT) -> int:
+        '''the index of the shard that the value belongs to'''
+        return bisect_right(self.splitters, value)
+
+    def _split_sorted(self, values: List[CT], splitters: List[CT]) -> List[List[CT]]:
+        '''split the sorted values into the parts that go into each shard'''
+        bounds = [0] + [bisect_left(values, splitter) for splitter in splitters] + [len(values)]
+        bounds += [len(values)] * (self.num_shards + 1 - len(bounds))
+        return [values[lo: hi] for lo, hi in zip(bounds, bounds[1:])]
+
+    def _map_shards(self, func: Callable, tasks: List[Tuple[int, tuple]], other=None, writes: bool = False) -> list:
+        '''
+        run func(shard, other, *args) for every (shard index, args) of the tasks on the pool of workers,
+        the [writes] are run by this process one by one
+        returns the results in the order of the tasks
+        '''
+        global _forked_trees
+
+        if writes or self.workers is None or self.workers <= 1 or len(tasks) <= 1:
+            return [func(self.shards[index], other, *args) for index, args in tasks]
+
+        num_workers = min(self.workers, len(tasks))
+
+        if self.executor == 'process':
+            # the process pool (and multiprocessing) is only imported when it's needed
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+
+            # the workers are forked off on the first submit, after the trees are in place
+            _forked_trees = (self.shards, other)
+            try:
+                with ProcessPoolExecutor(num_workers, mp_context=multiprocessing.get_context('fork')) as executor:
+                    futures = [executor.submit(_run_forked, func, index, args) for index, args in tasks]
+                    return [future.result() for future in futures]
+            finally:
+                _forked_trees = ([], None)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(num_workers) as executor:
+            futures = [executor.submit(func, self.shards[index], other, *args) for index, args in tasks]
+            return [future.result() for future in futures]
+
+    def _check_balance(self) -> None:
+        '''split the values again once a shard holds too many or too few of them'''
+        if self._size < self.min_shard_size * self.num_shards or self.num_shards == 1:
+            return
+
+        # the first shard takes in all the values until the first split
+        fair_size = self._size / self.num_shards
+        if not self.splitters or max(self._sizes) > self.imbalance * fair_size or \
+                min(self._sizes) < fair_size / self.imbalance:
+            self.rebalance()
+
+    def rebalance(self) -> None:
+        '''split all the values again at their quantiles, into shards of equal sizes'''
+        values = self.traverse()
+        if len(values) >= self.num_shards:
+            self._split(values)
+
+    def _split(self, values: List[CT]) -> None:
+        '''rebuild the shards from all the (sorted & unique) values, split at their quantiles'''
+        num_values, num_shards = len(values), self.num_shards
+        self.splitters = [values[i * num_values // num_shards] for i in range(1, num_shards)]
+        parts = self._split_sorted(values, self.splitters)
+
+        self.shards = [self.backend() for _ in range(num_shards)]
+        self._sizes = self._map_shards(_extend_shard, [(index, (part,)) for index, part in enumerate(parts)], writes=True)
+        self._size = num_values
+        self.num_rebalances += 1
+
+    def extend(self, values: Iterable[CT], chunk_size: int = 1 << 16) -> None:
+        '''
+        add all the values from an iterable into the tree
+        -> the values are sorted & split by the splitters, then every shard takes in its part at once
+        -> with the 'process' executor, the values are sorted in chunks of [chunk_size] across the pool
+           (see 'fill_tree' of the BinaryTree)
+        '''
+        if isinstance(values, (BinaryTree, ShardedTree)):
+            values = values.traverse()
+
+        if self.executor == 'process' and self.workers is not None and self.workers > 1:
+            values = list(parallel_sorted(values, self.workers, chunk_size))
+        else:
+            values = values.tolist() if is_array(values) else list(values)
+            values.sort()
+            values = [value for value, _ in groupby(values)]
+
+        if not values:
+            return
+
+        # the first split is made straight from the values, instead of filling up the first shard beforehand
+        if not self.splitters and self.num_shards > 1 and \
+                self._size + len(values) >= self.min_shard_size * self.num_shards:
+            if self._size:
+                values = [value for value, _ in groupby(merge(self.traverse(), values))]
+            self._split(values)
+            return
+
+        parts = self._split_sorted(values, self.splitters)
+        tasks = [(index, (part,)) for index, part in enumerate(parts) if part]
+        for (index, _), num_added in zip(tasks, self._map_shards(_extend_shard, tasks, writes=True)):
+            self._sizes[index] += num_added
+            self._size += num_added
+
+        self._check_balance()
+
+    def insert(self, value: CT) -> None:
+        '''add the value into the shard it belongs to'''
+        index = self._get_index(value)
+        shard = self.shards[index]
+        if shard and value in shard:
+            return
+
+        shard.insert(value)
+        self._sizes[index] += 1
+        self._size += 1
+        self._check_balance()
+
+    def delete(self, value: CT) -> None:
+        '''remove the value from the shard it belongs to'''
+        index = self._get_index(value)
+        self.shards[index].delete(value)
+        self._sizes[index] -= 1
+        self._size -= 1
+        self._check_balance()
+
+    def delete_range(self, lo: CT, hi: CT) -> int:
+        '''
+        remove all the values within [lo, hi] from the tree
+        returns the number of removed values
+        '''
+        if hi < lo:
+            return 0
+
+        tasks = [(index, (lo, hi)) for index in range(self._get_index(lo), self._get_index(hi) + 1)]
+        num_removed = 0
+        for (index, _), num_removed_shard in zip(tasks, self._map_shards(_delete_range_shard, tasks, writes=True)):
+            self._sizes[index] -= num_removed_shard
+            num_removed += num_removed_shard
+
+        self._size -= num_removed
+        self._check_balance()
+        return num_removed
+
+    def clear(self) -> None:
+        for shard in self.shards:
+            shard.clear()
+        self._sizes = [0] * self.num_shards
+        self._size = 0
+
+    def traverse(self, key: str = 'in') -> List[CT]:
+        '''returns a list of all the values in the tree from min-to-max, only in-order is supported'''
+        if key != 'in':
+            raise ValueError(f"{type(self).__name__} can only be traversed in order, not '{key}'")
+        return [value for shard in self.shards for value in shard.traverse()]
+
+    def scan(self, lo: CT = None, hi: CT = None) -> List[CT]:
+        '''returns all the values within [lo, hi] in sorted order, an unbounded end is None'''
+        first = self._get_index(lo) if lo is not None else 0
+        last = self._get_index(hi) if hi is not None else self.num_shards - 1
+
+        tasks = [(index, (lo, hi)) for index in range(first, last + 1) if self._sizes[index]]
+        return [value for values in self._map_shards(_scan_shard, tasks) for value in values]
+
+    def count_range(self, lo: CT = None, hi: CT = None) -> int:
+        '''the number of values within [lo, hi], an unbounded end is None'''
+        first = self._get_index(lo) if lo is not None else 0
+        last = self._get_index(hi) if hi is not None else self.num_shards - 1
+        if first > last:
+            return 0
+
+        # the shards in between are within the range as a whole
+        count = sum(self._sizes[first + 1: last])
+        tasks = [(first, (lo, hi))] if first == last else [(first, (lo, None)), (last, (None, hi))]
+        return count + sum(self._map_shards(_count_shard, tasks))
+
+    def _filter(self, other, keep: bool) -> 'ShardedTree':
+        '''a new tree split the same way, with the values that are (or with not [keep], aren't) in the other tree'''
+        new_tree = self._empty_copy()
+        tasks = [(index, (keep,)) for index in range(self.num_shards) if self._sizes[index]]
+        for (index, _), values in zip(tasks, self._map_shards(_filter_shard, tasks, other)):
+            new_tree.shards[index].extend(values, presort=False)
+            new_tree._sizes[index] = len(values)
+            new_tree._size += len(values)
+        return new_tree
+
+    def _empty_copy(self) -> 'ShardedTree':
+        return type(self)(
+            self.num_shards, self.backend, self.workers, self.executor, self.imbalance, self.min_shard_size,
+            self.splitters if self.splitters else None
+        )
+
+    def union(self, other: Iterable[CT]) -> 'ShardedTree':
+        '''a new tree with the values of both trees'''
+        new_tree = self._empty_copy()
+        new_tree.extend(self.traverse())
+        new_tree.extend(other)
+        return new_tree
+
+    def intersection(self, other) -> 'ShardedTree':
+        '''a new tree with the values that are in both trees'''
+        return self._filter(other, True)
+
+    def difference(self, other) -> 'ShardedTree':
+        '''a new tree with the values that are in this tree but not in the other tree'''
+        return self._filter(other, False)
+
+    def find(self, value: CT) -> CT:
+        '''get the value if it's in the tree'''
+        return _get_value(self.shards[self._get_index(value)].find(value))
+
+    def find_min(self) -> CT:
+        shard = next((shard for shard in self.shards if shard), None)
+        return _get_value(shard.find_min()) if shard is not None else None
+
+    def find_max(self) -> CT:
+        shard = next((shard for shard in reversed(self.shards) if shard), None)
+        return _get_value(shard.find_max()) if shard is not None else None
+
+    def _find_next(self, value: CT, method: str) -> CT:
+        '''find_gt/ge within the shard of the value, or the min value of the shards after it'''
+        index = self._get_index(value)
+        found = getattr(self.shards[index], method)(value) if self.shards[index] else None
+        if found is None:
+            found = next((shard.find_min() for shard in self.shards[index + 1:] if shard), None)
+        return _get_value(found)
+
+    def _find_prev(self, value: CT, method: str) -> CT:
+        '''find_lt/le within the shard of the value, or the max value of the shards before it'''
+        index = self._get_index(value)
+        found = getattr(self.shards[index], method)(value) if self.shards[index] else None
+        if found is None:
+            found = next((shard.find_max() for shard in reversed(self.shards[:index]) if shard), None)
+        return _get_value(found)
+
+    def find_lt(self, value: CT) -> CT:
+        '''get the biggest value that's < the given value'''
+        return self._find_prev(value, 'find_lt')
+
+    def find_le(self, value: CT) -> CT:
+        '''get the biggest value that's <= the given value'''
+        return self._find_prev(value, 'find_le')
+
+    def find_gt(self, value: CT) -> CT:
+        '''get the smallest value that's > the given value'''
+        return self._find_next(value, 'find_gt')
+
+    def find_ge(self, value: CT) -> CT:
+        '''get the smallest value that's >= the given value'''
+        return self._find_next(value, 'find_ge')
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[CT]:
+        for shard in self.shards:
+            yield from shard
+
+    def __contains__(self, value: CT) -> bool:
+        shard = self.shards[self._get_index(value)]
+        return bool(shard) and value in shard
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __str__(self) -> str:
+        return str(self.traverse())
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(backend={self.backend.__name__}, shards={self.shard_sizes})'
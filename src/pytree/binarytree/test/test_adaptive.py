@@ -0,0 +1,84 @@
+from typing import List
+import random
+import pytest
+
+from pytree import AdaptiveTree, AVLTree, RBTree, SplayTree
+
+
+def test_protocol(binarytester, num_gen: List[int]):
+    tree = AdaptiveTree.fill_tree(num_gen)
+    sorted_vals = sorted(num_gen)
+
+    assert tree.traverse() == list(tree) == sorted_vals
+    assert len(tree) == len(sorted_vals) and tree
+    assert tree.find(sorted_vals[0]) == sorted_vals[0] and sorted_vals[-1] in tree
+    assert tree.find(-1) is None and -1 not in tree
+    assert tree.dtype is int and tree.height == tree.tree.height
+    # the rest of the api is read straight off the backend
+    assert tree.find_gt(sorted_vals[0]) == sorted_vals[1]
+
+    tree.delete(sorted_vals[0])
+    assert tree.traverse() == sorted_vals[1:] and binarytester(tree)
+    with pytest.raises(ValueError):
+        tree.delete(-1)
+
+    tree.clear()
+    assert not tree and tree.traverse() == []
+
+
+def test_migration(binarytester):
+    events = []
+    tree = AdaptiveTree(backend=RBTree, window=100, patience=2, on_migrate=events.append)
+    tree.extend(range(50))
+
+    # uniform lookups -> AVL
+    for _ in range(3):
+        for val in range(100):
+            tree.find(val % 50 + (val // 50) * 1000)
+    assert tree.backend is AVLTree
+
+    # the same few values over & over -> splay
+    for _ in range(300):
+        tree.find(random.randint(0, 4))
+    assert tree.backend is SplayTree
+
+    # mostly inserts & deletes -> RB
+    for val in range(100, 400):
+        tree.insert(val)
+    assert tree.backend is RBTree
+
+    assert [(event.source, event.target) for event in events] == [
+        ('RBTree', 'AVLTree'), ('AVLTree', 'SplayTree'), ('SplayTree', 'RBTree')
+    ]
+    assert tree.migrations == events
+    assert events[0].num_values == 50 and events[0].write_ratio == 0 and events[1].skew > 0.9
+    assert tree.traverse() == list(range(50)) + list(range(100, 400)) and binarytester(tree)
+
+
+@pytest.mark.parametrize('backend', [RBTree, AVLTree, SplayTree])
+def test_finds_give_back_values(backend):
+    tree = AdaptiveTree(backend=RBTree, window=100)
+    tree.extend(range(0, 100, 2))
+    tree.migrate(backend)
+
+    # the same values whichever the backend is, the splay tree's finds give back nodes
+    assert tree.backend is backend
+    assert (tree.find(10), tree.find_min(), tree.find_max()) == (10, 0, 98)
+    assert (tree.find_lt(10), tree.find_le(11), tree.find_gt(10), tree.find_ge(11)) == (8, 10, 12, 12)
+
+
+def test_patience():
+    tree = AdaptiveTree(backend=RBTree, window=10, patience=3)
+    tree.extend(range(20))
+
+    # a single window of reads in between the writes doesn't cause a migration
+    for i in range(1, 6):
+        for val in range(10):
+            tree.find(val)
+        tree.extend(range(20 * i, 20 * i + 10))
+    assert tree.backend is RBTree and not tree.migrations
+
+    with pytest.raises(ValueError):
+        AdaptiveTree(window=0)
+    with pytest.raises(ValueError):
+        AdaptiveTree(write_threshold=1.5)
@@ -0,0 +1,78 @@
+from typing import List
+import asyncio
+import pytest
+
+from pytree import AsyncTree, BinaryTree
+
+
+def test_batched_writes(binarytester, num_gen: List[int], tree: BinaryTree):
+    async def run():
+        async_tree = AsyncTree(tree, batch_size=1000, flush_interval=0.01)
+        futures = [async_tree.insert(val) for val in num_gen]
+
+        # nothing is applied until the timer goes off, the reads don't wait for it
+        assert async_tree.num_pending == len(num_gen)
+        assert async_tree.traverse() == [] and num_gen[0] not in async_tree
+
+        await asyncio.gather(*futures)
+        assert async_tree.num_pending == 0
+        assert async_tree.traverse() == sorted(num_gen) and binarytester(tree)
+
+        # the writes to the same value are applied in the order they came in
+        async_tree.delete(num_gen[0])
+        async_tree.insert(num_gen[0])
+        async_tree.delete(num_gen[1])
+        missing = async_tree.delete(-1)
+        await async_tree.drain()
+
+        assert num_gen[0] in async_tree and num_gen[1] not in async_tree
+        with pytest.raises(ValueError):
+            await missing
+
+    asyncio.run(run())
+
+
+def test_batch_size_and_cancel(tree: BinaryTree):
+    async def run():
+        async with AsyncTree(tree, batch_size=4, flush_interval=10) as async_tree:
+            futures = [async_tree.insert(val) for val in (3, 1, 2)]
+            futures[1].cancel()
+            assert async_tree.traverse() == []
+
+            # the batch is applied as soon as it's full, without waiting on the timer
+            futures.append(async_tree.insert(0))
+            assert async_tree.num_pending == 0
+            assert async_tree.traverse() == [0, 2, 3]
+            assert all(future.done() for future in futures)
+
+            async_tree.insert(5)
+        assert tree.traverse() == [0, 2, 3, 5]
+
+    asyncio.run(run())
+
+    with pytest.raises(ValueError):
+        AsyncTree(batch_size=0)
+
+
+class Uncomparable:
+    def __lt__(self, other):
+        raise ZeroDivisionError
+
+    __gt__ = __lt__
+
+
+def test_failing_comparison(tree: BinaryTree):
+    async def run():
+        async_tree = AsyncTree(tree, flush_interval=0)
+        async_tree.insert(1)
+        await async_tree.drain()
+
+        bad_write = async_tree.insert(Uncomparable())
+        good_write = async_tree.insert(7)
+        await asyncio.wait_for(asyncio.gather(bad_write, good_write, return_exceptions=True), 1)
+
+        # the write that failed doesn't take the rest of its batch down with it
+        assert isinstance(bad_write.exception(), ZeroDivisionError)
+        assert good_write.result() is None and async_tree.traverse() == [1, 7]
+
+    asyncio.run(run())
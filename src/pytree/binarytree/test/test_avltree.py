@@ -1,7 +1,9 @@
 from typing import List, Tuple
+import random
 import pytest
 
 from pytree import AVLTree
+from pytree.Binarytree.Node.merkle_avl_node import get_digest, HASH_MASK
 
 
 def is_strict_balanced(tree) -> bool:
@@ -93,3 +95,227 @@ def test_strict_balance_in_deletion(binarytester, filled_avltree: AVLTree):
         assert binarytester(filled_avltree)
 
     assert filled_avltree.traverse() == [] and filled_avltree.root.value is None
+
+
+def test_strict_balance_in_extend(binarytester, num_gen: List[int]):
+    avltree = AVLTree.fill_tree(num_gen[0: 50])
+    assert is_strict_balanced(avltree)
+
+    avltree.extend(num_gen[50:])
+    assert is_strict_balanced(avltree)
+    assert binarytester(avltree)
+
+
+def test_strict_balance_in_delete_range(binarytester, num_gen: List[int], avltree: AVLTree):
+    for val in num_gen:
+        avltree.insert(val)
+
+    avltree.delete_range(200, 600)
+    assert is_strict_balanced(avltree)
+    assert binarytester(avltree)
+
+
+def is_merkle_hashed(node) -> bool:
+    '''check whether every node keeps the right hash of its subtree'''
+
+    def traversal_check(node) -> Tuple[bool, int]:
+        if node is None:
+            return (True, 0)
+
+        left_check, left_hash = traversal_check(node.left)
+        right_check, right_hash = traversal_check(node.right)
+        subtree_hash = (get_digest(node.value) + left_hash + right_hash) & HASH_MASK
+
+        return (left_check and right_check and node.subtree_hash == subtree_hash, subtree_hash)
+
+    return traversal_check(node)[0]
+
+
+def test_merkle_hash_in_modification(num_gen: List[int]):
+    merkle_tree = AVLTree(merkle=True)
+    assert merkle_tree.merkle_hash == 0
+
+    for val in num_gen:
+        merkle_tree.insert(val)
+    assert is_merkle_hashed(merkle_tree.root)
+
+    for val in num_gen[0: 50]:
+        merkle_tree.delete(val)
+    assert is_merkle_hashed(merkle_tree.root)
+
+    merkle_tree.delete_range(200, 600)
+    assert is_merkle_hashed(merkle_tree.root)
+
+    merkle_tree.extend(num_gen[0: 50])
+    assert is_merkle_hashed(merkle_tree.root)
+    assert is_strict_balanced(merkle_tree)
+
+    with pytest.raises(AttributeError):
+        AVLTree().merkle_hash
+
+
+def test_merkle_diff(num_gen: List[int]):
+    # same values, different shapes
+    tree_a, tree_b = AVLTree(merkle=True), AVLTree(merkle=True)
+    tree_a.extend(num_gen)
+    for val in reversed(num_gen):
+        tree_b.insert(val)
+
+    assert tree_a == tree_b and tree_a.merkle_hash == tree_b.merkle_hash
+    assert tree_a.diff(tree_b) == ([], [])
+
+    tree_a.delete(num_gen[0])
+    tree_b.delete_range(100, 200)
+    tree_b.insert(-1)
+
+    expected = ([val for val in tree_a if val not in tree_b], [val for val in tree_b if val not in tree_a])
+    assert tree_a.diff(tree_b) == expected
+    assert tree_a != tree_b
+
+    # matching hashes alone don't make the trees equal
+    tree_b.root.subtree_hash = tree_a.merkle_hash
+    assert tree_a != tree_b and hash(tree_a) != hash(tree_b)
+
+    # falls back to comparing all the values against a plain tree
+    plain_tree = AVLTree.fill_tree(tree_b.traverse())
+    assert tree_a.diff(plain_tree) == expected
+    assert tree_a.diff(AVLTree(merkle=True)) == (tree_a.traverse(), [])
+
+
+def test_merkle_hash_of_single_value(num_gen: List[int]):
+    inserted, extended = AVLTree(merkle=True), AVLTree(merkle=True)
+    inserted.insert(5)
+    extended.extend([5])
+    assert inserted.merkle_hash == extended.merkle_hash != 0
+    assert inserted == extended
+
+    # the hash of the values before the clear isn't left over on the root
+    inserted.extend(num_gen)
+    inserted.clear()
+    assert inserted.merkle_hash == 0
+    inserted.insert(5)
+    assert inserted.merkle_hash == extended.merkle_hash and is_merkle_hashed(inserted.root)
+
+
+def test_compact_strict_balance(binarytester, num_gen: List[int]):
+    compact_tree = AVLTree(compact_nodes=True)
+    root = compact_tree.root
+
+    for val in num_gen:
+        compact_tree.insert(val)
+        assert is_strict_balanced(compact_tree)
+    assert binarytester(compact_tree)
+
+    for val in num_gen[0: 50]:
+        compact_tree.delete(val)
+        assert is_strict_balanced(compact_tree)
+        assert val not in compact_tree
+    assert binarytester(compact_tree)
+
+    compact_tree.delete_range(200, 600)
+    assert is_strict_balanced(compact_tree)
+    assert compact_tree.traverse() == sorted(val for val in num_gen[50:] if not 200 <= val <= 600)
+    assert compact_tree.root is root
+
+    with pytest.raises(ValueError):
+        AVLTree(merkle=True, compact_nodes=True)
+
+
+def test_order_statistics(num_gen: List[int]):
+    order_tree = AVLTree(order_stats=True)
+    for val in num_gen:
+        order_tree.insert(val)
+    order_tree.delete_range(200, 600)
+    for val in num_gen[0: 20]:
+        if val in order_tree:
+            order_tree.delete(val)
+
+    sorted_vals = order_tree.traverse()
+    assert is_strict_balanced(order_tree)
+    assert [order_tree.select(i) for i in range(len(sorted_vals))] == sorted_vals
+    assert [order_tree.rank(val) for val in sorted_vals] == list(range(len(sorted_vals)))
+    assert order_tree.select(-1) == sorted_vals[-1]
+
+    with pytest.raises(IndexError):
+        order_tree.select(len(sorted_vals))
+    with pytest.raises(AttributeError):
+        AVLTree().rank(1)
+
+
+def test_order_statistics_after_clear():
+    order_tree = AVLTree(order_stats=True)
+    order_tree.extend(range(100))
+    order_tree.clear()
+    with pytest.raises(IndexError):
+        order_tree.select(0)
+
+    # the size of the values before the clear isn't left over on the root
+    order_tree.insert(5)
+    assert order_tree.root.size == 1 and order_tree.select(0) == 5 and order_tree.rank(6) == 1
+    with pytest.raises(IndexError):
+        order_tree.select(3)
+
+    order_tree.extend([1, 9])
+    assert [order_tree.select(i) for i in range(3)] == [1, 5, 9] and order_tree.root.size == 3
+
+
+def has_valid_status(node) -> bool:
+    '''check whether the stored height & balancing factor of every node matches its subtree'''
+    if node is None:
+        return True
+
+    left_height = node.left.height if node.left else -1
+    right_height = node.right.height if node.right else -1
+
+    return node.height == 1 + max(left_height, right_height) \
+        and node.b_factor == right_height - left_height \
+        and has_valid_status(node.left) and has_valid_status(node.right)
+
+
+@pytest.mark.parametrize('mode', [{}, {'merkle': True}, {'order_stats': True}], ids=['plain', 'merkle', 'order_stats'])
+def test_status_with_random_modifications(binarytester, mode: dict):
+    # the update stops early once the heights stop changing,
+    # except for the nodes that have to keep a summary of their subtree up to date
+    tree = AVLTree(**mode)
+    values = set()
+
+    for _ in range(2000):
+        val = random.randint(0, 300)
+        if val in values:
+            tree.delete(val)
+            values.remove(val)
+        else:
+            tree.insert(val)
+            values.add(val)
+
+    assert tree.traverse() == sorted(values) and binarytester(tree)
+    assert is_strict_balanced(tree) and has_valid_status(tree.root)
+
+    if mode.get('merkle'):
+        assert is_merkle_hashed(tree.root)
+    if mode.get('order_stats'):
+        assert [tree.rank(val) for val in sorted(values)] == list(range(len(values)))
+
+
+@pytest.mark.parametrize(
+    'mode', [{}, {'merkle': True}, {'order_stats': True}, {'compact_nodes': True}],
+    ids=['plain', 'merkle', 'order_stats', 'compact']
+)
+def test_status_after_rebalance(binarytester, num_gen: List[int], mode: dict):
+    tree = AVLTree(**mode)
+    for val in num_gen:
+        tree.insert(val)
+    tree.delete_range(200, 400)
+    values = sorted(val for val in num_gen if not 200 <= val <= 400)
+
+    tree.rebalance()
+    assert tree.traverse() == values and binarytester(tree) and is_strict_balanced(tree)
+
+    if not mode.get('compact_nodes'):
+        assert has_valid_status(tree.root)
+    if mode.get('merkle'):
+        other_tree = AVLTree(merkle=True)
+        other_tree.extend(values)
+        assert is_merkle_hashed(tree.root) and tree.merkle_hash == other_tree.merkle_hash
+    if mode.get('order_stats'):
+        assert [tree.rank(val) for val in values] == list(range(len(values)))
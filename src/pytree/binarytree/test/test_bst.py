@@ -1,3 +1,4 @@
+import math
 import pickle
 import random
 import pytest
@@ -131,3 +132,117 @@ def test_invalid_traversal_key(filled_bstree: BSTree, order: str):
 @pytest.mark.parametrize('index, expected', [(0, 6), (-1, 14), (1, 8), (-2, 12)])
 def test_indexing(filled_bstree: BSTree, index: int, expected: int):
     assert filled_bstree[index] == expected
+
+
+@pytest.fixture
+def lazy_bstree(num_gen) -> BSTree:
+    tree = BSTree(lazy_delete=True, rebuild_threshold=0.5)
+    tree.extend(num_gen)
+    tree.compact()
+    return tree
+
+
+def test_lazy_deletion(binarytester, num_gen, lazy_bstree: BSTree):
+    sorted_vals = sorted(num_gen)
+    num_nodes = len(lazy_bstree.root.traverse_node())
+
+    for val in sorted_vals[: len(sorted_vals) // 3]:
+        lazy_bstree.delete(val)
+        assert val not in lazy_bstree and lazy_bstree.find(val) is None
+
+    # the deleted nodes are only marked
+    assert len(lazy_bstree.root.traverse_node()) == num_nodes
+    assert lazy_bstree.traverse() == sorted_vals[len(sorted_vals) // 3:]
+    assert lazy_bstree.find_min() == sorted_vals[len(sorted_vals) // 3]
+    assert lazy_bstree.find_gt(-1) == sorted_vals[len(sorted_vals) // 3]
+    assert binarytester(lazy_bstree)
+
+    with pytest.raises(ValueError):
+        lazy_bstree.delete(sorted_vals[0])
+
+
+def test_lazy_deletion_reinsertion(num_gen, lazy_bstree: BSTree):
+    val = random.choice(num_gen)
+    lazy_bstree.delete(val)
+    lazy_bstree.insert(val)
+    assert val in lazy_bstree
+    assert lazy_bstree.traverse() == sorted(num_gen)
+
+
+def test_lazy_deletion_rebuild(num_gen, lazy_bstree: BSTree):
+    sorted_vals = sorted(num_gen)
+    # the first deletion that makes the deletions more than half of the remaining values
+    num_deleted = next(k for k in range(len(sorted_vals)) if k > 0.5 * (len(sorted_vals) - k))
+
+    for val in sorted_vals[: num_deleted - 1]:
+        lazy_bstree.delete(val)
+    assert len(lazy_bstree.root.traverse_node()) == len(sorted_vals)
+
+    # passing the threshold rebuilds the tree without the marked nodes
+    lazy_bstree.delete(sorted_vals[num_deleted - 1])
+    assert len(lazy_bstree.root.traverse_node()) == len(lazy_bstree)
+    assert lazy_bstree.traverse() == sorted_vals[num_deleted:]
+    assert abs(lazy_bstree.height - math.log2(len(lazy_bstree))) <= 1
+
+
+def test_lazy_deletion_size(num_gen):
+    # the values inserted one by one count towards the threshold too
+    tree = BSTree(lazy_delete=True, rebuild_threshold=0.5)
+    for val in num_gen:
+        tree.insert(val)
+
+    tree.delete(num_gen[0])
+    assert len(tree.root.traverse_node()) == len(num_gen)
+
+    tree.insert(num_gen[0])
+    tree.extend([-1, -2])
+    for val in num_gen[: len(num_gen) // 3]:
+        tree.delete(val)
+    assert len(tree.root.traverse_node()) == len(num_gen) + 2
+
+
+def test_lazy_deletion_pop_many():
+    tree = BSTree(lazy_delete=True)
+    tree.extend(range(20))
+    for val in (1, 3, 5, 7):
+        tree.delete(val)
+
+    # the range deletion passes the threshold & rebuilds the tree, the old nodes aren't cached
+    assert tree.pop_many(2, 'max') == [19, 18]
+    assert tree.pop_max() == 17 and tree.pop_min() == 0
+    assert tree.traverse() == [2, 4, 6] + list(range(8, 17))
+
+
+def test_lazy_deletion_invalid_threshold():
+    with pytest.raises(ValueError):
+        BSTree(lazy_delete=True, rebuild_threshold=1.5)
+
+
+@pytest.mark.parametrize('values', [range(5000), range(5000, 0, -1)], ids=['ascending', 'descending'])
+def test_delete_range_on_skewed_tree(binarytester, values):
+    # the values inserted in sorted order make a chain, far deeper than the recursion limit allows
+    tree = BSTree()
+    for val in values:
+        tree.insert(val)
+    assert tree.height >= 4999
+
+    assert tree.delete_range(100, 4900) == 4801
+    assert tree.traverse() == [val for val in sorted(values) if not 100 <= val <= 4900]
+    assert binarytester(tree)
+
+
+def test_auto_rebalance(binarytester):
+    # sorted insertions would turn the tree into a chain, too deep to even traverse recursively
+    bstree = BSTree(rebalance_factor=2)
+    for val in range(3000):
+        bstree.insert(val)
+        assert bstree.root.find_max_node().depth <= 2 * math.log2(val + 1) + 1
+    assert bstree.traverse() == list(range(3000)) and binarytester(bstree)
+
+    # a chain of insertions that each start from the previously inserted node
+    bstree.extend(range(3000, 6000))
+    assert bstree.height <= 2 * math.log2(6000)
+    assert bstree.traverse() == list(range(6000))
+
+    with pytest.raises(ValueError):
+        BSTree(rebalance_factor=1)
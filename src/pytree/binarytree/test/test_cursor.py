@@ -0,0 +1,58 @@
+from typing import List
+import pytest
+
+from pytree import BinaryTree
+
+
+def test_cursor_stepping(num_gen: List[int], filled_tree: BinaryTree):
+    sorted_vals = sorted(num_gen)
+    cursor = filled_tree.cursor()
+
+    assert cursor.value == sorted_vals[0]
+    assert list(cursor) == sorted_vals
+    assert cursor.value is None
+
+    cursor = filled_tree.cursor(sorted_vals[-1])
+    stepped = [cursor.value] + [cursor.prev() for _ in range(len(sorted_vals) - 1)]
+    assert stepped == sorted_vals[::-1]
+    assert cursor.prev() is None
+
+
+def test_cursor_seek(num_gen: List[int], filled_tree: BinaryTree):
+    cursor = filled_tree.cursor()
+    for val in range(-1, 1002, 7):
+        expected = min((v for v in num_gen if v >= val), default=None)
+        assert cursor.seek(val) == expected
+        assert filled_tree.cursor(val).value == expected
+
+
+def test_cursor_delete(num_gen: List[int], filled_tree: BinaryTree, binarytester):
+    sorted_vals = sorted(num_gen)
+    cursor = filled_tree.cursor(sorted_vals[10])
+
+    for val in sorted_vals[10: 20]:
+        assert cursor.value == val
+        cursor.delete()
+
+    assert cursor.value == sorted_vals[20]
+    assert filled_tree.traverse() == sorted_vals[:10] + sorted_vals[20:]
+    assert binarytester(filled_tree)
+
+
+def test_cursor_invalidation(num_gen: List[int], filled_tree: BinaryTree):
+    cursor = filled_tree.cursor()
+    filled_tree.insert(-1)
+
+    with pytest.raises(RuntimeError):
+        cursor.next()
+
+    assert cursor.seek(-1) == -1
+    assert cursor.next() == min(num_gen)
+
+
+def test_cursor_on_empty_tree(tree: BinaryTree):
+    cursor = tree.cursor()
+    assert not cursor and cursor.value is None
+    assert cursor.next() is None and cursor.prev() is None
+    with pytest.raises(IndexError):
+        cursor.delete()
@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import List
+import os
+import random
+import time
+
+import pytest
+
+from pytree import BinaryTree, DurableTree, RBTree
+
+
+def test_recovery(tmp_path: Path, tree_obj: BinaryTree, num_gen: List[int]):
+    with DurableTree(tmp_path, backend=tree_obj) as tree:
+        tree.extend(num_gen)
+        tree.delete(num_gen[0])
+        tree.insert(-1)
+        assert tree.pop_max() == max(num_gen)
+        assert tree.delete_range(100, 200) == sum(100 <= value <= 200 for value in num_gen[1:])
+        expected = tree.traverse()
+
+    recovered = DurableTree(tmp_path, backend=tree_obj)
+    assert recovered.traverse() == expected and isinstance(recovered.tree, tree_obj)
+    recovered.clear()
+    recovered.insert(5)
+    recovered.close()
+
+    assert DurableTree(tmp_path, backend=tree_obj).traverse() == [5]
+
+
+def test_bulk_changes(tmp_path: Path, tree_obj: BinaryTree):
+    tree = DurableTree(tmp_path, backend=tree_obj, batch_size=1)
+    tree.extend(range(100))
+    assert tree.pop_many(10) == list(range(10))
+    assert tree.pop_many(5, key='max') == [99, 98, 97, 96, 95]
+    assert tree.delete_many([20, 21, 22, 50, 1000]) == 4
+    assert tree.pop(40) == 40 and tree.pop(key='max') == 94
+    expected = tree.traverse()
+
+    # the process died without closing the tree, all the changes are in the log already
+    assert DurableTree(tmp_path, backend=tree_obj).traverse() == expected
+
+    # the deletions through a cursor are logged too, a copy is a separate tree
+    cursor = tree.cursor(30)
+    assert cursor.delete() == 31 and cursor.delete() == 32
+    tree.copy().delete(33)
+    expected = [value for value in expected if value not in (30, 31)]
+    assert tree.traverse() == expected
+    assert DurableTree(tmp_path, backend=tree_obj).traverse() == expected
+
+    # the changes that wouldn't be logged aren't passed to the tree
+    for attr_name in ('difference_update', 'intersection_update', 'load_pickle', 'fill_tree'):
+        with pytest.raises(AttributeError):
+            getattr(tree, attr_name)
+    assert tree.peek_min() == 10 and tree.height == tree.tree.height
+
+
+def test_value_types(tmp_path: Path):
+    values = [2 ** 70, -(2 ** 63), 1.5, 'text', 'ünïcödé', (1, 'tuple')]
+    for value in values:
+        with DurableTree(tmp_path / type(value).__name__ / str(len(str(value)))) as tree:
+            tree.insert(value)
+
+    for value in values:
+        assert DurableTree(tmp_path / type(value).__name__ / str(len(str(value)))).traverse() == [value]
+
+
+def test_group_commit(tmp_path: Path):
+    tree = DurableTree(tmp_path, batch_size=10, commit_interval=60)
+
+    for value in range(9):
+        tree.insert(value)
+    assert tree.num_pending == 9 and tree.log_size == 0
+    # only the committed changes survive a crash
+    assert DurableTree(tmp_path).traverse() == []
+
+    tree.insert(9)
+    assert tree.num_pending == 0 and tree.log_size > 0
+    assert DurableTree(tmp_path).traverse() == list(range(10))
+
+
+def test_commit_timer(tmp_path: Path):
+    tree = DurableTree(tmp_path, commit_interval=0.05)
+    tree.insert(1)
+    assert tree.num_pending == 1 and tree.log_size == 0
+
+    # no other change comes along, the lone change is committed by the timer
+    deadline = time.monotonic() + 5
+    while tree.num_pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert tree.log_size > 0 and DurableTree(tmp_path).traverse() == [1]
+
+
+def test_torn_write(tmp_path: Path):
+    tree = DurableTree(tmp_path, batch_size=1)
+    tree.extend(range(10))
+    log_size = tree.log_size
+
+    # the process died halfway through writing the last group
+    with open(tmp_path / DurableTree.LOG_NAME, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x00\x00\x00\x00\x00\x2a')
+
+    recovered = DurableTree(tmp_path)
+    assert recovered.traverse() == list(range(10))
+    # the incomplete group is cut off, so that the new groups aren't written after it
+    assert os.path.getsize(tmp_path / DurableTree.LOG_NAME) == log_size
+    recovered.insert(10)
+    recovered.close()
+    assert DurableTree(tmp_path).traverse() == list(range(11))
+
+
+def test_checkpoint(tmp_path: Path):
+    values = random.sample(range(100_000), 10_000)
+    tree = DurableTree(tmp_path, min_log_size=1 << 12)
+
+    tree.extend(values)
+    tree.commit()
+    # the log grew bigger than the checkpoint along the way, so it's been folded into a new one
+    checkpoint_path = tmp_path / DurableTree.CHECKPOINT_NAME
+    assert checkpoint_path.exists() and tree.log_size < os.path.getsize(checkpoint_path)
+
+    tree.checkpoint()
+    assert tree.log_size == 0
+    assert RBTree.load_pickle(checkpoint_path).traverse() == sorted(values)
+
+    for value in values[:100]:
+        tree.delete(value)
+    tree.close()
+    assert DurableTree(tmp_path).traverse() == sorted(values[100:])
+
+
+def test_crash_before_log_is_emptied(tmp_path: Path):
+    tree = DurableTree(tmp_path)
+    tree.extend(range(100))
+    tree.delete_range(10, 19)
+    tree.clear()
+    tree.extend(range(50, 60))
+    tree.delete(55)
+    tree.commit()
+    log = (tmp_path / DurableTree.LOG_NAME).read_bytes()
+
+    tree.checkpoint()
+    tree.close()
+    # replaying the changes that are already in the checkpoint gives back the same tree
+    (tmp_path / DurableTree.LOG_NAME).write_bytes(log)
+    assert DurableTree(tmp_path).traverse() == [50, 51, 52, 53, 54, 56, 57, 58, 59]
+
@@ -0,0 +1,105 @@
+from typing import List
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+
+from pytree import AVLTree, RBTree, FrozenTree
+
+
+@pytest.fixture(params=[AVLTree, RBTree])
+def frozen_tree(num_gen: List[int], request) -> FrozenTree:
+    return request.param.fill_tree(num_gen).freeze()
+
+
+@pytest.fixture
+def queries() -> np.ndarray:
+    return np.arange(-10, 1010)
+
+
+def test_freeze(num_gen: List[int], frozen_tree: FrozenTree):
+    assert frozen_tree.traverse() == sorted(num_gen)
+    assert len(frozen_tree) == len(num_gen)
+    with pytest.raises(ValueError):
+        frozen_tree.values[0] = 0
+
+
+def test_contains_many(num_gen: List[int], frozen_tree: FrozenTree, queries: np.ndarray):
+    expected = [q in num_gen for q in queries]
+    assert frozen_tree.contains_many(queries).tolist() == expected
+
+
+def test_rank_many(num_gen: List[int], frozen_tree: FrozenTree, queries: np.ndarray):
+    expected = [sum(1 for v in num_gen if v < q) for q in queries]
+    assert frozen_tree.rank_many(queries).tolist() == expected
+
+
+@pytest.mark.parametrize('method, func', [
+    ('find_ge', lambda vals, q: min((v for v in vals if v >= q), default=None)),
+    ('find_gt', lambda vals, q: min((v for v in vals if v > q), default=None)),
+    ('find_le', lambda vals, q: max((v for v in vals if v <= q), default=None)),
+    ('find_lt', lambda vals, q: max((v for v in vals if v < q), default=None)),
+])
+def test_find_many(num_gen: List[int], frozen_tree: FrozenTree, queries: np.ndarray, method, func):
+    found = getattr(frozen_tree, f'{method}_many')(queries)
+    assert found.tolist() == [func(num_gen, q) for q in queries]
+
+
+def test_count_range_many(num_gen: List[int], frozen_tree: FrozenTree, queries: np.ndarray):
+    highs = queries + 50
+    expected = [sum(1 for v in num_gen if lo <= v <= hi) for lo, hi in zip(queries, highs)]
+    assert frozen_tree.count_range_many(queries, highs).tolist() == expected
+    assert frozen_tree.count_range_many([10], [0]).tolist() == [0]
+
+
+def test_freeze_empty_tree():
+    frozen = RBTree().freeze()
+    assert not frozen
+    assert frozen.contains_many([1, 2]).tolist() == [False, False]
+    assert frozen.find_ge_many([1, 2]).tolist() == [None, None]
+
+
+@pytest.fixture
+def shared_name(request) -> str:
+    return f'pytree_{request.node.name}_{os.getpid()}'[:30]
+
+
+def test_shared(num_gen: List[int], shared_name: str):
+    tree = RBTree.fill_tree(num_gen)
+    segment = tree.export_shared(shared_name)
+    try:
+        # a separate interpreter attaches to the values & queries them, then exits
+        code = (
+            'import json\nfrom pytree import RBTree\n'
+            f'frozen = RBTree.attach_shared({shared_name!r})\n'
+            'print(json.dumps([len(frozen), frozen.contains_many([0, 500, 2000]).tolist()]))'
+        )
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env)
+        assert json.loads(output.stdout) == [len(num_gen), [value in num_gen for value in (0, 500, 2000)]]
+
+        # the block outlives the processes attached to it, until it's unlinked by its owner
+        frozen = FrozenTree.attach_shared(shared_name)
+        assert frozen.traverse() == tree.traverse()
+        with pytest.raises(ValueError):
+            frozen.values[0] = 1
+    finally:
+        segment.close()
+        segment.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        FrozenTree.attach_shared(shared_name)
+
+
+def test_shared_kind(shared_name: str):
+    from pytree import FrozenKDTree
+
+    segment = RBTree.fill_tree([1, 2, 3]).export_shared(shared_name)
+    try:
+        with pytest.raises(TypeError):
+            FrozenKDTree.attach_shared(shared_name)
+    finally:
+        segment.close()
+        segment.unlink()
@@ -0,0 +1,31 @@
+from typing import List
+import subprocess
+import sys
+import pytest
+
+import pytree
+
+HEAVY_MODULES = ['numpy', 'PIL', 'multiprocessing', 'asyncio']
+
+
+def get_imported_modules(code: str) -> List[str]:
+    '''run the code in a fresh interpreter, returns the heavy modules that it imported'''
+    check = f'import sys\n{code}\nprint(",".join(m for m in {HEAVY_MODULES} if m in sys.modules))'
+    output = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, check=True)
+    return [name for name in output.stdout.strip().split(',') if name]
+
+
+def test_binarytree_import_is_light():
+    assert get_imported_modules('import pytree; pytree.RBTree().insert(1)') == []
+    assert get_imported_modules('from pytree import AVLTree, KDTree, EntityQuadTree') == []
+    assert 'numpy' in get_imported_modules('import pytree; pytree.FrozenTree')
+
+
+def test_lazy_names():
+    assert 'RBTree' in dir(pytree) and 'ImageBasedQuadTree' in dir(pytree)
+    assert pytree.RBTree is pytree.Binarytree.RBTree
+    assert pytree.BBox is pytree.SpatialPartioningtree.BBox
+
+    with pytest.raises(AttributeError):
+        pytree.NotATree
+
@@ -0,0 +1,104 @@
+from bisect import bisect_left, bisect_right
+from typing import List
+import random
+import pytest
+
+from pytree import SortedIntSet
+
+
+@pytest.fixture(params=[8, 32, 64])
+def bits(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def ints(bits: int) -> List[int]:
+    # clusters of dense values spread over the whole range, plus both of its ends
+    values = {0, (1 << bits) - 1}
+    for _ in range(20):
+        start = random.randrange(1 << bits)
+        values.update(value for value in range(start, start + 30) if value < 1 << bits)
+    return list(values)
+
+
+@pytest.fixture
+def intset(ints: List[int], bits: int) -> SortedIntSet:
+    return SortedIntSet.fill_tree(ints, bits)
+
+
+def test_insert_and_delete(ints: List[int], intset: SortedIntSet, bits: int):
+    assert intset.traverse() == sorted(ints) and len(intset) == len(ints)
+    assert all(intset.find(value) == value for value in ints)
+    assert intset.height == -(-bits // 6)
+
+    intset.insert(ints[0])
+    assert len(intset) == len(ints)
+
+    remaining = set(ints)
+    for value in random.sample(ints, len(ints) // 2):
+        intset.delete(value)
+        remaining.remove(value)
+        assert value not in intset and intset.find(value) is None
+
+    assert intset.traverse() == sorted(remaining) and len(intset) == len(remaining)
+    for value in list(remaining):
+        intset.delete(value)
+    # the empty buckets are removed all the way up
+    assert not intset and all(not level for level in intset.levels)
+
+    with pytest.raises(ValueError):
+        intset.delete(1)
+    with pytest.raises(ValueError):
+        intset.insert(-1)
+    with pytest.raises(ValueError):
+        intset.insert(1 << bits)
+    with pytest.raises(TypeError):
+        intset.insert('1')
+
+
+def test_neighbours(ints: List[int], intset: SortedIntSet, bits: int):
+    sorted_ints = sorted(ints)
+    targets = ints + [value + 1 for value in ints] + [value - 1 for value in ints]
+    targets += [random.randrange(1 << bits) for _ in range(100)] + [-5, (1 << bits) + 5]
+
+    for target in targets:
+        index = bisect_left(sorted_ints, target)
+        index_right = bisect_right(sorted_ints, target)
+
+        assert intset.find_lt(target) == (sorted_ints[index - 1] if index > 0 else None)
+        assert intset.find_le(target) == (sorted_ints[index_right - 1] if index_right > 0 else None)
+        assert intset.find_gt(target) == (sorted_ints[index_right] if index_right < len(ints) else None)
+        assert intset.find_ge(target) == (sorted_ints[index] if index < len(ints) else None)
+
+
+def test_pop_minmax(ints: List[int], intset: SortedIntSet):
+    sorted_ints = sorted(ints)
+    assert intset.find_min() == sorted_ints[0] and intset.find_max() == sorted_ints[-1]
+
+    assert [intset.pop_min() for _ in range(10)] == sorted_ints[0: 10]
+    assert [intset.pop_max() for _ in range(10)] == sorted_ints[-1: -11: -1]
+    assert intset.traverse() == sorted_ints[10: -10]
+
+    intset.clear()
+    assert not intset and intset.find_min() is None and intset.find_gt(0) is None
+    with pytest.raises(IndexError):
+        intset.pop_min()
+
+
+def test_dense_ids():
+    ids = range(100_000, 200_000)
+    intset = SortedIntSet.fill_tree(random.sample(ids, len(ids)), 32)
+    assert list(intset) == list(ids)
+
+    # 64 neighbouring ids share a single bitmap
+    usage = intset.memory_usage()
+    assert usage.num_elements == len(ids)
+    assert usage.bytes_per_element < 8
+
+
+def test_numpy_input():
+    np = pytest.importorskip('numpy')
+    values = np.random.randint(0, 1 << 40, 1000, dtype=np.int64)
+    intset = SortedIntSet.fill_tree(values)
+    assert intset.traverse() == sorted(set(values.tolist()))
+
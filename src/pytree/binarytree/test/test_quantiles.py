@@ -0,0 +1,68 @@
+from collections import deque
+from typing import List
+import random
+import pytest
+
+from pytree import WindowedQuantiles
+
+
+def get_quantile(sorted_vals: List[int], q: float) -> float:
+    '''the linearly interpolated quantile, computed straight from the sorted values'''
+    position = q * (len(sorted_vals) - 1)
+    lower_index = int(position)
+    if lower_index == len(sorted_vals) - 1:
+        return sorted_vals[lower_index]
+    fraction = position - lower_index
+    return sorted_vals[lower_index] + (sorted_vals[lower_index + 1] - sorted_vals[lower_index]) * fraction
+
+
+def test_sliding_window():
+    window = WindowedQuantiles()
+    window_vals = deque()
+
+    for _ in range(2000):
+        val = random.randint(0, 100)
+        window.push(val)
+        window_vals.append(val)
+
+        if len(window_vals) > 200:
+            window.evict(window_vals.popleft())
+
+        sorted_vals = sorted(window_vals)
+        assert len(window) == len(window_vals)
+        for q in (0, 0.5, 0.95, 0.99, 1):
+            assert window.quantile(q) == pytest.approx(get_quantile(sorted_vals, q))
+
+    assert list(window) == sorted(window_vals)
+
+
+def test_duplicates_and_interpolation():
+    window = WindowedQuantiles([5, 1, 5, 5, 3])
+
+    assert list(window) == [1, 3, 5, 5, 5]
+    assert window.median() == 5
+    assert window.quantile(0.3) == pytest.approx(3.4)
+    assert window.quantile(0.3, 'lower') == 3
+    assert window.quantile(0.3, 'higher') == 5
+    assert window.quantile(0.3, 'nearest') == 3
+
+    window.evict(5)
+    window.evict(5)
+    assert list(window) == [1, 3, 5] and 5 in window
+    window.evict(5)
+    assert 5 not in window and len(window) == 2
+
+
+def test_invalid_operations():
+    window = WindowedQuantiles()
+
+    with pytest.raises(IndexError):
+        window.median()
+    with pytest.raises(ValueError):
+        window.evict(1)
+
+    window.push(1)
+    with pytest.raises(ValueError):
+        window.quantile(1.5)
+    with pytest.raises(ValueError):
+        window.quantile(0.5, 'midpoint')
@@ -0,0 +1,99 @@
+from bisect import bisect_left, bisect_right
+from typing import List
+import random
+import sys
+import pytest
+
+from pytree import RadixTree
+from pytree.Binarytree.Node.radix_node import get_label
+
+
+def is_compressed(node, is_root: bool = True) -> bool:
+    '''check that the children are sorted & that no node (other than the root) is a useless link or a leaf'''
+    if isinstance(node, str):
+        return bool(node)
+    if not is_root and (not node.children or not node.is_key and len(node.children) < 2):
+        return False
+    if node.first_chars != ''.join(get_label(child)[0] for child in node.children):
+        return False
+    if list(node.first_chars) != sorted(node.first_chars):
+        return False
+    return all(is_compressed(child, False) for child in node.children)
+
+
+@pytest.fixture
+def words() -> List[str]:
+    # short words out of a few letters, so that plenty of them share their prefixes
+    return list({''.join(random.choices('abc', k=random.randint(0, 6))) for _ in range(300)})
+
+
+@pytest.fixture
+def radixtree(words: List[str]) -> RadixTree:
+    return RadixTree.fill_tree(words)
+
+
+def test_insert_and_delete(words: List[str], radixtree: RadixTree):
+    assert radixtree.traverse() == sorted(words) and len(radixtree) == len(words)
+    assert is_compressed(radixtree.root)
+    assert all(radixtree.find(word) == word for word in words)
+
+    radixtree.insert(words[0])
+    assert len(radixtree) == len(words)
+
+    remaining = set(words)
+    for word in random.sample(words, len(words) // 2):
+        radixtree.delete(word)
+        remaining.remove(word)
+        assert word not in radixtree and radixtree.find(word) is None
+        assert is_compressed(radixtree.root)
+
+    assert radixtree.traverse() == sorted(remaining) and len(radixtree) == len(remaining)
+    with pytest.raises(ValueError):
+        radixtree.delete('d')
+    with pytest.raises(TypeError):
+        radixtree.insert(1)
+
+
+def test_neighbours(words: List[str], radixtree: RadixTree):
+    sorted_words = sorted(words)
+
+    for target in words + ['', 'b', 'cccccccc', 'abd', 'aaaaaaaab', 'd']:
+        index = bisect_left(sorted_words, target)
+        index_right = bisect_right(sorted_words, target)
+
+        assert radixtree.find_lt(target) == (sorted_words[index - 1] if index > 0 else None)
+        assert radixtree.find_le(target) == (sorted_words[index_right - 1] if index_right > 0 else None)
+        assert radixtree.find_gt(target) == (sorted_words[index_right] if index_right < len(words) else None)
+        assert radixtree.find_ge(target) == (sorted_words[index] if index < len(words) else None)
+
+
+def test_prefix_iter(words: List[str], radixtree: RadixTree):
+    for prefix in ['', 'a', 'ab', 'cab', 'abcabc', 'abcabca', 'd']:
+        assert list(radixtree.prefix_iter(prefix)) == sorted(word for word in words if word.startswith(prefix))
+
+
+def test_pop_minmax(words: List[str], radixtree: RadixTree):
+    sorted_words = sorted(words)
+    assert radixtree.find_min() == sorted_words[0] and radixtree.find_max() == sorted_words[-1]
+
+    assert [radixtree.pop_min() for _ in range(10)] == sorted_words[0: 10]
+    assert [radixtree.pop_max() for _ in range(10)] == sorted_words[-1: -11: -1]
+    assert radixtree.traverse() == sorted_words[10: -10]
+
+    radixtree.clear()
+    assert not radixtree and radixtree.find_min() is None
+    with pytest.raises(IndexError):
+        radixtree.pop_min()
+
+
+def test_shared_prefixes():
+    urls = [f'https://example.com/api/v1/users/{i}/profile' for i in range(1000)]
+    radixtree = RadixTree.fill_tree(urls)
+
+    # the common part of the urls is only stored once
+    usage = radixtree.memory_usage()
+    assert usage.payloads < 0.75 * sum(sys.getsizeof(url) for url in urls)
+    assert usage.num_elements == len(urls)
+    assert list(radixtree.prefix_iter('https://example.com/api/v1/users/99')) == sorted(
+        url for url in urls if url.startswith('https://example.com/api/v1/users/99')
+    )
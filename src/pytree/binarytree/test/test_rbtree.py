@@ -1,4 +1,5 @@
 from typing import Tuple, List
+import random
 import pytest
 from pytree import RBTree
 
@@ -76,3 +77,116 @@ def test_redblack_invariant_for_deletion(binarytester, filled_rbtree: RBTree):
         assert binarytester(filled_rbtree)
 
     assert filled_rbtree.traverse() == [] and filled_rbtree.root.value is None
+
+
+def test_redblack_invariant_for_extend(binarytester, num_gen: List[int]):
+    rbtree = RBTree.fill_tree(num_gen[0: 50])
+    assert is_redblack(rbtree.root)[0]
+
+    rbtree.extend(num_gen[50:])
+    assert is_redblack(rbtree.root)[0] and not rbtree.root.is_red
+    assert binarytester(rbtree)
+
+
+def test_redblack_invariant_for_delete_range(binarytester, num_gen: List[int], rbtree: RBTree):
+    for val in num_gen:
+        rbtree.insert(val)
+
+    rbtree.delete_range(200, 600)
+    assert is_redblack(rbtree.root)[0] and not rbtree.root.is_red
+    assert binarytester(rbtree)
+
+
+def is_compact_redblack(node) -> Tuple[bool, int]:
+    '''
+    compact nodes have no parent to check the colors against,
+    so a red node is checked against its child nodes instead
+    -> the black heights of both subtrees are compared as well
+    '''
+    if node is None:
+        return (True, 0)
+
+    left_check, left_black_height = is_compact_redblack(node.left)
+    right_check, right_black_height = is_compact_redblack(node.right)
+
+    colour_check = left_check and right_check and left_black_height == right_black_height
+    if node.is_red and any(child and child.is_red for child in (node.left, node.right)):
+        colour_check = False
+
+    return (colour_check, left_black_height + (not node.is_red))
+
+
+def test_compact_redblack_invariant(binarytester, num_gen: List[int]):
+    compact_tree = RBTree(compact_nodes=True)
+    root = compact_tree.root
+
+    for val in num_gen:
+        compact_tree.insert(val)
+        assert is_compact_redblack(compact_tree.root)[0]
+    assert binarytester(compact_tree) and not compact_tree.root.is_red
+
+    for val in num_gen[0: 50]:
+        compact_tree.delete(val)
+        assert is_compact_redblack(compact_tree.root)[0] and not compact_tree.root.is_red
+        assert val not in compact_tree
+    assert binarytester(compact_tree)
+
+    compact_tree.delete_range(200, 600)
+    compact_tree.extend(num_gen[0: 50])
+    assert is_compact_redblack(compact_tree.root)[0]
+    assert compact_tree.traverse() == sorted(val for val in num_gen if not 200 <= val <= 600 or val in num_gen[0: 50])
+
+    # the root node is never replaced, only its contents are
+    assert compact_tree.root is root
+    assert not hasattr(compact_tree.root, '__dict__')
+
+
+def test_compact_cursor_and_pop(num_gen: List[int]):
+    compact_tree = RBTree(compact_nodes=True)
+    compact_tree.extend(num_gen)
+
+    assert list(compact_tree.cursor()) == sorted(num_gen)
+    assert compact_tree.pop_many(5, 'max') == sorted(num_gen, reverse=True)[0: 5]
+    assert compact_tree.pop_min() == min(num_gen)
+    assert compact_tree.peek_min() == sorted(num_gen)[1]
+
+
+def test_redblack_invariant_with_random_modifications(binarytester):
+    rbtree = RBTree()
+    values = set()
+
+    for _ in range(2000):
+        val = random.randint(0, 300)
+        if val in values:
+            rbtree.delete(val)
+            values.remove(val)
+        else:
+            rbtree.insert(val)
+            values.add(val)
+
+        # the compact check compares the black heights of both subtrees as well
+        assert is_redblack(rbtree.root)[0] and is_compact_redblack(rbtree.root)[0]
+
+    assert rbtree.traverse() == sorted(values) and binarytester(rbtree)
+
+
+@pytest.mark.parametrize('compact_nodes', [False, True], ids=['plain', 'compact'])
+def test_redblack_invariant_after_rebalance(binarytester, num_gen: List[int], compact_nodes: bool):
+    rbtree = RBTree(compact_nodes=compact_nodes)
+    for val in num_gen:
+        rbtree.insert(val)
+    rbtree.delete_range(200, 400)
+
+    rbtree.rebalance()
+    assert is_compact_redblack(rbtree.root)[0] and not rbtree.root.is_red
+    if not compact_nodes:
+        assert is_redblack(rbtree.root)[0]
+    assert rbtree.traverse() == sorted(val for val in num_gen if not 200 <= val <= 400) and binarytester(rbtree)
+
+    # the colors are still valid for the rebalancing of the following modifications
+    for val in num_gen:
+        if val in rbtree:
+            rbtree.delete(val)
+        else:
+            rbtree.insert(val)
+        assert is_compact_redblack(rbtree.root)[0]
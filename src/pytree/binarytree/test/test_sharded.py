@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right
+from typing import List
+import random
+import pytest
+
+from pytree import BinaryTree, RBTree, ShardedTree
+
+
+@pytest.fixture(params=[{}, {'workers': 3}, {'workers': 3, 'executor': 'process'}], ids=['serial', 'thread', 'process'])
+def pool_kwargs(request) -> dict:
+    return request.param
+
+
+@pytest.fixture
+def ints() -> List[int]:
+    return random.sample(range(100_000), 5000)
+
+
+@pytest.fixture
+def sharded_tree(tree_obj: BinaryTree, ints: List[int]) -> ShardedTree:
+    return ShardedTree.fill_tree(ints, backend=tree_obj, min_shard_size=100)
+
+
+def test_protocol(binarytester, sharded_tree: ShardedTree, ints: List[int]):
+    sorted_vals = sorted(ints)
+
+    assert sharded_tree.traverse() == list(sharded_tree) == sorted_vals
+    assert len(sharded_tree) == len(ints) and sharded_tree
+    assert all(binarytester(shard) for shard in sharded_tree.shards)
+    assert sharded_tree.find(sorted_vals[0]) == sorted_vals[0] and sorted_vals[-1] in sharded_tree
+    assert sharded_tree.find(-1) is None and -1 not in sharded_tree
+    assert sharded_tree.dtype is int
+    assert sharded_tree.find_min() == sorted_vals[0] and sharded_tree.find_max() == sorted_vals[-1]
+
+    for value in sorted_vals[::2]:
+        sharded_tree.delete(value)
+    assert sharded_tree.traverse() == sorted_vals[1::2]
+    assert sum(sharded_tree.shard_sizes) == len(sharded_tree)
+    with pytest.raises(ValueError):
+        sharded_tree.delete(sorted_vals[0])
+
+    sharded_tree.clear()
+    assert not sharded_tree and sharded_tree.traverse() == []
+
+
+def test_split_by_range(sharded_tree: ShardedTree):
+    # the shards are in order, every one of them within its own range
+    splitters = [None] + sharded_tree.splitters + [None]
+    for shard, lo, hi in zip(sharded_tree.shards, splitters, splitters[1:]):
+        assert all((lo is None or lo <= value) and (hi is None or value < hi) for value in shard)
+
+    # the values were split into equal sizes
+    assert max(sharded_tree.shard_sizes) - min(sharded_tree.shard_sizes) <= 1
+
+
+def test_neighbours(sharded_tree: ShardedTree, ints: List[int]):
+    sorted_vals = sorted(ints)
+
+    for target in random.sample(range(-10, 100_010), 200) + sharded_tree.splitters:
+        index = bisect_left(sorted_vals, target)
+        index_right = bisect_right(sorted_vals, target)
+
+        assert sharded_tree.find_lt(target) == (sorted_vals[index - 1] if index > 0 else None)
+        assert sharded_tree.find_le(target) == (sorted_vals[index_right - 1] if index_right > 0 else None)
+        assert sharded_tree.find_gt(target) == (sorted_vals[index_right] if index_right < len(ints) else None)
+        assert sharded_tree.find_ge(target) == (sorted_vals[index] if index < len(ints) else None)
+
+
+def test_bulk_operations(ints: List[int], pool_kwargs: dict):
+    sharded_tree = ShardedTree.fill_tree(ints, min_shard_size=100, **pool_kwargs)
+    sorted_vals = sorted(ints)
+
+    for _ in range(20):
+        lo = random.randrange(-10, 100_010)
+        hi = lo + random.randrange(30_000)
+        expected = sorted_vals[bisect_left(sorted_vals, lo): bisect_right(sorted_vals, hi)]
+        assert sharded_tree.scan(lo, hi) == expected
+        assert sharded_tree.count_range(lo, hi) == len(expected)
+    assert sharded_tree.scan() == sorted_vals and sharded_tree.count_range() == len(ints)
+
+    other_vals = random.sample(range(100_000), 5000)
+    other = ShardedTree.fill_tree(other_vals, num_shards=3, min_shard_size=100)
+    assert sharded_tree.union(other).traverse() == sorted(set(ints) | set(other_vals))
+    assert sharded_tree.intersection(other).traverse() == sorted(set(ints) & set(other_vals))
+    assert sharded_tree.difference(RBTree.fill_tree(other_vals)).traverse() == sorted(set(ints) - set(other_vals))
+
+    num_removed = sharded_tree.delete_range(20_000, 60_000)
+    assert num_removed == sum(20_000 <= value <= 60_000 for value in ints)
+    assert sharded_tree.traverse() == [value for value in sorted_vals if not 20_000 <= value <= 60_000]
+    assert sum(sharded_tree.shard_sizes) == len(sharded_tree)
+
+
+def test_auto_rebalance():
+    sharded_tree = ShardedTree(num_shards=4, min_shard_size=100)
+
+    # everything goes into the first shard until there's enough values to split
+    sharded_tree.extend(range(399))
+    assert sharded_tree.splitters == [] and sharded_tree.shard_sizes == [399, 0, 0, 0]
+
+    sharded_tree.insert(399)
+    assert sharded_tree.splitters == [100, 200, 300] and sharded_tree.shard_sizes == [100] * 4
+
+    # increasing values all land in the last shard, until it's too big compared to the others
+    for value in range(400, 1000):
+        sharded_tree.insert(value)
+        assert max(sharded_tree.shard_sizes) <= 2 * len(sharded_tree) / 4 + 1
+    assert sharded_tree.num_rebalances > 1
+    assert sharded_tree.traverse() == list(range(1000))
+
+
+def test_rebalance_after_deletions():
+    sharded_tree = ShardedTree.fill_tree(range(400), num_shards=4, min_shard_size=10)
+
+    # emptying all the shards but the first one
+    for value in range(399, 59, -1):
+        sharded_tree.delete(value)
+        assert max(sharded_tree.shard_sizes) <= 2 * len(sharded_tree) / 4 + 1
+    assert sharded_tree.num_rebalances > 1 and min(sharded_tree.shard_sizes) > 0
+    assert sharded_tree.traverse() == list(range(60))
+
+    # the range deletion empties the first shards
+    sharded_tree.delete_range(0, 14)
+    assert min(sharded_tree.shard_sizes) >= len(sharded_tree) / 8
+    assert sharded_tree.traverse() == list(range(15, 60))
+
+
+def test_rebalance_two_shards():
+    # a shard can't hold more than twice its fair share out of 2, it's the other shard that runs out
+    sharded_tree = ShardedTree(num_shards=2, min_shard_size=10)
+    for value in range(5000):
+        sharded_tree.insert(value)
+        assert min(sharded_tree.shard_sizes) >= len(sharded_tree) / 4 - 1 or len(sharded_tree) < 20
+    assert sharded_tree.traverse() == list(range(5000))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ShardedTree(num_shards=0)
+    with pytest.raises(ValueError):
+        ShardedTree(executor='fiber')
+    with pytest.raises(ValueError):
+        ShardedTree(imbalance=1)
+    with pytest.raises(ValueError):
+        ShardedTree(num_shards=3, splitters=[1])
+    with pytest.raises(ValueError):
+        ShardedTree(num_shards=3, splitters=[2, 1])
+    with pytest.raises(ValueError):
+        ShardedTree().traverse('pre')
+
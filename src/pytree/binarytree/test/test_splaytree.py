@@ -1,4 +1,5 @@
 from textwrap import fill
+import math
 from typing import List
 from numpy import random
 import pytest
@@ -51,3 +52,19 @@ def test_splay_in_find_methods(filled_splaytree: SplayTree):
     rand_val = filled_splaytree[random.randint(0, 6)]
     filled_splaytree.find(rand_val)
     assert filled_splaytree.root.value == rand_val
+
+
+def test_auto_rebalance(binarytester):
+    # sorted insertions leave the tree as a chain of left child nodes, with the smallest value at the bottom
+    splaytree = SplayTree(rebalance_factor=2)
+    for val in range(3000):
+        splaytree.insert(val)
+    assert splaytree.root.find_min_node().depth == 2999
+
+    # the tree is rebalanced before the node is splayed up from the bottom
+    assert splaytree.find(0).value == 0 and splaytree.root.value == 0
+    assert splaytree.height <= 2 * math.log2(3000)
+    assert splaytree.traverse() == list(range(3000)) and binarytester(splaytree)
+
+    with pytest.raises(ValueError):
+        SplayTree(rebalance_factor=0.5)
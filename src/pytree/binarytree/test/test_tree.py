@@ -1,7 +1,10 @@
+import copy
 from typing import List
 import pytest
+import random
 
 from pytree import BinaryTree, AVLTree, BSTree, RBTree, SplayTree
+from pytree.Binarytree._bulk import parallel_sorted
 
 
 def test_addition(num_gen: List[int], tree_obj: BinaryTree):
@@ -65,3 +68,321 @@ def test_pickle(num_gen, tmpdir):
     orig_tree.pickle(data_file)
     new_tree = BSTree.load_pickle(data_file)
     assert set(new_tree.traverse()) == set(orig_tree.traverse())
+
+    # written & read back in chunks
+    orig_tree.pickle(data_file, chunk_size=16)
+    assert BSTree.load_pickle(data_file).traverse() == orig_tree.traverse()
+
+    BSTree().pickle(data_file)
+    assert BSTree.load_pickle(data_file).traverse() == []
+
+
+def test_fill_tree_unsorted_with_duplicates(binarytester, num_gen: List[int], tree_obj: BinaryTree):
+    tree = tree_obj.fill_tree(num_gen[::-1] + num_gen)
+    assert tree.traverse() == sorted(num_gen)
+    assert binarytester(tree)
+
+
+def test_extend(binarytester, num_gen: List[int], tree_obj: BinaryTree):
+    tree = tree_obj.fill_tree(num_gen[0: 50])
+    tree.extend(reversed(num_gen))
+    assert tree.traverse() == sorted(num_gen)
+    assert binarytester(tree)
+    assert tree.root.parent is None
+
+
+@pytest.mark.parametrize('method, func', [
+    ('find_ge', lambda vals, q: min((v for v in vals if v >= q), default=None)),
+    ('find_gt', lambda vals, q: min((v for v in vals if v > q), default=None)),
+    ('find_le', lambda vals, q: max((v for v in vals if v <= q), default=None)),
+    ('find_lt', lambda vals, q: max((v for v in vals if v < q), default=None)),
+])
+def test_find_neighbours(num_gen: List[int], tree_obj: BinaryTree, method, func):
+    tree = tree_obj.fill_tree(num_gen)
+    for val in range(-1, 1002):
+        found = getattr(tree, method)(val)
+        # the splay tree returns the splayed node instead of its value
+        assert getattr(found, 'value', found) == func(num_gen, val)
+
+
+@pytest.mark.parametrize('lo, hi', [(200, 600), (-10, 2000), (500, 500), (600, 200)],
+                         ids=['middle', 'all', 'single', 'inverted'])
+def test_delete_range(binarytester, num_gen: List[int], filled_tree: BinaryTree, lo: int, hi: int):
+    num_removed = filled_tree.delete_range(lo, hi)
+    remaining = sorted(val for val in num_gen if not lo <= val <= hi)
+
+    assert num_removed == len(num_gen) - len(remaining)
+    assert filled_tree.traverse() == remaining
+    assert binarytester(filled_tree)
+
+    filled_tree.insert(lo)
+    assert lo in filled_tree
+
+
+def test_peek_and_pop_minmax(num_gen: List[int], filled_tree: BinaryTree, binarytester):
+    remaining = sorted(num_gen)
+    filled_tree.insert(-1)
+    filled_tree.insert(1001)
+    remaining = [-1] + remaining + [1001]
+
+    while len(remaining) > 2:
+        assert filled_tree.peek_min() == remaining[0]
+        assert filled_tree.peek_max() == remaining[-1]
+        assert filled_tree.pop_min() == remaining.pop(0)
+        assert filled_tree.pop_max() == remaining.pop()
+        assert binarytester(filled_tree)
+
+    assert filled_tree.traverse() == remaining
+
+
+def test_pop_from_both_ends(num_gen: List[int], filled_tree: BinaryTree):
+    sorted_vals = sorted(num_gen)
+    assert filled_tree.pop() == sorted_vals[0]
+    assert filled_tree.pop(key='max') == sorted_vals[-1]
+    assert filled_tree.traverse() == sorted_vals[1: -1]
+
+
+@pytest.mark.parametrize('key', ['min', 'max'])
+def test_pop_many(num_gen: List[int], filled_tree: BinaryTree, key: str):
+    sorted_vals = sorted(num_gen, reverse=key == 'max')
+
+    assert filled_tree.pop_many(10, key) == sorted_vals[:10]
+    assert filled_tree.peek_min() == min(sorted_vals[10:])
+    assert filled_tree.peek_max() == max(sorted_vals[10:])
+
+    assert filled_tree.pop_many(len(num_gen), key) == sorted_vals[10:]
+    assert filled_tree.traverse() == []
+    assert filled_tree.peek_min() is None and filled_tree.peek_max() is None
+
+
+@pytest.mark.parametrize('tree_factory', [
+    RBTree, AVLTree, BSTree,
+    lambda: RBTree(compact_nodes=True),
+    lambda: AVLTree(compact_nodes=True),
+    lambda: BSTree(lazy_delete=True)
+], ids=['rbtree', 'avltree', 'bstree', 'compact_rbtree', 'compact_avltree', 'lazy_bstree'])
+def test_minmax_cache_with_random_modifications(tree_factory):
+    rng = random.Random(1)
+    tree, values = tree_factory(), set()
+
+    for _ in range(1000):
+        op, val = rng.randrange(6), rng.randrange(200)
+        if op < 2:
+            tree.insert(val)
+            values.add(val)
+        elif op == 2 and val in values:
+            tree.delete(val)
+            values.discard(val)
+        elif op == 3 and values:
+            values.discard(tree.pop_min() if val % 2 else tree.pop_max())
+        elif op == 4 and values:
+            values.difference_update(tree.pop_many(rng.randrange(1, 5), rng.choice(['min', 'max'])))
+        elif op == 5:
+            tree.delete_range(val, val + 5)
+            values.difference_update(range(val, val + 6))
+
+        # the cached min/max nodes always hold the actual min/max values
+        assert tree.peek_min() == min(values, default=None)
+        assert tree.peek_max() == max(values, default=None)
+    assert tree.traverse() == sorted(values)
+
+
+def test_pop_minmax_from_empty_tree(tree: BinaryTree):
+    with pytest.raises(IndexError):
+        tree.pop_min()
+    with pytest.raises(IndexError):
+        tree.pop_max()
+    assert tree.pop_many(3) == []
+
+
+def test_copy(num_gen: List[int], filled_tree: BinaryTree):
+    copied_tree = copy.copy(filled_tree)
+    assert type(copied_tree) is type(filled_tree)
+    assert copied_tree.traverse('pre') == filled_tree.traverse('pre')
+
+    # the balancing information is copied over as is
+    for orig_node, copied_node in zip(filled_tree.root.traverse_node(), copied_tree.root.traverse_node()):
+        assert orig_node is not copied_node
+        assert repr(orig_node) == repr(copied_node)
+        assert getattr(orig_node, 'height', None) == getattr(copied_node, 'height', None)
+        assert getattr(orig_node, 'is_red', None) == getattr(copied_node, 'is_red', None)
+        if copied_node.parent:
+            assert copied_node in (copied_node.parent.left, copied_node.parent.right)
+
+    copied_tree.delete_range(0, 500)
+    copied_tree.insert(-1)
+    assert filled_tree.traverse() == sorted(num_gen)
+
+
+def test_deepcopy(tree_obj: BinaryTree):
+    orig_tree = tree_obj.fill_tree([(1, [1]), (2, [2]), (3, [3])])
+    copied_tree = copy.deepcopy(orig_tree)
+
+    assert copied_tree.traverse() == orig_tree.traverse()
+    assert copied_tree.traverse()[-1][1] is not orig_tree.traverse()[-1][1]
+
+
+def test_fill_tree_in_parallel(num_gen: List[int], tree_obj: BinaryTree):
+    values = (val for val in num_gen * 3)
+    tree = tree_obj.fill_tree(values, workers=2, chunk_size=16)
+    assert tree.traverse() == sorted(num_gen)
+
+
+def test_parallel_sorted_with_bounded_fan_in(num_gen: List[int]):
+    # the spilled chunks are merged 2 at a time, over several passes before the final merge
+    values = (val for val in num_gen * 3)
+    assert list(parallel_sorted(values, workers=2, chunk_size=16, fan_in=2)) == sorted(num_gen)
+
+    with pytest.raises(ValueError):
+        list(parallel_sorted(num_gen, workers=2, fan_in=1))
+
+
+def test_streamed_fill_tree_is_balanced(binarytester, tmpdir):
+    values = random.sample(range(5000), 5000)
+    max_height = (5000).bit_length()
+
+    # the sorted stream of the workers is built all at once, a plain BSTree doesn't turn into a chain
+    assert BSTree.fill_tree(values, workers=2, chunk_size=500).height <= max_height
+    assert BSTree.from_iterable(iter(sorted(values)), chunk_size=500).height <= max_height
+
+    data_file = str(tmpdir.join('test_pickle'))
+    BSTree.fill_tree(values).pickle(data_file, chunk_size=500)
+    tree = BSTree.load_pickle(data_file)
+    assert tree.height <= max_height and binarytester(tree)
+
+
+def test_fill_tree_in_parallel_from_array(num_gen: List[int], tree_obj: BinaryTree):
+    np = pytest.importorskip('numpy')
+    tree = tree_obj.fill_tree(np.array(num_gen * 2), workers=2, chunk_size=16)
+    assert tree.traverse() == sorted(num_gen)
+    assert all(type(val) is int for val in tree)
+
+
+@pytest.mark.parametrize('presort', [True, False])
+def test_streaming_extend(binarytester, num_gen: List[int], tree_obj: BinaryTree, presort: bool):
+    tree = tree_obj.from_iterable((val for val in num_gen * 2), chunk_size=16, presort=presort)
+    assert tree.traverse() == sorted(num_gen) and binarytester(tree)
+
+    tree.extend((val + 2000 for val in sorted(num_gen)), chunk_size=16, presort=presort)
+    assert tree.traverse() == sorted(num_gen) + [val + 2000 for val in sorted(num_gen)]
+    assert binarytester(tree)
+
+
+def test_extend_from_files(num_gen: List[int], tree_obj: BinaryTree, tmpdir):
+    text_file = tmpdir.join('keys.txt')
+    text_file.write('\n'.join(map(str, num_gen * 2)) + '\n\n')
+    tree = tree_obj.from_iterable(str(text_file), chunk_size=16, parse=int)
+    assert tree.traverse() == sorted(num_gen)
+
+    np = pytest.importorskip('numpy')
+    npy_file = tmpdir.join('keys.npy')
+    np.save(str(npy_file), np.array(num_gen, dtype=np.int64))
+
+    tree = tree_obj()
+    tree.extend(npy_file, chunk_size=16)
+    assert tree.traverse() == sorted(num_gen)
+    assert all(type(val) is int for val in tree)
+
+    memmap = np.load(str(npy_file), mmap_mode='r')
+    assert tree_obj.fill_tree(memmap, chunk_size=16).traverse() == sorted(num_gen)
+    assert tree_obj.fill_tree(str(npy_file), workers=2, chunk_size=16).traverse() == sorted(num_gen)
+
+
+def test_diff(num_gen: List[int], filled_tree: BinaryTree, tree_obj: BinaryTree):
+    other_tree = tree_obj.fill_tree(num_gen)
+    assert filled_tree == other_tree
+    # the trees are still hashed by their identity
+    assert len({filled_tree, other_tree}) == 2
+    assert filled_tree.diff(other_tree) == ([], [])
+
+    other_tree.delete_range(0, 500)
+    other_tree.insert(-1)
+    assert filled_tree != other_tree
+    assert filled_tree.diff(other_tree) == (sorted(val for val in num_gen if 0 <= val <= 500), [-1])
+
+
+def test_find_many(num_gen: List[int], filled_tree: BinaryTree):
+    queries = [-1] + num_gen[::-1] + [num_gen[0], 1001]
+    assert filled_tree.find_many(queries) == [None] + num_gen[::-1] + [num_gen[0], None]
+    assert filled_tree.contains_many(queries) == [False] + [True] * len(num_gen) + [True, False]
+    assert filled_tree.find_many([]) == []
+
+
+def test_delete_many(binarytester, num_gen: List[int], filled_tree: BinaryTree):
+    sorted_vals = sorted(num_gen)
+    to_delete = sorted_vals[10: 30] + sorted_vals[50: 52] + sorted_vals[70::7] + [-1, sorted_vals[10]]
+
+    num_removed = filled_tree.delete_many(to_delete)
+    assert num_removed == len(set(to_delete)) - 1
+    assert filled_tree.traverse() == [val for val in sorted_vals if val not in to_delete]
+    assert binarytester(filled_tree)
+
+    assert filled_tree.delete_many(to_delete) == 0
+    assert filled_tree.delete_many(sorted_vals) == len(sorted_vals) - num_removed
+    assert filled_tree.traverse() == []
+
+
+def test_nearest(num_gen: List[int], filled_tree: BinaryTree):
+    for target in (-50, 0, 499, 500, 1050):
+        expected = sorted(sorted(num_gen), key=lambda val: abs(val - target))
+        assert filled_tree.nearest(target, 5) == expected[0: 5]
+        assert filled_tree.nearest(target, len(num_gen) + 1) == expected
+
+        within = [val for val in expected if abs(val - target) <= 20]
+        assert filled_tree.nearest(target, 10, max_distance=20) == within[0: 10]
+
+    assert filled_tree.nearest(num_gen[0], 1) == [num_gen[0]]
+    assert filled_tree.nearest(num_gen[0], 0) == []
+
+
+def test_memory_usage(num_gen: List[int], filled_tree: BinaryTree):
+    shallow = filled_tree.memory_usage(deep=False)
+    deep = filled_tree.memory_usage()
+
+    assert deep.num_elements == shallow.num_elements == len(set(num_gen))
+    assert shallow.payloads == 0 and deep.payloads > 0
+    assert deep.nodes == shallow.nodes > 0
+    assert deep.total == deep.nodes + deep.payloads + deep.slack + deep.indexes
+    assert deep.bytes_per_element == deep.total / deep.num_elements
+
+    lazy_tree = BSTree(lazy_delete=True, rebuild_threshold=0.5)
+    lazy_tree.extend(num_gen)
+    for val in sorted(set(num_gen))[0: 10]:
+        lazy_tree.delete(val)
+    lazy_usage = lazy_tree.memory_usage()
+    assert lazy_usage.num_elements == len(set(num_gen)) - 10
+    assert lazy_usage.slack > 0
+
+
+def test_rebalance(binarytester, num_gen: List[int], tree_obj: BinaryTree):
+    tree = tree_obj()
+    # sorted insertions leave the unbalanced trees in a skewed shape
+    for val in sorted(num_gen):
+        tree.insert(val)
+    cursor = tree.cursor()
+    min_value = tree.peek_min()
+
+    tree.rebalance()
+    assert tree.traverse() == sorted(num_gen) and binarytester(tree)
+    # every leaf node ends up on the last or the second last level
+    assert tree.height == len(num_gen).bit_length() - 1
+
+    for node in tree.root.traverse_node():
+        if node is tree.root:
+            assert node.parent is None
+        else:
+            assert node in (node.parent.left, node.parent.right)
+
+    # the tree has been modified, but the values are still where they were
+    with pytest.raises(RuntimeError):
+        cursor.next()
+    assert tree.peek_min() == min_value and list(tree.cursor()) == sorted(num_gen)
+
+    tree.insert(-1)
+    tree.delete(min_value)
+    assert tree.traverse() == [-1] + sorted(num_gen)[1:] and binarytester(tree)
+
+    tree.clear()
+    tree.rebalance()
+    assert not tree
+
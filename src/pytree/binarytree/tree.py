@@ -1,5 +1,11 @@
-from pytree.Binarytree.Node import RBT_Node, AVL_Node, Splay_Node, BST_Node
+from typing import Iterable, List, Tuple, Union
+
+from pytree.Binarytree.Node import (
+    RBT_Node, AVL_Node, Splay_Node, BST_Node, LazyBST_Node, MerkleAVL_Node, CompactAVL_Node, CompactRBT_Node,
+    OrderStatAVL_Node
+)
 from pytree.Binarytree._tree import BinaryTree
+from pytree.Binarytree._type_hint import CT
 
 __all__ = ['RBTree', 'BSTree', 'AVLTree', 'SplayTree']
 
@@ -17,11 +23,20 @@ class RBTree(BinaryTree):
 
     P.S: Even though that it is slower in traversing,
          the difference is not that big unless time is critical
+
+    - with 'compact_nodes' enabled, the nodes don't keep any reference
+      to their parent, the rebalancing goes back up the path recorded
+      on the way down instead -> less memory per value
     '''
 
     _node_type = RBT_Node
 
-    def __init__(self):
+    def __init__(self, compact_nodes: bool = False):
+        self.compact_nodes = compact_nodes
+
+        if compact_nodes:
+            self._node_type = CompactRBT_Node
+
         super().__init__()
 
 
@@ -35,12 +50,135 @@ class BSTree(BinaryTree):
 
     - in my case, I added a refernce to the parent's node too
       because this is my project and i do whatever the heck i want >:3
+
+    - with 'lazy_delete' enabled, deleted values are only marked as deleted,
+      and the tree is rebuilt into a balanced shape (without the marked nodes)
+      once the number of deletions since the last rebuild passes
+      the 'rebuild_threshold' fraction of the values that are still in the tree
+      -> meant for delete-heavy workloads that are mostly reading
+
+    - with 'rebalance_factor' given, the part of the tree that's out of balance
+      is rebuilt (like a scapegoat tree) once an insertion goes deeper than [rebalance_factor] * log2(n),
+      e.g while being fed values in sorted order
     '''
 
     _node_type = BST_Node
 
-    def __init__(self):
+    def __init__(self, lazy_delete: bool = False, rebuild_threshold: float = 0.25, rebalance_factor: float = None):
+        if not 0 < rebuild_threshold < 1:
+            raise ValueError('rebuild_threshold should be within (0, 1)')
+        if rebalance_factor is not None and rebalance_factor <= 1:
+            raise ValueError('rebalance_factor should be > 1')
+
+        self.lazy_delete = lazy_delete
+        self.rebuild_threshold = rebuild_threshold
+
+        if lazy_delete:
+            self._node_type = LazyBST_Node
+
+        # number of deletions since the last rebuild & the number of values still in the tree,
+        # only kept up to date with 'lazy_delete'
+        self._num_deleted = 0
+        self._num_values = 0
+
         super().__init__()
+        self.rebalance_factor = rebalance_factor
+
+    def compact(self) -> None:
+        '''get rid of all the deleted nodes by rebuilding the tree into a balanced shape'''
+        values = self.traverse()
+
+        self._version += 1
+        self._num_deleted = 0
+        self._num_values = len(values)
+        self.root = self._node_type.build_from_sorted(values)
+
+    def traverse(self, key: str = 'in') -> List[CT]:
+        if not self.lazy_delete or self.root.value is None:
+            return super().traverse(key)
+        return [n.value for n in self.root.traverse_node(key) if not n.is_deleted]
+
+    def find_min(self, **kwargs) -> CT:
+        if not self.lazy_delete:
+            return super().find_min(**kwargs)
+        return self.peek_min()
+
+    def find_max(self, **kwargs) -> CT:
+        if not self.lazy_delete:
+            return super().find_max(**kwargs)
+        return self.peek_max()
+
+    def delete_range(self, lo: CT, hi: CT) -> int:
+        num_removed = super().delete_range(lo, hi)
+
+        if self.lazy_delete:
+            self._num_values -= num_removed
+            if self._num_deleted > self.rebuild_threshold * self._num_values:
+                self.compact()
+
+        return num_removed
+
+    def clear(self) -> None:
+        super().clear()
+        if self.lazy_delete:
+            self.root.is_deleted = False
+            self._num_deleted = 0
+            self._num_values = 0
+
+    def insert(self, value: CT) -> None:
+        if self.lazy_delete and self.root.value is None:
+            self._num_values = 1
+        super().insert(value)
+
+    def _extend_chunk(self, values: Iterable[CT], presort: bool) -> None:
+        if not self.lazy_delete or self.root.value is not None:
+            return super()._extend_chunk(values, presort)
+
+        # an empty tree is built all at once out of the unique values, see 'BinaryTree._extend_chunk'
+        super()._extend_chunk(values, presort)
+        if self.root.value is not None:
+            self._num_values = self._known_size
+
+    def _node_inserted(self, node: Union[BST_Node, LazyBST_Node]) -> None:
+        # a marked node being brought back counts as a new value too
+        if self.lazy_delete:
+            self._num_values += 1
+        super()._node_inserted(node)
+
+    def _get_minmax_nodes(self) -> Tuple[LazyBST_Node, LazyBST_Node]:
+        if not self.lazy_delete or self._minmax_version == self._version:
+            return super()._get_minmax_nodes()
+
+        min_node, max_node = super()._get_minmax_nodes()
+        if min_node.is_deleted:
+            min_node = min_node.get_successor()
+        if max_node.is_deleted:
+            max_node = max_node.get_predecessor()
+
+        self._cache_minmax_nodes(min_node, max_node)
+        return min_node, max_node
+
+    def _remove_node(self, node_to_delete: Union[BST_Node, LazyBST_Node]) -> None:
+        if not self.lazy_delete:
+            return super()._remove_node(node_to_delete)
+
+        min_node, max_node = None, None
+        if self._minmax_version == self._version:
+            min_node, max_node = self._min_node, self._max_node
+            if node_to_delete is min_node:
+                min_node = min_node.get_successor()
+            if node_to_delete is max_node:
+                max_node = max_node.get_predecessor()
+
+        self._version += 1
+        node_to_delete.is_deleted = True
+        self._num_deleted += 1
+        self._num_values -= 1
+
+        if self._num_deleted > self.rebuild_threshold * self._num_values:
+            self.compact()
+        elif min_node is not None:
+            self._cache_minmax_nodes(min_node, max_node)
 
 
 class AVLTree(BinaryTree):
@@ -55,13 +193,120 @@ class AVLTree(BinaryTree):
 
     P.S: Even though that it is slower in insertion & deletion,
          the difference is not that big unless time is critical
+
+    - with 'merkle' enabled, every node also keeps the hash of its subtree,
+      so 2 trees can be compared by their hashes, and their differences
+      can be found by only going down the subtrees whose hashes don't match
+
+    - with 'compact_nodes' enabled, the nodes don't keep any reference
+      to their parent (nor their balancing factor), the rebalancing goes back up
+      the path recorded on the way down instead -> less memory per value
+
+    - with 'order_stats' enabled, every node also keeps the size of its subtree,
+      so the rank of a value & the value at an index are found in O(log n)
     '''
 
     _node_type = AVL_Node
 
-    def __init__(self):
+    def __init__(self, merkle: bool = False, compact_nodes: bool = False, order_stats: bool = False):
+        if merkle + compact_nodes + order_stats > 1:
+            raise ValueError("only one of 'merkle', 'compact_nodes' & 'order_stats' can be enabled")
+
+        self.merkle = merkle
+        self.compact_nodes = compact_nodes
+        self.order_stats = order_stats
+
+        if merkle:
+            self._node_type = MerkleAVL_Node
+        elif compact_nodes:
+            self._node_type = CompactAVL_Node
+        elif order_stats:
+            self._node_type = OrderStatAVL_Node
+
         super().__init__()
 
+    def rank(self, value: CT) -> int:
+        '''get the number of values in the tree that's < the given value'''
+        if not self.order_stats:
+            raise AttributeError(f"{type(self).__name__} is not keeping any order statistics, use 'order_stats=True'")
+        if self.root.value is None:
+            return 0
+        return self.root.get_rank(value)
+
+    def select(self, index: int) -> CT:
+        '''get the value at the given index of the sorted values, negative indexes count from the end'''
+        if not self.order_stats:
+            raise AttributeError(f"{type(self).__name__} is not keeping any order statistics, use 'order_stats=True'")
+
+        size = self.root.size if self.root.value is not None else 0
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f'{type(self).__name__} index out of range')
+
+        return self.root.select_node(index).value
+
+    @property
+    def merkle_hash(self) -> int:
+        '''the combined hash of all the values in the tree'''
+        if not self.merkle:
+            raise AttributeError(f"{type(self).__name__} is not keeping any hash, use 'merkle=True'")
+        return self.root.subtree_hash if self.root.value is not None else 0
+
+    def diff(self, other: BinaryTree) -> Tuple[List[CT], List[CT]]:
+        '''
+        compare the values of this tree with another tree
+
+        - for 2 merkle trees, only the subtrees of this tree whose hashes
+          differ from the hash of the same range of values in the other tree
+          are looked into, so the trees don't need to have the same shape
+          -> O(d log^2 n) for d differences
+
+        returns the values that are only in this tree
+        and the values that are only in the other tree, both in sorted order
+        '''
+        if not self.merkle or not getattr(other, 'merkle', False):
+            return super().diff(other)
+
+        this_only, other_only = [], []
+        other_root = other.root if other.root.value is not None else None
+
+        def collect_other_values(lo: CT, hi: CT) -> None:
+            node = other_root.find_gt_node(lo) if lo is not None else other_root.find_min_node()
+            while node and (hi is None or node.value < hi):
+                other_only.append(node.value)
+                node = node.get_successor()
+
+        def diff_node(node: MerkleAVL_Node, lo: CT, hi: CT) -> None:
+            # the subtree of the node holds every value of this tree within (lo, hi)
+            node_hash = node.subtree_hash if node else 0
+            other_hash = other_root.get_range_hash(lo, hi) if other_root else 0
+
+            if node_hash == other_hash:
+                return
+
+            if node is None:
+                collect_other_values(lo, hi)
+                return
+
+            diff_node(node.left, lo, node.value)
+            if other_root is None or other_root.find_node(node.value) is None:
+                this_only.append(node.value)
+            diff_node(node.right, node.value, hi)
+
+        diff_node(self.root if self.root.value is not None else None, None, None)
+
+        return this_only, other_only
+
+    def __eq__(self, other: BinaryTree) -> bool:
+        # 2 merkle trees with different hashes can't hold the same values,
+        # the values are only compared once the hashes match, the hashes could still collide
+        if self.merkle and getattr(other, 'merkle', False) and self.merkle_hash != other.merkle_hash:
+            return False
+        return super().__eq__(other)
+
+    __hash__ = BinaryTree.__hash__
+
 
 class SplayTree(BinaryTree):
     '''
@@ -73,12 +318,19 @@ class SplayTree(BinaryTree):
     - Cons:
       * not balanced :/
 
+    - with 'rebalance_factor' given, the part of the tree that's out of balance
+      is rebuilt (like a scapegoat tree) once a search finds a node deeper than [rebalance_factor] * log2(n),
+      before the node is splayed, e.g after the values have been accessed in sorted order
     '''
 
     _node_type = Splay_Node
 
-    def __init__(self):
+    def __init__(self, rebalance_factor: float = None):
+        if rebalance_factor is not None and rebalance_factor <= 1:
+            raise ValueError('rebalance_factor should be > 1')
+
         super().__init__()
+        self.rebalance_factor = rebalance_factor
 
     def __getattribute__(self, attr_name):
         '''
@@ -92,6 +344,10 @@ class SplayTree(BinaryTree):
         if 'find' not in attr_name or not callable(attr) or self.root.value is None:
             return attr
 
+        # only the finds that are backed by a node method (i.e not the batch finds)
+        if not hasattr(self.root, f'{attr_name}_node'):
+            return attr
+
         def node_splayer(*args, **kwargs):
             # set the node to True to get the node for the splaying process
             new_attr_name = f"{attr_name}_node"
@@ -100,6 +356,8 @@ class SplayTree(BinaryTree):
 
             # splaying process
             if found_node:
+                if self.rebalance_factor is not None:
+                    self._observe_depth(found_node)
                 self.root = found_node._update_node()
 
             return found_node